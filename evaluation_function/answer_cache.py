@@ -0,0 +1,140 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Any
+
+from evaluation_function.domain.analysis import FormulaAnalysis
+from evaluation_function.domain.minimisation import MAX_MINIMISE_ATOMS, MinimalDnf, minimal_dnf, minimise
+from evaluation_function.domain.reference_index import ReferenceIndex
+from evaluation_function.parsing.parser import cached_formula_parser
+from evaluation_function.precompile import PrecompiledAnswers
+from evaluation_function.question_bank import equivalence_references, read_question_bank
+from evaluation_function.shared_answer_cache import CompiledAnswer, SharedAnswerCache
+
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=ANSWER_CACHE_SIZE)
+def answer_analysis(text: str) -> FormulaAnalysis:
+    """
+    The parsed answer formula with its atoms, shared by every response graded against it.
+    ---
+    Answer formulas come from question authors rather than students, so their
+    analysis runs without a budget and is kept for later requests. Answers in
+    the precompiled bank are taken from it without parsing. Otherwise, when a
+    shared answer cache is configured, the truth table is read from it, or
+    computed and added to it for the other workers.
+    """
+    precompiled = precompiled_answers()
+    if precompiled is not None:
+        answer = precompiled.get(text)
+        if answer is not None:
+            return answer.analysis()
+
+    formula = cached_formula_parser(text)
+    shared = shared_answer_cache()
+    if shared is None:
+        return FormulaAnalysis(formula)
+
+    compiled = shared.get(text)
+    if compiled is not None:
+        return FormulaAnalysis(formula, truth_table=compiled.truth_table())
+    analysis = FormulaAnalysis(formula)
+    if analysis.truth_table is not None:
+        shared.put(text, CompiledAnswer.from_table(analysis.truth_table))
+    return analysis
+
+
+@lru_cache(maxsize=ANSWER_CACHE_SIZE)
+def reference_index(references: tuple[str, ...], mistakes: tuple[tuple[str, str], ...]) -> ReferenceIndex:
+    """
+    The accepted formulas and known mistakes of one answer, indexed once and shared by every response
+    ---
+    Accepted formulas are labelled ("reference", text) and mistakes
+    ("mistake", feedback). Accepted formulas are added first, so they win
+    over a mistake that happens to be equivalent to one of them.
+    """
+    index = ReferenceIndex()
+    for text in references:
+        index.add(answer_analysis(text), ("reference", text))
+    for text, feedback in mistakes:
+        index.add(answer_analysis(text), ("mistake", feedback))
+    return index
+
+
+@lru_cache(maxsize=ANSWER_CACHE_SIZE)
+def answer_minimal_dnf(text: str) -> MinimalDnf:
+    """
+    The smallest DNF of an answer formula's function, minimised once and shared by every response
+    ---
+    The caller checks the answer's atom count against `MAX_MINIMISE_ATOMS` first.
+    """
+    analysis = answer_analysis(text)
+    if analysis.truth_table is None:
+        return minimal_dnf(analysis.formula)
+    return minimise(analysis.truth_table)
+
+
+_precompiled_answers: PrecompiledAnswers | None = None
+_precompiled_answers_loaded = False
+
+
+def precompiled_answers() -> PrecompiledAnswers | None:
+    """The precompiled bank named by `EVAL_PRECOMPILED_ANSWERS`, mapped once and shared by forked workers."""
+    global _precompiled_answers, _precompiled_answers_loaded
+    if not _precompiled_answers_loaded:
+        _precompiled_answers = PrecompiledAnswers.from_env()
+        _precompiled_answers_loaded = True
+    return _precompiled_answers
+
+
+_shared_answer_cache: SharedAnswerCache | None = None
+_shared_answer_cache_pid: int | None = None
+
+
+def shared_answer_cache() -> SharedAnswerCache | None:
+    """The shared answer cache configured by `EVAL_SHARED_ANSWER_CACHE`, opened once per process."""
+    global _shared_answer_cache, _shared_answer_cache_pid
+    # A forked worker opens the file again: flock locks belong to the open file, which fork would share.
+    if _shared_answer_cache_pid != os.getpid():
+        _shared_answer_cache = SharedAnswerCache.from_env()
+        _shared_answer_cache_pid = os.getpid()
+    return _shared_answer_cache
+
+
+def warm_answer(answer: Any) -> int:
+    """Parses and tabulates the formulas of one answer object. Returns the number of formulas cached."""
+    if not isinstance(answer, dict):
+        return 0
+    warmed = 0
+    references, mistakes = equivalence_references(answer)
+    for text in references + tuple(text for text, _ in mistakes):
+        analysis = answer_analysis(text)
+        analysis.truth_table
+        warmed += 1
+    if len(references) > 1 or mistakes:
+        reference_index(references, mistakes)
+    if answer.get("minimalDnf") is True and references and answer_analysis(references[0]).num_atoms <= MAX_MINIMISE_ATOMS:
+        answer_minimal_dnf(references[0])
+    columns = answer.get("referenceTruthTable")
+    if isinstance(columns, list):
+        for column in columns:
+            if isinstance(column, str):
+                cached_formula_parser(column)
+                warmed += 1
+    return warmed
+
+
+def warm_from_question_bank(path: str) -> int:
+    """Fills the caches from a question bank (see `read_question_bank`). Returns the number of formulas cached."""
+    warmed = 0
+    for answer in read_question_bank(path):
+        try:
+            warmed += warm_answer(answer)
+        except Exception as e:
+            logger.warning("question bank %s: answer skipped: %s", path, e)
+    logger.info("warmed %d formulas from %s", warmed, path)
+    return warmed
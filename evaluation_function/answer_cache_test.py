@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .answer_cache import answer_analysis, answer_minimal_dnf, reference_index, warm_answer, warm_from_question_bank
+from .parsing.parser import cached_formula_parser
+from .question_bank import equivalence_references
+
+
+class TestAnswerCache(unittest.TestCase):
+
+    def setUp(self):
+        answer_analysis.cache_clear()
+        reference_index.cache_clear()
+        answer_minimal_dnf.cache_clear()
+        cached_formula_parser.cache_clear()
+
+    def test_answer_analysis_is_shared(self):
+        self.assertIs(answer_analysis("p → q"), answer_analysis("p → q"))
+        self.assertIs(cached_formula_parser("p ∧ q"), cached_formula_parser("p ∧ q"))
+
+    def test_warm_from_question_bank(self):
+        lines = [
+            json.dumps({"answer": {"equivalent": "¬p ∨ q"}}),
+            json.dumps({"equivalent": "p ↔ q", "referenceTruthTable": ["p", "p ↔ q"]}),
+            "",
+            "not json",
+            json.dumps({"answer": {"equivalent": "p ∧"}}),
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as bank:
+            bank.write("\n".join(lines))
+        try:
+            self.assertEqual(warm_from_question_bank(bank.name), 4)
+        finally:
+            os.unlink(bank.name)
+
+        self.assertEqual(answer_analysis.cache_info().currsize, 2)
+        hits = answer_analysis.cache_info().hits
+        self.assertIsNotNone(answer_analysis("¬p ∨ q").truth_table)
+        self.assertEqual(answer_analysis.cache_info().hits, hits + 1)
+
+    def test_equivalence_references(self):
+        answer = {
+            "equivalent": ["p → q", " ", 3, "¬p ∨ q"],
+            "commonMistakes": [{"formula": "p ∧ q", "feedback": "→ is not ∧."}, {"formula": "p"}, "p ∨ q"],
+        }
+        self.assertEqual(
+            equivalence_references(answer),
+            (("p → q", "¬p ∨ q"), (("p ∧ q", "→ is not ∧."),)),
+        )
+        self.assertEqual(equivalence_references({"equivalent": "p"}), (("p",), ()))
+        self.assertEqual(equivalence_references({"equivalent": None, "commonMistakes": "p"}), ((), ()))
+
+    def test_warm_answer_builds_reference_index(self):
+        answer = {"equivalent": ["p → q"], "commonMistakes": [{"formula": "p ∧ q", "feedback": "→ is not ∧."}]}
+        self.assertEqual(warm_answer(answer), 2)
+        index = reference_index(("p → q",), (("p ∧ q", "→ is not ∧."),))
+        self.assertEqual(reference_index.cache_info().hits, 1)
+        self.assertEqual(index.lookup(answer_analysis("a ∨ ¬b")), ("reference", "p → q"))
+        self.assertEqual(index.lookup(answer_analysis("b ∧ a")), ("mistake", "→ is not ∧."))
+
+    def test_warm_answer_minimises_answer(self):
+        warm_answer({"equivalent": "(p ∧ q) ∨ (p ∧ ¬q) ∨ r", "minimalDnf": True})
+        self.assertEqual(answer_minimal_dnf.cache_info().currsize, 1)
+        minimal = answer_minimal_dnf("(p ∧ q) ∨ (p ∧ ¬q) ∨ r")
+        self.assertEqual((minimal.num_terms, minimal.num_literals), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
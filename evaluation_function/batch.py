@@ -0,0 +1,61 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator
+
+from lf_toolkit.evaluation import Result, Params
+
+from .answer_cache import warm_answer
+from .evaluation import evaluation_function
+from .result_cache import normalise_response
+from .worker_pool import TaskKilled, WorkerPool
+
+
+def evaluate_batch(
+    responses: Iterable[Any],
+    answer: Any,
+    params: Params,
+    pool: WorkerPool | None = None,
+) -> Iterator[Result]:
+    """
+    Evaluates many responses against one answer, yielding their results in input order
+    ---
+    The answer's formulas are parsed and tabulated once in each process that
+    evaluates responses, before its first response. Responses that are the same
+    once whitespace and key order are ignored are evaluated once and share a
+    result (so feedback quoting the formula quotes the first of them). With a
+    `pool`, distinct responses are spread over its workers, which each warm
+    their own caches, and each result is yielded as soon as it and every result
+    before it are ready; without one they are evaluated in this process, one
+    after another.
+    """
+    responses = list(responses)
+    keys = [normalise_response(response) for response in responses]
+
+    if pool is None:
+        warm_answer(answer)
+        results: dict[str, Result] = {}
+        for key, response in zip(keys, responses):
+            if key not in results:
+                results[key] = evaluation_function(response, answer, params)
+            yield results[key]
+        return
+
+    with ThreadPoolExecutor(max_workers=pool.config.size) as executor:
+        futures: dict[str, Future] = {}
+        for key, response in zip(keys, responses):
+            if key not in futures:
+                futures[key] = executor.submit(_run_in_pool, pool, response, answer, params)
+        for key in keys:
+            yield futures[key].result()
+
+
+def _run_in_pool(pool: WorkerPool, response: Any, answer: Any, params: Params) -> Result:
+    try:
+        return pool.run(_warm_and_evaluate, response, answer, params)
+    except TaskKilled as e:
+        return Result(is_correct=False, feedback_items=[("Error", str(e))])
+
+
+def _warm_and_evaluate(response: Any, answer: Any, params: Params) -> Result:
+    # Runs in a worker, whose caches the caller cannot fill; once they are warm, warming is a few lookups.
+    warm_answer(answer)
+    return evaluation_function(response, answer, params)
@@ -0,0 +1,43 @@
+import unittest
+
+from .answer_cache import answer_analysis
+from .batch import evaluate_batch
+from .evaluation import Params
+from .worker_pool import PoolConfig, WorkerPool
+
+
+def answer_cache_info() -> tuple[int, int]:
+    info = answer_analysis.cache_info()
+    return info.hits, info.misses
+
+
+class TestEvaluateBatch(unittest.TestCase):
+
+    RESPONSES = [{"formula": "p ∨ ¬p"}, {"formula": "p ∧ q"}, {"formula": "p∨¬p"}, '{"formula": "p → p"}']
+
+    def test_results_in_input_order(self):
+        results = [result.to_dict() for result in evaluate_batch(self.RESPONSES, {"tautology": True}, Params())]
+        self.assertEqual([result.get("is_correct") for result in results], [True, False, True, True])
+
+    def test_with_pool(self):
+        pool = WorkerPool(PoolConfig(size=2, task_timeout=10.0))
+        try:
+            results = list(evaluate_batch(self.RESPONSES, {"tautology": True}, Params(), pool))
+        finally:
+            pool.close()
+        self.assertEqual([result.to_dict().get("is_correct") for result in results], [True, False, True, True])
+
+    def test_answer_is_warmed_in_the_worker(self):
+        pool = WorkerPool(PoolConfig(size=1, task_timeout=10.0))
+        try:
+            list(evaluate_batch(self.RESPONSES, {"equivalent": "p → q"}, Params(), pool))
+            hits, misses = pool.run(answer_cache_info)
+        finally:
+            pool.close()
+        # The worker tabulated the answer once and every distinct response found it in its cache.
+        self.assertEqual(misses, 1)
+        self.assertGreaterEqual(hits, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
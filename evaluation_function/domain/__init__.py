@@ -16,7 +16,18 @@ from .evaluators import (
     EquivalenceEvaluator,
     SatisfiabilityEvaluator,
     TautologyEvaluator,
+    BitParallelEvaluator,
+    PackedTruthTable,
+    ModelCountEvaluator,
+    ModelEnumerator,
 )
+from .printing import format_formula
+from .tractable import FormulaClass, TractableForm, classify_formula
+from .planner import Check, Engine, EnginePlanner, PlannerConfig
+from .budget import Budget, BudgetExceeded
+from .serialization import SerializationError, from_bytes, to_bytes
+from .flat import FlatFormula
+from .canonical import canonical_form
 
 __all__ = [
     "Formula",
@@ -34,4 +45,23 @@ __all__ = [
     "EquivalenceEvaluator",
     "SatisfiabilityEvaluator",
     "TautologyEvaluator",
+    "BitParallelEvaluator",
+    "PackedTruthTable",
+    "ModelCountEvaluator",
+    "ModelEnumerator",
+    "format_formula",
+    "FormulaClass",
+    "TractableForm",
+    "classify_formula",
+    "Check",
+    "Engine",
+    "EnginePlanner",
+    "PlannerConfig",
+    "Budget",
+    "BudgetExceeded",
+    "SerializationError",
+    "from_bytes",
+    "to_bytes",
+    "FlatFormula",
+    "canonical_form",
 ]
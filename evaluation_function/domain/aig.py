@@ -0,0 +1,187 @@
+from typing import Iterable, Mapping, Sequence
+
+from .budget import Budget, UNLIMITED
+from .flat import FlatFormula
+from .formula import Formula, Atom
+from .serialization import OP_TRUE, OP_ATOM, OP_NOT, OP_AND, OP_OR, OP_IMPLIES, OP_IFF, OP_XOR
+
+
+class AIG:
+    """
+    An and-inverter graph over inputs 0..num_inputs-1
+    ---
+    Every connective is built from two-input AND nodes and negated edges.
+    A literal is an int, 2 × node + 1 if negated: node 0 is the constant, so
+    literal 0 is ⊥ and 1 is ⊤, and input i is node i + 1. AND nodes are
+    hash-consed, constants are propagated and a few two-level rewrites
+    (contradiction, idempotence, subsumption, substitution) are applied as
+    nodes are made, so formulas built in one graph share every common
+    subformula. Unlike a BDD, two equivalent formulas do not always get the
+    same literal; when they do, they are certainly equivalent.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, num_inputs: int, budget: Budget | None = None):
+        self._num_inputs = num_inputs
+        self._budget = budget if budget is not None else UNLIMITED
+        # Fanin literals of each node; the constant and the inputs have none.
+        self._left = [-1] * (num_inputs + 1)
+        self._right = [-1] * (num_inputs + 1)
+        self._table: dict[tuple[int, int], int] = {}
+
+    @property
+    def num_inputs(self) -> int:
+        return self._num_inputs
+
+    @property
+    def num_nodes(self) -> int:
+        """Nodes in the graph, the constant and the inputs included."""
+        return len(self._left)
+
+    def input(self, i: int) -> int:
+        return 2 * (i + 1)
+
+    @staticmethod
+    def negate(f: int) -> int:
+        return f ^ 1
+
+    def and_(self, f: int, g: int) -> int:
+        if f > g:
+            f, g = g, f
+        if f == self.FALSE:
+            return self.FALSE
+        if f == self.TRUE or f == g:
+            return g
+        if f == g ^ 1:
+            return self.FALSE
+        for x, y in ((f, g), (g, f)):
+            if not self._is_and(x):
+                continue
+            x0, x1 = self._left[x >> 1], self._right[x >> 1]
+            if x & 1 == 0:
+                if y in (x0 ^ 1, x1 ^ 1):
+                    return self.FALSE  # (a ∧ b) ∧ ¬a
+                if y in (x0, x1):
+                    return x  # (a ∧ b) ∧ a
+                if self._is_and(y) and y & 1 == 0:
+                    y0, y1 = self._left[y >> 1], self._right[y >> 1]
+                    if {y0 ^ 1, y1 ^ 1} & {x0, x1}:
+                        return self.FALSE  # (a ∧ b) ∧ (¬a ∧ c)
+            else:
+                if y in (x0 ^ 1, x1 ^ 1):
+                    return y  # ¬(a ∧ b) ∧ ¬a
+                if y == x0:
+                    return self.and_(y, x1 ^ 1)  # ¬(a ∧ b) ∧ a = a ∧ ¬b
+                if y == x1:
+                    return self.and_(y, x0 ^ 1)
+        key = (f, g)
+        node = self._table.get(key)
+        if node is None:
+            self._budget.charge()
+            node = len(self._left)
+            self._left.append(f)
+            self._right.append(g)
+            self._table[key] = node
+        return 2 * node
+
+    def or_(self, f: int, g: int) -> int:
+        return self.and_(f ^ 1, g ^ 1) ^ 1
+
+    def implies(self, f: int, g: int) -> int:
+        return self.and_(f, g ^ 1) ^ 1
+
+    def xor(self, f: int, g: int) -> int:
+        return self.and_(self.and_(f, g) ^ 1, self.and_(f ^ 1, g ^ 1) ^ 1)
+
+    def iff(self, f: int, g: int) -> int:
+        return self.xor(f, g) ^ 1
+
+    def from_formula(self, formula: Formula, index: Mapping[Atom, int]) -> int:
+        """Builds the literal for `formula`, with each atom mapped to the input `index[atom]`."""
+        atoms = list(index)
+        return self.from_flat(FlatFormula(formula, atoms), [index[atom] for atom in atoms])
+
+    def from_flat(self, flat: FlatFormula, inputs: Sequence[int]) -> int:
+        """Builds the literal for a lowered formula, with the atom in slot i mapped to the input `inputs[i]`."""
+        left = flat.left
+        right = flat.right
+        slots = flat.slots
+        literals = [self.FALSE] * len(flat)
+        for i, opcode in enumerate(flat.opcodes):
+            if opcode == OP_ATOM:
+                literals[i] = self.input(inputs[slots[i]])
+            elif opcode == OP_TRUE:
+                literals[i] = self.TRUE
+            elif opcode == OP_NOT:
+                literals[i] = literals[left[i]] ^ 1
+            elif opcode == OP_AND:
+                literals[i] = self.and_(literals[left[i]], literals[right[i]])
+            elif opcode == OP_OR:
+                literals[i] = self.or_(literals[left[i]], literals[right[i]])
+            elif opcode == OP_IMPLIES:
+                literals[i] = self.implies(literals[left[i]], literals[right[i]])
+            elif opcode == OP_IFF:
+                literals[i] = self.iff(literals[left[i]], literals[right[i]])
+            elif opcode == OP_XOR:
+                literals[i] = self.xor(literals[left[i]], literals[right[i]])
+            # OP_FALSE leaves FALSE
+        return literals[-1]
+
+    def size(self, literals: Iterable[int]) -> int:
+        """Number of AND nodes reachable from `literals`."""
+        return len(self._cone(literals))
+
+    def simulate(self, literals: Sequence[int], masks: Sequence[int], full: int) -> list[int]:
+        """
+        Bit-parallel simulation: the values of `literals` with input i bound to `masks[i]`,
+        where `full` has every bit in use set
+        """
+        values = [0] * len(self._left)
+        for i, mask in enumerate(masks):
+            values[i + 1] = mask
+        for node in sorted(self._cone(literals)):
+            f, g = self._left[node], self._right[node]
+            values[node] = (values[f >> 1] ^ (full if f & 1 else 0)) & (values[g >> 1] ^ (full if g & 1 else 0))
+        return [values[f >> 1] ^ (full if f & 1 else 0) for f in literals]
+
+    def to_cnf(self, f: int) -> list[list[int]]:
+        """
+        Clauses satisfiable exactly when `f` is, in DIMACS numbering
+        ---
+        Node k is variable k, so input i is variable i + 1; a negative number is
+        a negated variable. Each AND node reachable from `f` gets its three
+        Tseitin clauses, and a unit clause asserts `f`.
+        """
+        if f == self.FALSE:
+            return [[]]
+        if f == self.TRUE:
+            return []
+        clauses = []
+        for node in sorted(self._cone([f])):
+            a, b = _dimacs(self._left[node]), _dimacs(self._right[node])
+            clauses.append([-node, a])
+            clauses.append([-node, b])
+            clauses.append([node, -a, -b])
+        clauses.append([_dimacs(f)])
+        return clauses
+
+    def _is_and(self, f: int) -> bool:
+        return f >> 1 > self._num_inputs
+
+    def _cone(self, literals: Iterable[int]) -> set[int]:
+        seen = set()
+        stack = [f >> 1 for f in literals]
+        while stack:
+            node = stack.pop()
+            if node <= self._num_inputs or node in seen:
+                continue
+            seen.add(node)
+            stack.append(self._left[node] >> 1)
+            stack.append(self._right[node] >> 1)
+        return seen
+
+
+def _dimacs(f: int) -> int:
+    return -(f >> 1) if f & 1 else f >> 1
@@ -0,0 +1,110 @@
+import random
+import unittest
+from itertools import product
+
+from evaluation_function.domain.aig import AIG
+from evaluation_function.domain.budget import Budget
+from evaluation_function.domain.evaluators import EquivalenceEvaluator, atom_masks
+from evaluation_function.domain.flat import FlatFormula
+from evaluation_function.domain.formula import (
+    Atom,
+    Biconditional,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Negation,
+    Truth,
+    Xor,
+)
+from evaluation_function.domain.planner import EnginePlanner, PlannerConfig
+from evaluation_function.parsing.parser import formula_parser
+
+
+def random_formula(rng: random.Random, atoms: list[Atom], depth: int):
+    if depth == 0 or rng.random() < 0.25:
+        return Truth() if rng.random() < 0.05 else rng.choice(atoms)
+    operator = rng.choice([Negation, Conjunction, Disjunction, Implication, Biconditional, Xor])
+    if operator is Negation:
+        return Negation(random_formula(rng, atoms, depth - 1))
+    return operator(random_formula(rng, atoms, depth - 1), random_formula(rng, atoms, depth - 1))
+
+
+def build(text: str) -> tuple[AIG, int]:
+    flat = FlatFormula(formula_parser(text))
+    aig = AIG(len(flat.atoms))
+    return aig, aig.from_flat(flat, range(len(flat.atoms)))
+
+
+class TestAIG(unittest.TestCase):
+
+    def test_simulation_matches_truth_table(self):
+        rng = random.Random(5)
+        atoms = [Atom(name) for name in "pqrs"]
+        masks = atom_masks(4, 0, 16)
+        for _ in range(200):
+            flat = FlatFormula(random_formula(rng, atoms, 5), atoms)
+            aig = AIG(4)
+            output = aig.from_flat(flat, range(4))
+            self.assertEqual(aig.simulate([output], masks, 0xFFFF), [flat.evaluate_masks(masks, 0xFFFF)])
+
+    def test_structural_hashing(self):
+        aig = AIG(2)
+        p, q = aig.input(0), aig.input(1)
+        self.assertEqual(aig.and_(p, q), aig.and_(q, p))
+        self.assertEqual(aig.or_(p, q), aig.negate(aig.and_(aig.negate(p), aig.negate(q))))
+        self.assertEqual(aig.num_nodes, 5)  # ⊥, p, q, p ∧ q and ¬p ∧ ¬q
+
+    def test_constants_and_rewrites(self):
+        aig = AIG(3)
+        p, q, r = aig.input(0), aig.input(1), aig.input(2)
+        pq = aig.and_(p, q)
+        self.assertEqual(aig.and_(p, AIG.TRUE), p)
+        self.assertEqual(aig.and_(p, AIG.FALSE), AIG.FALSE)
+        self.assertEqual(aig.and_(p, aig.negate(p)), AIG.FALSE)
+        self.assertEqual(aig.and_(pq, p), pq)
+        self.assertEqual(aig.and_(pq, aig.negate(q)), AIG.FALSE)
+        self.assertEqual(aig.and_(pq, aig.and_(aig.negate(p), r)), AIG.FALSE)
+        self.assertEqual(aig.and_(aig.negate(pq), aig.negate(p)), aig.negate(p))
+        self.assertEqual(aig.and_(aig.negate(pq), p), aig.and_(p, aig.negate(q)))
+        self.assertEqual(build("(p ∧ q) → p")[1], AIG.TRUE)
+        self.assertEqual(build("p ⊕ p")[1], AIG.FALSE)
+
+    def test_to_cnf(self):
+        rng = random.Random(11)
+        atoms = [Atom(name) for name in "pqr"]
+        for _ in range(100):
+            flat = FlatFormula(random_formula(rng, atoms, 4), atoms)
+            aig = AIG(3)
+            output = aig.from_flat(flat, range(3))
+            clauses = aig.to_cnf(output)
+            num_vars = max([abs(literal) for clause in clauses for literal in clause], default=0)
+            satisfiable = any(
+                all(any(values[abs(literal) - 1] == (literal > 0) for literal in clause) for clause in clauses)
+                for values in product([False, True], repeat=num_vars)
+            )
+            self.assertEqual(satisfiable, flat.evaluate_masks(atom_masks(3, 0, 8), 0xFF) != 0)
+
+    def test_shared_structure(self):
+        aig = AIG(3)
+        p, q, r = aig.input(0), aig.input(1), aig.input(2)
+        pq = aig.and_(p, q)
+        self.assertEqual(aig.size([pq, aig.or_(pq, r), aig.and_(pq, r)]), 3)
+        # Absorption: (p ∧ q) ∨ (p ∧ q ∧ r) is p ∧ q.
+        self.assertEqual(aig.or_(pq, aig.and_(pq, r)), pq)
+
+    def test_miter_equivalence_without_search(self):
+        """Formulas with 80 atoms are proved equivalent on the graph alone, well within a small budget."""
+        atoms1 = [Atom(f"a{i:02}") for i in range(80)]
+        atoms2 = [Atom(f"b{i:02}") for i in range(80)]
+        formula1 = Disjunction(atoms1[0], atoms1[1])
+        formula2 = Disjunction(atoms2[1], atoms2[0])
+        for i in range(2, 80, 2):
+            formula1 = Conjunction(formula1, Implication(atoms1[i], atoms1[i + 1]))
+            formula2 = Conjunction(formula2, Disjunction(atoms2[i + 1], Negation(atoms2[i])))
+        planner = EnginePlanner(PlannerConfig(bdd_max_atoms=0))
+        evaluator = EquivalenceEvaluator(formula1, formula2, planner=planner, budget=Budget(work_limit=5000))
+        self.assertTrue(evaluator.evaluate())
+
+
+if __name__ == "__main__":
+    unittest.main()
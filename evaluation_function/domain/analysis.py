@@ -0,0 +1,52 @@
+from .budget import Budget, UNLIMITED
+from .canonical import canonical_form
+from .formula import Formula, Atom
+from .evaluators import _extract_atoms, PackedTruthTable
+from .planner import default_planner
+
+
+class FormulaAnalysis:
+    """Facts about one formula that several checks share. Each fact is computed on first use, then reused."""
+
+    def __init__(self, formula: Formula, budget: Budget | None = None, truth_table: PackedTruthTable | None = None):
+        """`truth_table`, if given, is the formula's packed table over its atoms sorted by name, computed elsewhere."""
+        self._formula = formula
+        self._budget = budget if budget is not None else UNLIMITED
+        self._atoms = None if truth_table is None else truth_table.atoms
+        self._truth_table = truth_table
+        self._canonical_form = None
+
+    @property
+    def formula(self) -> Formula:
+        return self._formula
+
+    @property
+    def budget(self) -> Budget:
+        """The allowance every check on this formula draws on."""
+        return self._budget
+
+    @property
+    def atoms(self) -> list[Atom]:
+        """The atoms of the formula, sorted by name."""
+        if self._atoms is None:
+            self._atoms = sorted(_extract_atoms(self._formula), key=lambda a: a.name)
+        return self._atoms
+
+    @property
+    def num_atoms(self) -> int:
+        return len(self.atoms)
+
+    @property
+    def truth_table(self) -> PackedTruthTable | None:
+        """The packed truth table over `atoms`, or None when the formula has too many atoms to tabulate."""
+        # A packed table takes 2^n bits, so it is only built within the planner's bit-parallel limit.
+        if self._truth_table is None and self.num_atoms <= default_planner().config.bit_parallel_max_atoms:
+            self._truth_table = PackedTruthTable(self._formula, self.atoms, self._budget)
+        return self._truth_table
+
+    @property
+    def canonical_form(self) -> str:
+        """The formula's `canonical_form`: equal for formulas that differ only in association, operand order and atom names."""
+        if self._canonical_form is None:
+            self._canonical_form = canonical_form(self._formula)
+        return self._canonical_form
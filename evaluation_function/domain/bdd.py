@@ -0,0 +1,148 @@
+from typing import Mapping, Sequence
+
+from .budget import Budget, UNLIMITED
+from .flat import FlatFormula
+from .formula import Formula, Atom
+from .serialization import OP_TRUE, OP_ATOM, OP_NOT, OP_AND, OP_OR, OP_IMPLIES, OP_IFF, OP_XOR
+
+
+class BDDTooLarge(Exception):
+    """Raised when a BDD grows past its node limit, so the caller can switch to another engine."""
+
+
+class BDD:
+    """
+    A manager for reduced ordered binary decision diagrams over variables 0..num_vars-1
+    ---
+    Nodes are ints: 0 is ⊥ and 1 is ⊤. Nodes are hash-consed, so two formulas
+    built in the same manager are equivalent exactly when they get the same node.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, num_vars: int, max_nodes: int | None = None, budget: Budget | None = None):
+        self._num_vars = num_vars
+        self._max_nodes = max_nodes
+        self._budget = budget if budget is not None else UNLIMITED
+        # Terminals sit below every variable.
+        self._var = [num_vars, num_vars]
+        self._low = [0, 1]
+        self._high = [0, 1]
+        self._unique: dict[tuple[int, int, int], int] = {}
+        self._ite_cache: dict[tuple[int, int, int], int] = {}
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._var)
+
+    def variable(self, var: int) -> int:
+        return self._node(var, self.FALSE, self.TRUE)
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """If-then-else: the node for (f ∧ g) ∨ (¬f ∧ h)."""
+        if f == self.TRUE:
+            return g
+        if f == self.FALSE:
+            return h
+        if g == h:
+            return g
+        if g == self.TRUE and h == self.FALSE:
+            return f
+        key = (f, g, h)
+        if key in self._ite_cache:
+            return self._ite_cache[key]
+        self._budget.charge()
+        var = min(self._var[f], self._var[g], self._var[h])
+        f0, f1 = self._cofactors(f, var)
+        g0, g1 = self._cofactors(g, var)
+        h0, h1 = self._cofactors(h, var)
+        result = self._node(var, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self._ite_cache[key] = result
+        return result
+
+    def negate(self, f: int) -> int:
+        return self.ite(f, self.FALSE, self.TRUE)
+
+    def from_formula(self, formula: Formula, index: Mapping[Atom, int]) -> int:
+        """Builds the node for `formula`, with each atom mapped to the variable `index[atom]`."""
+        atoms = list(index)
+        return self.from_flat(FlatFormula(formula, atoms), [index[atom] for atom in atoms])
+
+    def from_flat(self, flat: FlatFormula, variables: Sequence[int]) -> int:
+        """Builds the node for a lowered formula, with the atom in slot i mapped to the variable `variables[i]`."""
+        left = flat.left
+        right = flat.right
+        slots = flat.slots
+        nodes = [self.FALSE] * len(flat)
+        for i, opcode in enumerate(flat.opcodes):
+            if opcode == OP_ATOM:
+                nodes[i] = self.variable(variables[slots[i]])
+            elif opcode == OP_TRUE:
+                nodes[i] = self.TRUE
+            elif opcode == OP_NOT:
+                nodes[i] = self.negate(nodes[left[i]])
+            elif opcode == OP_AND:
+                nodes[i] = self.ite(nodes[left[i]], nodes[right[i]], self.FALSE)
+            elif opcode == OP_OR:
+                nodes[i] = self.ite(nodes[left[i]], self.TRUE, nodes[right[i]])
+            elif opcode == OP_IMPLIES:
+                nodes[i] = self.ite(nodes[left[i]], nodes[right[i]], self.TRUE)
+            elif opcode == OP_IFF:
+                nodes[i] = self.ite(nodes[left[i]], nodes[right[i]], self.negate(nodes[right[i]]))
+            elif opcode == OP_XOR:
+                nodes[i] = self.ite(nodes[left[i]], self.negate(nodes[right[i]]), nodes[right[i]])
+            # OP_FALSE leaves FALSE
+        return nodes[-1]
+
+    def size(self, f: int) -> int:
+        """Number of nodes reachable from `f`, terminals included."""
+        seen = set()
+        stack = [f]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node > self.TRUE:
+                stack.append(self._low[node])
+                stack.append(self._high[node])
+        return len(seen)
+
+    def first_assignment(self, f: int) -> list[bool] | None:
+        """
+        The first satisfying assignment of `f` when assignments are listed
+        False-before-True (variable 0 most significant), or None if `f` is ⊥.
+        """
+        if f == self.FALSE:
+            return None
+        values = [False] * self._num_vars
+        node = f
+        while node > self.TRUE:
+            # Every node other than ⊥ has a model, so prefer the low branch whenever it is not ⊥.
+            if self._low[node] != self.FALSE:
+                node = self._low[node]
+            else:
+                values[self._var[node]] = True
+                node = self._high[node]
+        return values
+
+    def _cofactors(self, f: int, var: int) -> tuple[int, int]:
+        if self._var[f] != var:
+            return f, f
+        return self._low[f], self._high[f]
+
+    def _node(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            if self._max_nodes is not None and len(self._var) >= self._max_nodes:
+                raise BDDTooLarge(f"BDD exceeded {self._max_nodes} nodes")
+            node = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
@@ -0,0 +1,77 @@
+import logging
+import time
+from typing import Any, Callable
+
+from evaluation_function.env import env_number
+
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(Exception):
+    """Raised from inside an evaluator when its time or work budget runs out."""
+
+
+class Budget:
+    """
+    A time and work allowance that long-running loops draw on cooperatively
+    ---
+    Evaluators call `charge()` once per step (an assignment evaluated, a node
+    built, a search branch taken). When the deadline has passed or the work
+    limit is used up, `charge()` raises `BudgetExceeded`. A limit of None means
+    unlimited.
+    """
+
+    def __init__(
+        self,
+        time_limit: float | None = None,
+        work_limit: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._deadline = None if time_limit is None else clock() + time_limit
+        self._work_limit = work_limit
+        self._work = 0
+
+    @property
+    def work(self) -> int:
+        return self._work
+
+    def charge(self, steps: int = 1):
+        self._work += steps
+        if self._work_limit is not None and self._work > self._work_limit:
+            raise BudgetExceeded(f"work budget of {self._work_limit} steps exhausted")
+        if self._deadline is not None and self._clock() > self._deadline:
+            raise BudgetExceeded("time budget exhausted")
+
+    @staticmethod
+    def from_params(params: Any) -> "Budget":
+        """
+        The budget for one request: `timeLimit` (seconds) and `workLimit` (steps) from
+        `params`, or else the server-wide defaults `EVAL_TIME_LIMIT` and `EVAL_WORK_LIMIT`.
+        """
+        get = getattr(params, "get", None)
+        time_limit = _positive(get("timeLimit") if get else None, float)
+        work_limit = _positive(get("workLimit") if get else None, int)
+        if time_limit is None:
+            time_limit = _positive(env_number("EVAL_TIME_LIMIT", DEFAULT_TIME_LIMIT, float), float)
+        if work_limit is None:
+            work_limit = _positive(env_number("EVAL_WORK_LIMIT", None, int), int)
+        return Budget(time_limit, work_limit)
+
+
+# Seconds a request may spend evaluating when neither params nor EVAL_TIME_LIMIT say otherwise.
+DEFAULT_TIME_LIMIT = 10.0
+
+UNLIMITED = Budget()
+
+
+def _positive(value: Any, kind: type) -> float | int | None:
+    if value is None or isinstance(value, bool) or value == "":
+        return None
+    try:
+        number = kind(value)
+    except (TypeError, ValueError):
+        logger.warning("ignoring budget limit %r: not a number", value)
+        return None
+    return number if number > 0 else None
@@ -0,0 +1,77 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from evaluation_function.domain.budget import DEFAULT_TIME_LIMIT, Budget, BudgetExceeded
+from evaluation_function.domain.evaluators import (
+    EquivalenceEvaluator,
+    ModelCountEvaluator,
+    SatisfiabilityEvaluator,
+    TautologyEvaluator,
+)
+from evaluation_function.domain.formula import Atom, Conjunction, Disjunction, Negation
+from evaluation_function.domain.planner import EnginePlanner, PlannerConfig
+from evaluation_function.parsing.parser import formula_parser
+
+
+def chain(num_atoms):
+    atoms = [Atom(f"x{i}") for i in range(num_atoms)]
+    formula = Disjunction(atoms[0], Negation(atoms[1]))
+    for i in range(2, num_atoms):
+        formula = Conjunction(formula, Disjunction(Disjunction(atoms[i - 1], atoms[i - 2]), atoms[i]))
+    return Negation(formula)
+
+
+class TestBudget(unittest.TestCase):
+
+    def test_work_limit(self):
+        budget = Budget(work_limit=3)
+        budget.charge(3)
+        with self.assertRaises(BudgetExceeded):
+            budget.charge()
+
+    def test_time_limit(self):
+        now = [0.0]
+        budget = Budget(time_limit=1.0, clock=lambda: now[0])
+        budget.charge()
+        now[0] = 1.5
+        with self.assertRaises(BudgetExceeded):
+            budget.charge()
+
+    def test_from_params_overrides_environment(self):
+        with mock.patch.dict(os.environ, {"EVAL_WORK_LIMIT": "5"}):
+            Budget.from_params({"workLimit": 100}).charge(50)
+            with self.assertRaises(BudgetExceeded):
+                Budget.from_params({}).charge(6)
+
+    def test_invalid_environment_limit_falls_back_to_default(self):
+        with mock.patch.dict(os.environ, {"EVAL_TIME_LIMIT": "soon"}):
+            with self.assertLogs("evaluation_function.env", "WARNING"):
+                budget = Budget.from_params({})
+        self.assertAlmostEqual(budget._deadline - time.monotonic(), DEFAULT_TIME_LIMIT, delta=1.0)
+
+    def test_every_engine_stops_when_work_runs_out(self):
+        formula = Disjunction(chain(14), Negation(chain(14)))
+        for config in [
+            PlannerConfig(brute_force_max_work=10 ** 9),
+            PlannerConfig(brute_force_max_work=0),
+            PlannerConfig(brute_force_max_work=0, bit_parallel_max_atoms=0),
+            PlannerConfig(brute_force_max_work=0, bit_parallel_max_atoms=0, bdd_max_atoms=0),
+        ]:
+            planner = EnginePlanner(config)
+            with self.assertRaises(BudgetExceeded):
+                TautologyEvaluator(formula, planner=planner, budget=Budget(work_limit=10)).evaluate()
+            with self.assertRaises(BudgetExceeded):
+                EquivalenceEvaluator(formula, formula, planner=planner, budget=Budget(work_limit=10)).evaluate()
+        with self.assertRaises(BudgetExceeded):
+            ModelCountEvaluator(formula, budget=Budget(work_limit=10)).evaluate()
+
+    def test_generous_budget_does_not_change_answers(self):
+        formula = formula_parser("(p → q) ∧ (q → r) ∧ p ∧ ¬r")
+        self.assertFalse(SatisfiabilityEvaluator(formula, budget=Budget(work_limit=10 ** 6)).evaluate())
+        self.assertEqual(ModelCountEvaluator(formula_parser("p ∨ q"), budget=Budget(work_limit=10 ** 6)).evaluate(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
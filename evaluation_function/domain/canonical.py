@@ -0,0 +1,75 @@
+from .flat import FlatFormula
+from .formula import Formula
+from .serialization import OP_TRUE, OP_FALSE, OP_ATOM, OP_NOT, OP_AND, OP_OR, OP_IMPLIES, OP_IFF, OP_XOR
+
+
+# Associative and commutative operators, whose chains are flattened and whose operands are sorted.
+_AC_OPCODES = {OP_AND: "∧", OP_OR: "∨", OP_IFF: "↔", OP_XOR: "⊕"}
+
+
+def canonical_form(formula: Formula) -> str:
+    """
+    A canonical rendering of `formula`, equal for formulas that differ only in
+    association, order of commutative operands or names of atoms
+    ---
+    Chains of ∧, ∨, ⊕ and ↔ are flattened into one operand list, each list is
+    sorted by the shape of its operands (the operand printed with every atom
+    written `_`), and atoms are then renamed x1, x2, ... in order of first
+    occurrence. Operands with the same shape keep their original order, so two
+    such formulas can still get different forms; but equal forms always mean
+    the formulas are the same up to those rewrites, and so equivalent up to
+    renaming of atoms. The form is written in the input syntax.
+    """
+    flat = FlatFormula(formula)
+    opcodes = flat.opcodes
+    left = flat.left
+    right = flat.right
+
+    # Bottom-up: operand lists (with chains flattened) and shapes.
+    operands: list[list[int]] = [[] for _ in range(len(flat))]
+    shapes: list[str] = [""] * len(flat)
+    for i, opcode in enumerate(opcodes):
+        if opcode == OP_ATOM:
+            shapes[i] = "_"
+        elif opcode == OP_TRUE:
+            shapes[i] = "⊤"
+        elif opcode == OP_FALSE:
+            shapes[i] = "⊥"
+        elif opcode == OP_NOT:
+            operands[i] = [left[i]]
+            shapes[i] = "¬" + shapes[left[i]]
+        elif opcode in _AC_OPCODES:
+            chain = []
+            for child in (left[i], right[i]):
+                chain.extend(operands[child] if opcodes[child] == opcode else [child])
+            chain.sort(key=lambda child: shapes[child])
+            operands[i] = chain
+            shapes[i] = "(" + f" {_AC_OPCODES[opcode]} ".join(shapes[child] for child in chain) + ")"
+        else:
+            operands[i] = [left[i], right[i]]
+            shapes[i] = f"({shapes[left[i]]} → {shapes[right[i]]})"
+
+    # Top-down in operand order: number the atoms by first occurrence.
+    names: dict[int, str] = {}
+    stack = [len(flat) - 1]
+    while stack:
+        i = stack.pop()
+        if opcodes[i] == OP_ATOM:
+            names.setdefault(flat.slots[i], f"x{len(names) + 1}")
+        else:
+            stack.extend(reversed(operands[i]))
+
+    # Bottom-up again: the rendering, for every node that heads its operand list.
+    rendered: list[str] = [""] * len(flat)
+    for i, opcode in enumerate(opcodes):
+        if opcode == OP_ATOM:
+            rendered[i] = names[flat.slots[i]]
+        elif opcode == OP_NOT:
+            rendered[i] = "¬" + rendered[left[i]]
+        elif opcode in _AC_OPCODES:
+            rendered[i] = "(" + f" {_AC_OPCODES[opcode]} ".join(rendered[child] for child in operands[i]) + ")"
+        elif opcode == OP_IMPLIES:
+            rendered[i] = f"({rendered[left[i]]} → {rendered[right[i]]})"
+        else:
+            rendered[i] = shapes[i]
+    return rendered[-1]
@@ -0,0 +1,51 @@
+import unittest
+
+from evaluation_function.domain.canonical import canonical_form
+from evaluation_function.domain.formula import Atom, Conjunction
+from evaluation_function.parsing.parser import formula_parser
+
+
+def canonical(text: str) -> str:
+    return canonical_form(formula_parser(text))
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def test_renames_atoms(self):
+        self.assertEqual(canonical("p ∧ q"), "(x1 ∧ x2)")
+        self.assertEqual(canonical("a ∧ b"), canonical("p ∧ q"))
+
+    def test_sorts_commutative_operands(self):
+        self.assertEqual(canonical("q ∧ p"), canonical("p ∧ q"))
+        self.assertEqual(canonical("¬p ∨ q"), canonical("q ∨ ¬p"))
+        self.assertEqual(canonical("(p → q) ⊕ r"), canonical("r ⊕ (p → q)"))
+
+    def test_flattens_chains(self):
+        self.assertEqual(canonical("(p ∧ q) ∧ r"), canonical("p ∧ (q ∧ r)"))
+        self.assertEqual(canonical("p ↔ (q ↔ r)"), "(x1 ↔ x2 ↔ x3)")
+        self.assertEqual(canonical("(p ∧ q) ∨ r"), canonical("r ∨ (q ∧ p)"))
+
+    def test_keeps_distinctions(self):
+        self.assertNotEqual(canonical("p → q"), canonical("q → p ∧ r"))
+        self.assertNotEqual(canonical("p ∧ p"), canonical("p ∧ q"))
+        self.assertNotEqual(canonical("(p ∧ q) ∨ r"), canonical("p ∧ (q ∨ r)"))
+        self.assertNotEqual(canonical("p ∧ ⊤"), canonical("p ∧ ⊥"))
+
+    def test_implication_is_ordered(self):
+        self.assertEqual(canonical("¬q → p"), "(¬x1 → x2)")
+        self.assertEqual(canonical("p → ¬q"), "(x1 → ¬x2)")
+
+    def test_form_parses_to_an_equal_form(self):
+        for text in ["(a ∧ b) ∨ (¬c ⊕ d ⊕ a)", "p → (q ↔ r ↔ ¬p)", "⊤ ∨ (p ∧ q ∧ r)"]:
+            form = canonical(text)
+            self.assertEqual(canonical(form), form)
+
+    def test_deep_formula(self):
+        formula = Atom("p0")
+        for i in range(1, 5000):
+            formula = Conjunction(formula, Atom(f"p{i}"))
+        self.assertEqual(canonical_form(formula).count("∧"), 4999)
+
+
+if __name__ == "__main__":
+    unittest.main()
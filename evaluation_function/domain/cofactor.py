@@ -0,0 +1,122 @@
+from typing import Mapping
+
+from .formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Biconditional,
+    Xor,
+    BinaryOperator,
+)
+from .traversal import fold
+
+
+def cofactor(formula: Formula, atom: Atom, value: bool) -> Formula:
+    """
+    Returns `formula` with `atom` fixed to `value`, with constants folded away.
+    ---
+    The result is either ⊤, ⊥, or a formula that contains no constants, so a
+    formula is decided exactly when its cofactor is a constant. Subtrees that
+    do not mention `atom` (or a constant) are returned unchanged.
+    """
+    return _restrict(formula, atom, value)
+
+
+def fold_constants(formula: Formula) -> Formula:
+    """Returns `formula` with any ⊤ and ⊥ it was written with folded away, as `cofactor` does."""
+    return _restrict(formula, None, False)
+
+
+def rename_atoms(formula: Formula, renaming: Mapping[Atom, Atom]) -> Formula:
+    """Returns `formula` with every atom in `renaming` replaced by its image."""
+    return fold(formula, {
+        Atom: lambda node: renaming.get(node, node),
+        Truth: lambda node: node,
+        Falsity: lambda node: node,
+        Negation: lambda node, operand: Negation(operand),
+        BinaryOperator: lambda node, left, right: type(node)(left, right),
+    })
+
+
+def _restrict(formula: Formula, atom: Atom | None, value: bool) -> Formula:
+    constant = Truth() if value else Falsity()
+
+    def restrict_negation(node: Negation, operand: Formula) -> Formula:
+        if operand is node.operand and not _is_constant(operand):
+            return node
+        return _negate(operand)
+
+    def restrict_binary(node: BinaryOperator, left: Formula, right: Formula) -> Formula:
+        if left is node.left and right is node.right and not _is_constant(left) and not _is_constant(right):
+            return node
+        return _fold(type(node), left, right)
+
+    return fold(formula, {
+        Atom: lambda node: constant if node == atom else node,
+        Truth: lambda node: node,
+        Falsity: lambda node: node,
+        Negation: restrict_negation,
+        BinaryOperator: restrict_binary,
+    })
+
+
+def _is_constant(formula: Formula) -> bool:
+    return isinstance(formula, (Truth, Falsity))
+
+
+def _negate(formula: Formula) -> Formula:
+    if isinstance(formula, Truth):
+        return Falsity()
+    if isinstance(formula, Falsity):
+        return Truth()
+    return Negation(formula)
+
+
+def _fold(operator: type, left: Formula, right: Formula) -> Formula:
+    if operator is Conjunction:
+        if isinstance(left, Falsity) or isinstance(right, Falsity):
+            return Falsity()
+        if isinstance(left, Truth):
+            return right
+        if isinstance(right, Truth):
+            return left
+    elif operator is Disjunction:
+        if isinstance(left, Truth) or isinstance(right, Truth):
+            return Truth()
+        if isinstance(left, Falsity):
+            return right
+        if isinstance(right, Falsity):
+            return left
+    elif operator is Implication:
+        if isinstance(left, Falsity) or isinstance(right, Truth):
+            return Truth()
+        if isinstance(left, Truth):
+            return right
+        if isinstance(right, Falsity):
+            return _negate(left)
+    elif operator is Biconditional:
+        if isinstance(left, Truth):
+            return right
+        if isinstance(right, Truth):
+            return left
+        if isinstance(left, Falsity):
+            return _negate(right)
+        if isinstance(right, Falsity):
+            return _negate(left)
+    elif operator is Xor:
+        if isinstance(left, Falsity):
+            return right
+        if isinstance(right, Falsity):
+            return left
+        if isinstance(left, Truth):
+            return _negate(right)
+        if isinstance(right, Truth):
+            return _negate(left)
+    else:
+        raise TypeError(f"Unknown formula type: {operator}")
+    return operator(left, right)
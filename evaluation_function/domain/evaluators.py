@@ -1,5 +1,7 @@
+import random
+from collections import Counter
 from itertools import product, permutations
-from typing import Mapping, Set
+from typing import Any, Iterator, Mapping, Sequence, Set
 from .formula import (
     Formula,
     Atom,
@@ -12,6 +14,14 @@ from .formula import (
     Biconditional,
     Xor,
 )
+from .aig import AIG
+from .bdd import BDD, BDDTooLarge
+from .flat import FlatFormula
+from .budget import Budget, UNLIMITED
+from .cofactor import cofactor, fold_constants, rename_atoms
+from .planner import Check, Engine, EnginePlanner, default_planner
+from .tractable import _flatten
+from .traversal import atoms_of, fold
 
 
 class Assignment:
@@ -33,54 +43,229 @@ class FormulaEvaluator:
         self._assignment = assignment
 
     def evaluate(self) -> bool:
-        return self._evaluate_formula(self._formula)
-
-    def _evaluate_formula(self, formula: Formula) -> bool:
-        if isinstance(formula, Atom):
-            return self._assignment.get(formula)
-        if isinstance(formula, Truth):
-            return True
-        if isinstance(formula, Falsity):
-            return False
-        if isinstance(formula, Negation):
-            return not self._evaluate_formula(formula.operand)
-        if isinstance(formula, Conjunction):
-            return self._evaluate_formula(formula.left) and self._evaluate_formula(formula.right)
-        if isinstance(formula, Disjunction):
-            return self._evaluate_formula(formula.left) or self._evaluate_formula(formula.right)
-        if isinstance(formula, Implication):
-            return not self._evaluate_formula(formula.left) or self._evaluate_formula(formula.right)
-        if isinstance(formula, Biconditional):
-            return self._evaluate_formula(formula.left) == self._evaluate_formula(formula.right)
-        if isinstance(formula, Xor):
-            left_val = self._evaluate_formula(formula.left)
-            right_val = self._evaluate_formula(formula.right)
-            return left_val != right_val
-        raise TypeError(f"Unknown formula type: {type(formula)}")
+        value = self._assignment.get
+        return fold(self._formula, {
+            Atom: value,
+            Truth: lambda node: True,
+            Falsity: lambda node: False,
+            Negation: lambda node, operand: not operand,
+            Conjunction: lambda node, left, right: left and right,
+            Disjunction: lambda node, left, right: left or right,
+            Implication: lambda node, left, right: not left or right,
+            Biconditional: lambda node, left, right: left == right,
+            Xor: lambda node, left, right: left != right,
+        })
+
+
+def atom_masks(num_atoms: int, start: int, count: int) -> list[int]:
+    """Column masks for rows [start, start + count): bit k of mask i is set iff atom i is true in row start + k.
+
+    Rows are numbered in the usual textbook order, so row 0 makes every atom true and the last row makes every atom false.
+    """
+    masks = []
+    for i in range(num_atoms):
+        half = 1 << (num_atoms - 1 - i)
+        period = half << 1
+        base = start - start % period
+        repeats = -(-(start + count - base) // period)
+        pattern = ((1 << half) - 1) * (((1 << (period * repeats)) - 1) // ((1 << period) - 1))
+        masks.append((pattern >> (start - base)) & ((1 << count) - 1))
+    return masks
+
+
+class BitParallelEvaluator:
+    """Evaluates a formula on many assignments at once, one assignment per bit of a Python int."""
+
+    def __init__(self, formula: Formula, atoms: Sequence[Atom] | None = None, budget: Budget | None = None):
+        self._formula = formula
+        if atoms is None:
+            atoms = sorted(_extract_atoms(formula), key=lambda a: a.name)
+        self._atoms = list(atoms)
+        self._budget = budget if budget is not None else UNLIMITED
+        self._flat = FlatFormula(formula, self._atoms)
+        # Other formulas evaluated over the same atoms, lowered on first use (kept with the formula so its id stays unique).
+        self._lowered: dict[int, tuple[Formula, FlatFormula]] = {}
+
+    @property
+    def atoms(self) -> list[Atom]:
+        return self._atoms
+
+    def evaluate_masks(self, masks: Mapping[Atom, int], width: int, formula: Formula | None = None) -> int:
+        """Evaluates `formula` (default: the evaluator's formula) with each atom bound to a `width`-bit mask."""
+        if formula is None:
+            flat = self._flat
+        else:
+            if id(formula) not in self._lowered:
+                self._lowered[id(formula)] = (formula, FlatFormula(formula, self._atoms))
+            flat = self._lowered[id(formula)][1]
+        try:
+            slot_masks = [masks[atom] for atom in self._atoms]
+        except KeyError as e:
+            raise ValueError(f"Atom {e.args[0].name} not found in assignment")
+        self._budget.charge(len(flat))
+        return flat.evaluate_masks(slot_masks, (1 << width) - 1)
+
+    def evaluate_rows(self, start: int, count: int, formula: Formula | None = None) -> int:
+        """Returns the values on rows [start, start + count) of the truth table over `atoms`, packed into an int."""
+        masks = dict(zip(self._atoms, atom_masks(len(self._atoms), start, count)))
+        return self.evaluate_masks(masks, count, formula)
+
+
+class PackedTruthTable:
+    """The full truth table of a formula over `atoms`, packed so that bit r holds the value on row r."""
+
+    def __init__(self, formula: Formula, atoms: Sequence[Atom] | None = None, budget: Budget | None = None):
+        evaluator = BitParallelEvaluator(formula, atoms, budget)
+        self._atoms = evaluator.atoms
+        self._bits = evaluator.evaluate_rows(0, 1 << len(self._atoms))
+        self._signature = None
+
+    @staticmethod
+    def from_bits(atoms: Sequence[Atom], bits: int) -> "PackedTruthTable":
+        """A table whose bits are already known, e.g. read back from a cache."""
+        table = PackedTruthTable.__new__(PackedTruthTable)
+        table._atoms = list(atoms)
+        table._bits = bits
+        table._signature = None
+        return table
+
+    @property
+    def atoms(self) -> list[Atom]:
+        return self._atoms
+
+    @property
+    def num_atoms(self) -> int:
+        return len(self._atoms)
+
+    @property
+    def num_rows(self) -> int:
+        return 1 << len(self._atoms)
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def value(self, row: int) -> bool:
+        return bool(self._bits >> row & 1)
+
+    def assignment(self, row: int) -> dict[Atom, bool]:
+        n = len(self._atoms)
+        return {atom: not row >> (n - 1 - i) & 1 for i, atom in enumerate(self._atoms)}
+
+    def count(self) -> int:
+        return self._bits.bit_count()
+
+    def first_row(self, value: bool) -> int | None:
+        """Returns the first row on which the formula takes `value`, or None if there is no such row."""
+        rows = self._rows_with_value(value)
+        if rows == 0:
+            return None
+        return (rows & -rows).bit_length() - 1
+
+    def last_row(self, value: bool) -> int | None:
+        """Returns the last row on which the formula takes `value`, or None if there is no such row."""
+        rows = self._rows_with_value(value)
+        if rows == 0:
+            return None
+        return rows.bit_length() - 1
+
+    def signature(self) -> tuple[int, ...]:
+        """
+        The number of models, then the number of models that make each atom true, sorted
+        ---
+        Renaming atoms permutes the per-atom counts, so formulas that are
+        equivalent up to renaming have equal signatures.
+        """
+        if self._signature is None:
+            per_atom = [(self._bits & mask).bit_count() for mask in atom_masks(self.num_atoms, 0, self.num_rows)]
+            self._signature = (self.count(), *sorted(per_atom))
+        return self._signature
+
+    def _rows_with_value(self, value: bool) -> int:
+        return self._bits if value else ((1 << self.num_rows) - 1) ^ self._bits
+
+
+class SimulationSample:
+    """
+    A fixed sample of assignments on which formulas too large to tabulate are simulated
+    ---
+    Bit k of `masks[i]` is the value of atom i in assignment k, so a
+    `BitParallelEvaluator` evaluates the whole sample in one pass. The sample
+    starts with structured assignments: all atoms true, all false, then, when
+    there is room, each atom alone true and each atom alone false. The rest are
+    pseudo-random with a fixed seed, so the same formulas always get the same
+    counterexample. Renaming atoms maps each structured group onto itself, so
+    formulas equivalent up to renaming are true on equally many assignments of
+    each group.
+    """
+
+    def __init__(self, num_atoms: int, rows: int, seed: int = 0):
+        structured = 2 + 2 * num_atoms
+        if structured > rows:
+            structured = 2
+            self._groups = [0b01, 0b10]
+        else:
+            one_hot = sum(1 << (2 + 2 * i) for i in range(num_atoms))
+            self._groups = [0b01, 0b10, one_hot, one_hot << 1]
+        self._rows = max(rows, structured)
+        rng = random.Random(seed)
+        self._masks = []
+        for i in range(num_atoms):
+            mask = 0b01
+            if len(self._groups) > 2:
+                # Atom i is the one true atom of row 2 + 2i and true in every other one-false row.
+                mask |= 1 << (2 + 2 * i) | (self._groups[3] ^ 1 << (3 + 2 * i))
+            mask |= rng.getrandbits(self._rows - structured) << structured
+            self._masks.append(mask)
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def masks(self) -> list[int]:
+        return self._masks
+
+    @property
+    def groups(self) -> list[int]:
+        """Masks of the rows of each structured group, which renaming permutes among themselves."""
+        return self._groups
+
+    def assignment(self, atoms: Sequence[Atom], row: int) -> dict[Atom, bool]:
+        return {atom: bool(mask >> row & 1) for atom, mask in zip(atoms, self._masks)}
 
 
 def _extract_atoms(formula: Formula) -> Set[Atom]:
-    atoms = set()
-    
-    if isinstance(formula, Atom):
-        atoms.add(formula)
-    elif isinstance(formula, (Truth, Falsity)):
-        pass
-    elif isinstance(formula, Negation):
-        atoms.update(_extract_atoms(formula.operand))
-    elif isinstance(formula, (Conjunction, Disjunction, Implication, Biconditional, Xor)):
-        atoms.update(_extract_atoms(formula.left))
-        atoms.update(_extract_atoms(formula.right))
-    
-    return atoms
+    return atoms_of(formula)
+
+
+def _index_by_name(formula: Formula) -> dict[Atom, int]:
+    """Variable numbers for the formula's atoms, in name order (dicts keep that order)."""
+    return {atom: i for i, atom in enumerate(sorted(_extract_atoms(formula), key=lambda a: a.name))}
 
 
 class EquivalenceEvaluator:
     """Checks if two formulas are equivalent up to renaming of atoms (so e.g. 's' and 'p' are equivalent)."""
 
-    def __init__(self, formula1: Formula, formula2: Formula):
+    def __init__(
+        self,
+        formula1: Formula,
+        formula2: Formula,
+        truth_table: PackedTruthTable | None = None,
+        planner: EnginePlanner | None = None,
+        budget: Budget | None = None,
+        truth_table2: PackedTruthTable | None = None,
+    ):
+        """
+        `truth_table` and `truth_table2`, if given, are the packed tables of
+        `formula1` and `formula2` over their atoms sorted by name.
+        """
         self._formula1 = formula1
         self._formula2 = formula2
+        self._truth_table = truth_table
+        self._truth_table2 = truth_table2
+        self._planner = planner if planner is not None else default_planner()
+        self._budget = budget if budget is not None else UNLIMITED
 
     def evaluate(self) -> bool:
         ok, _ = self.evaluate_with_counterexample()
@@ -99,16 +284,41 @@ class EquivalenceEvaluator:
                 "reason": f"different number of atoms: {len(atoms1)} vs {len(atoms2)}",
             }
 
+        if self._truth_table is not None:
+            return self._evaluate_bit_parallel(self._truth_table, atoms2)
+
+        plan = self._planner.plan(Check.EQUIVALENCE, [self._formula1, self._formula2])
+        if plan.engine is Engine.BIT_PARALLEL:
+            return self._evaluate_bit_parallel(PackedTruthTable(self._formula1, atoms1, self._budget), atoms2)
+        if plan.engine in (Engine.BDD, Engine.SAT):
+            # Too many atoms to tabulate: simulation rejects most inequivalent pairs, and
+            # most renamings of equivalent ones, before an exact engine is built.
+            simulation = None
+            if self._planner.config.simulation_rows > 0:
+                simulation = _RenamingSimulation(
+                    SimulationSample(len(atoms1), self._planner.config.simulation_rows),
+                    self._formula1, self._formula2, atoms1, atoms2, self._budget,
+                )
+                counterexample = simulation.invariant_counterexample()
+                if counterexample is not None:
+                    return False, counterexample
+        if plan.engine is Engine.BDD:
+            try:
+                return self._evaluate_bdd(atoms1, atoms2, simulation)
+            except BDDTooLarge:
+                pass
+        if plan.engine in (Engine.BDD, Engine.SAT):
+            return self._evaluate_sat(atoms1, atoms2, simulation)
+
         n = len(atoms1)
+        flat1 = FlatFormula(self._formula1, atoms1)
+        flat2 = FlatFormula(self._formula2, atoms2)
         first_counterexample = None
         for perm in permutations(range(n)):
             for assignment_values in product([False, True], repeat=n):
-                assignment2_dict = {atoms2[i]: assignment_values[i] for i in range(n)}
-                assignment1_dict = {atoms1[j]: assignment_values[perm[j]] for j in range(n)}
-                a1 = Assignment(assignment1_dict)
-                a2 = Assignment(assignment2_dict)
-                v1 = FormulaEvaluator(self._formula1, a1).evaluate()
-                v2 = FormulaEvaluator(self._formula2, a2).evaluate()
+                self._budget.charge()
+                v1 = flat1.evaluate([assignment_values[perm[j]] for j in range(n)])
+                v2 = flat2.evaluate(assignment_values)
                 if v1 != v2:
                     if first_counterexample is None:
                         first_counterexample = {
@@ -121,29 +331,279 @@ class EquivalenceEvaluator:
                 return True, None
         return False, first_counterexample
 
+    def _evaluate_bit_parallel(self, table1: PackedTruthTable, atoms2: list[Atom]) -> tuple[bool, dict | None]:
+        # Same search as above, but formula2 is re-indexed for each permutation
+        # so that formula1's table is computed once and shared.
+        atoms1 = table1.atoms
+        n = len(atoms1)
+        masks = atom_masks(n, 0, table1.num_rows)
+        evaluator2 = BitParallelEvaluator(self._formula2, atoms2, self._budget)
+        if self._truth_table2 is not None:
+            table2 = self._truth_table2
+        else:
+            table2 = PackedTruthTable.from_bits(atoms2, evaluator2.evaluate_masks(dict(zip(atoms2, masks)), table1.num_rows))
+        if table2.bits != table1.bits and table2.signature() != table1.signature():
+            # No renaming can work, so the identity renaming, which is tried first, gives the counterexample.
+            return False, self._table_counterexample(table1, table1.bits ^ table2.bits)
+
+        first_counterexample = None
+        for perm in permutations(range(n)):
+            if perm == tuple(range(n)):
+                bits2 = table2.bits
+            else:
+                bits2 = evaluator2.evaluate_masks({atoms2[perm[j]]: masks[j] for j in range(n)}, table1.num_rows)
+            diff = table1.bits ^ bits2
+            if diff == 0:
+                return True, None
+            if first_counterexample is None:
+                first_counterexample = self._table_counterexample(table1, diff)
+        return False, first_counterexample
+
+    @staticmethod
+    def _table_counterexample(table1: PackedTruthTable, diff: int) -> dict:
+        # The last differing row is the first one in False-before-True enumeration order.
+        row = diff.bit_length() - 1
+        return {
+            "assignment": {atom.name: value for atom, value in table1.assignment(row).items()},
+            "response_value": table1.value(row),
+            "expected_value": not table1.value(row),
+        }
+
+    def _evaluate_bdd(
+        self, atoms1: list[Atom], atoms2: list[Atom], simulation: "_RenamingSimulation | None" = None
+    ) -> tuple[bool, dict | None]:
+        n = len(atoms1)
+        bdd = BDD(n, self._planner.config.bdd_max_nodes, self._budget)
+        node1 = bdd.from_flat(FlatFormula(self._formula1, atoms1), range(n))
+        flat2 = FlatFormula(self._formula2, atoms2)
+        first_counterexample = None
+        for perm in permutations(range(n)):
+            counterexample = simulation.counterexample(perm) if simulation is not None else None
+            if counterexample is not None:
+                if first_counterexample is None:
+                    first_counterexample = counterexample
+                continue
+            # Slot i of flat2 holds atoms2[i], which perm sends to variable j where perm[j] == i.
+            variables = [0] * n
+            for j in range(n):
+                variables[perm[j]] = j
+            node2 = bdd.from_flat(flat2, variables)
+            if node1 == node2:
+                return True, None
+            if first_counterexample is None:
+                values = bdd.first_assignment(bdd.ite(node1, bdd.negate(node2), node2))
+                first_counterexample = self._counterexample(dict(zip(atoms1, values)))
+        return False, first_counterexample
+
+    def _evaluate_sat(
+        self, atoms1: list[Atom], atoms2: list[Atom], simulation: "_RenamingSimulation | None" = None
+    ) -> tuple[bool, dict | None]:
+        # A renaming works when the miter formula1 ⊕ formula2' has no model. Both sides are
+        # built into one and-inverter graph first: when they share enough structure, the
+        # miter folds to ⊥ there and no search is needed.
+        n = len(atoms1)
+        aig = AIG(n, self._budget)
+        output1 = aig.from_flat(FlatFormula(self._formula1, atoms1), range(n))
+        flat2 = FlatFormula(self._formula2, atoms2)
+        first_counterexample = None
+        for perm in permutations(range(n)):
+            counterexample = simulation.counterexample(perm) if simulation is not None else None
+            if counterexample is not None:
+                if first_counterexample is None:
+                    first_counterexample = counterexample
+                continue
+            inputs = [0] * n
+            for j in range(n):
+                inputs[perm[j]] = j
+            if aig.xor(output1, aig.from_flat(flat2, inputs)) == AIG.FALSE:
+                return True, None
+            renamed = rename_atoms(self._formula2, {atoms2[perm[j]]: atoms1[j] for j in range(n)})
+            model = next(ModelEnumerator(Xor(self._formula1, renamed), atoms1, self._budget).models(), None)
+            if model is None:
+                return True, None
+            if first_counterexample is None:
+                first_counterexample = self._counterexample(model[1])
+        return False, first_counterexample
+
+    def _counterexample(self, assignment1: dict[Atom, bool]) -> dict:
+        response_value = FormulaEvaluator(self._formula1, Assignment(assignment1)).evaluate()
+        return {
+            "assignment": {atom.name: value for atom, value in assignment1.items()},
+            "response_value": response_value,
+            "expected_value": not response_value,
+        }
+
+
+class _RenamingSimulation:
+    """formula1 and formula2 simulated on one sample, formula2 under renamings of its atoms onto formula1's."""
+
+    def __init__(
+        self,
+        sample: SimulationSample,
+        formula1: Formula,
+        formula2: Formula,
+        atoms1: list[Atom],
+        atoms2: list[Atom],
+        budget: Budget,
+    ):
+        self._sample = sample
+        self._atoms1 = atoms1
+        self._atoms2 = atoms2
+        self._bits1 = BitParallelEvaluator(formula1, atoms1, budget).evaluate_masks(
+            dict(zip(atoms1, sample.masks)), sample.rows
+        )
+        self._evaluator2 = BitParallelEvaluator(formula2, atoms2, budget)
+        self._identity = self._bits2(tuple(range(len(atoms1))))
+
+    def invariant_counterexample(self) -> dict | None:
+        """
+        A counterexample under the identity renaming, if the structured rows show that no renaming can work
+        ---
+        Every renaming permutes the rows of each structured group, so if the
+        formulas are true on different numbers of a group's rows, they differ
+        under every renaming.
+        """
+        diff = self._bits1 ^ self._identity
+        for group in self._sample.groups:
+            if (self._bits1 & group).bit_count() != (self._identity & group).bit_count():
+                return self._counterexample(diff & group)
+        return None
+
+    def counterexample(self, perm: tuple[int, ...]) -> dict | None:
+        """A sampled assignment on which formula1 and the renamed formula2 differ, or None if they agree on all."""
+        bits2 = self._identity if perm == tuple(range(len(perm))) else self._bits2(perm)
+        diff = self._bits1 ^ bits2
+        return self._counterexample(diff) if diff else None
+
+    def _bits2(self, perm: tuple[int, ...]) -> int:
+        masks = self._sample.masks
+        return self._evaluator2.evaluate_masks(
+            {self._atoms2[perm[j]]: masks[j] for j in range(len(perm))}, self._sample.rows
+        )
+
+    def _counterexample(self, diff: int) -> dict:
+        row = (diff & -diff).bit_length() - 1
+        response_value = bool(self._bits1 >> row & 1)
+        return {
+            "assignment": {atom.name: value for atom, value in self._sample.assignment(self._atoms1, row).items()},
+            "response_value": response_value,
+            "expected_value": not response_value,
+        }
+
 
 class SatisfiabilityEvaluator:
-    def __init__(self, formula: Formula):
+    def __init__(
+        self,
+        formula: Formula,
+        truth_table: PackedTruthTable | None = None,
+        planner: EnginePlanner | None = None,
+        budget: Budget | None = None,
+    ):
         self._formula = formula
+        self._truth_table = truth_table
+        self._planner = planner if planner is not None else default_planner()
+        self._budget = budget if budget is not None else UNLIMITED
 
     def evaluate(self) -> bool:
+        if self._truth_table is not None:
+            return self._truth_table.bits != 0
+
+        plan = self._planner.plan(Check.SATISFIABILITY, [self._formula])
+        if plan.engine is Engine.POLYNOMIAL:
+            return plan.tractable_form.satisfying_assignment() is not None
+        if plan.engine is Engine.BIT_PARALLEL:
+            return PackedTruthTable(self._formula, budget=self._budget).bits != 0
+        if plan.engine is Engine.BDD:
+            try:
+                bdd = BDD(len(_extract_atoms(self._formula)), self._planner.config.bdd_max_nodes, self._budget)
+                return bdd.from_formula(self._formula, _index_by_name(self._formula)) != BDD.FALSE
+            except BDDTooLarge:
+                pass
+        if plan.engine in (Engine.BDD, Engine.SAT):
+            return next(ModelEnumerator(self._formula, budget=self._budget).models(), None) is not None
+
         atoms = _extract_atoms(self._formula)
         all_atoms = list(atoms)
-        
+
+        flat = FlatFormula(self._formula, all_atoms)
         for assignment_values in product([False, True], repeat=len(all_atoms)):
-            assignment_dict = {atom: val for atom, val in zip(all_atoms, assignment_values)}
-            assignment = Assignment(assignment_dict)
-            
-            evaluator = FormulaEvaluator(self._formula, assignment)
-            if evaluator.evaluate():
+            self._budget.charge()
+            if flat.evaluate(assignment_values):
                 return True
-        
+
         return False
 
 
+class ModelEnumerator:
+    """
+    Lazily enumerates the satisfying assignments of a formula
+    ---
+    Models come in truth-table row order over `atoms` (sorted by name by default),
+    so row 0 is the all-true assignment. The search walks the decision tree of
+    cofactors and prunes every branch that folds to ⊥, so only satisfying rows
+    are ever produced. A cursor is the row to resume from, which lets results be
+    paged across requests.
+    """
+
+    def __init__(self, formula: Formula, atoms: Sequence[Atom] | None = None, budget: Budget | None = None):
+        self._formula = formula
+        if atoms is None:
+            atoms = sorted(_extract_atoms(formula), key=lambda a: a.name)
+        self._atoms = list(atoms)
+        self._budget = budget if budget is not None else UNLIMITED
+
+    @property
+    def atoms(self) -> list[Atom]:
+        return self._atoms
+
+    def models(self, cursor: int = 0) -> Iterator[tuple[int, dict[Atom, bool]]]:
+        """Yields (row, assignment) for every model on row `cursor` or later."""
+        n = len(self._atoms)
+        stack = [(0, 0, fold_constants(self._formula))]
+        while stack:
+            self._budget.charge()
+            depth, low, formula = stack.pop()
+            high = low + (1 << (n - depth))
+            if high <= cursor or isinstance(formula, Falsity):
+                continue
+            if isinstance(formula, Truth):
+                for row in range(max(low, cursor), high):
+                    yield row, self._assignment(row)
+                continue
+            atom = self._atoms[depth]
+            half = 1 << (n - depth - 1)
+            # Pushed in reverse so the true branch (the lower rows) is explored first.
+            stack.append((depth + 1, low + half, cofactor(formula, atom, False)))
+            stack.append((depth + 1, low, cofactor(formula, atom, True)))
+
+    def page(self, cursor: int = 0, limit: int = 100) -> tuple[list[dict[Atom, bool]], int | None]:
+        """Returns up to `limit` models from `cursor` on, and the cursor for the next page (None when done)."""
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        page = []
+        for row, assignment in self.models(cursor):
+            if len(page) == limit:
+                return page, row
+            page.append(assignment)
+        return page, None
+
+    def _assignment(self, row: int) -> dict[Atom, bool]:
+        n = len(self._atoms)
+        return {atom: not row >> (n - 1 - i) & 1 for i, atom in enumerate(self._atoms)}
+
+
 class TautologyEvaluator:
-    def __init__(self, formula: Formula):
+    def __init__(
+        self,
+        formula: Formula,
+        truth_table: PackedTruthTable | None = None,
+        planner: EnginePlanner | None = None,
+        budget: Budget | None = None,
+    ):
         self._formula = formula
+        self._truth_table = truth_table
+        self._planner = planner if planner is not None else default_planner()
+        self._budget = budget if budget is not None else UNLIMITED
 
     def evaluate(self) -> bool:
         ok, _ = self.evaluate_with_counterexample()
@@ -151,16 +611,167 @@ class TautologyEvaluator:
 
     def evaluate_with_counterexample(self) -> tuple[bool, dict | None]:
         """Returns (is_tautology, counterexample_or_none). Counterexample has assignment and formula_value."""
+        if self._truth_table is not None:
+            return self._from_truth_table(self._truth_table)
+
+        plan = self._planner.plan(Check.TAUTOLOGY, [self._formula])
+        if plan.engine is Engine.POLYNOMIAL:
+            # Any CNF or XOR system is checked clause by clause, without enumerating assignments.
+            return self._from_falsifying(plan.tractable_form.falsifying_assignment())
+        if plan.engine is Engine.BIT_PARALLEL:
+            return self._from_truth_table(PackedTruthTable(self._formula, budget=self._budget))
+        if plan.engine in (Engine.BDD, Engine.SAT) and self._planner.config.simulation_rows > 0:
+            falsifying = self._simulate()
+            if falsifying is not None:
+                return self._from_falsifying(falsifying)
+        if plan.engine is Engine.BDD:
+            try:
+                index = _index_by_name(self._formula)
+                bdd = BDD(len(index), self._planner.config.bdd_max_nodes, self._budget)
+                values = bdd.first_assignment(bdd.negate(bdd.from_formula(self._formula, index)))
+                return self._from_falsifying(None if values is None else dict(zip(index, values)))
+            except BDDTooLarge:
+                pass
+        if plan.engine in (Engine.BDD, Engine.SAT):
+            model = next(ModelEnumerator(Negation(self._formula), budget=self._budget).models(), None)
+            return self._from_falsifying(None if model is None else model[1])
+
         atoms = _extract_atoms(self._formula)
         all_atoms = list(atoms)
 
+        flat = FlatFormula(self._formula, all_atoms)
         for assignment_values in product([False, True], repeat=len(all_atoms)):
-            assignment_dict = {atom: val for atom, val in zip(all_atoms, assignment_values)}
-            assignment = Assignment(assignment_dict)
-
-            evaluator = FormulaEvaluator(self._formula, assignment)
-            val = evaluator.evaluate()
+            self._budget.charge()
+            val = flat.evaluate(assignment_values)
             if not val:
-                assignment_str = {atom.name: v for atom, v in assignment_dict.items()}
+                assignment_str = {atom.name: v for atom, v in zip(all_atoms, assignment_values)}
                 return False, {"assignment": assignment_str, "formula_value": val}
         return True, None
+
+    def _simulate(self) -> dict[Atom, bool] | None:
+        """A falsifying assignment from a simulated sample, or None if the formula is true on all of it."""
+        atoms = sorted(_extract_atoms(self._formula), key=lambda a: a.name)
+        sample = SimulationSample(len(atoms), self._planner.config.simulation_rows)
+        values = BitParallelEvaluator(self._formula, atoms, self._budget).evaluate_masks(
+            dict(zip(atoms, sample.masks)), sample.rows
+        )
+        falsified = ((1 << sample.rows) - 1) ^ values
+        if falsified == 0:
+            return None
+        return sample.assignment(atoms, (falsified & -falsified).bit_length() - 1)
+
+    def _from_truth_table(self, table: PackedTruthTable) -> tuple[bool, dict | None]:
+        row = table.last_row(False)
+        return self._from_falsifying(None if row is None else table.assignment(row))
+
+    def _from_falsifying(self, falsifying: dict[Atom, bool] | None) -> tuple[bool, dict | None]:
+        if falsifying is None:
+            return True, None
+        assignment_str = {atom.name: v for atom, v in falsifying.items()}
+        return False, {"assignment": assignment_str, "formula_value": False}
+
+
+class ModelCountEvaluator:
+    """Counts the assignments to the formula's atoms that make it true (#SAT)."""
+
+    # Up to this many atoms the whole table is packed and popcounted; above it, models are counted by search.
+    MAX_TABLE_ATOMS = 20
+
+    def __init__(self, formula: Formula, truth_table: PackedTruthTable | None = None, budget: Budget | None = None):
+        self._formula = formula
+        self._truth_table = truth_table
+        self._budget = budget if budget is not None else UNLIMITED
+
+    def evaluate(self) -> int:
+        if self._truth_table is not None:
+            return self._truth_table.count()
+
+        atoms = _extract_atoms(self._formula)
+        if len(atoms) <= self.MAX_TABLE_ATOMS:
+            return PackedTruthTable(self._formula, budget=self._budget).count()
+
+        formula = fold_constants(self._formula)
+        count, num_atoms = self._count(formula, {})
+        return count << (len(atoms) - num_atoms)
+
+    def _count(self, formula: Formula, cache: dict) -> tuple[int, int]:
+        """
+        DPLL-style counter: returns (models over the atoms of `formula`, number of those atoms)
+        ---
+        A formula splits into conjuncts that share no atoms, whose counts
+        multiply, or else branches on an atom, whose two cofactors' counts add.
+        The splits wait on an explicit stack until their parts are counted, so
+        however deep the search goes it never recurses.
+        """
+        # Counted parts wait on `results`; an entry (formula, parts, atoms) on `stack` combines its
+        # last `parts` results, as a product of components if `atoms` is None, else as a branch on one of `atoms`.
+        results: list[tuple[int, int]] = []
+        stack: list[Any] = [formula]
+        while stack:
+            item = stack.pop()
+            if type(item) is tuple:
+                node, num_parts, num_atoms = item
+                parts = results[-num_parts:]
+                del results[-num_parts:]
+                if num_atoms is None:
+                    count, num_atoms = 1, 0
+                    for part_count, part_atoms in parts:
+                        count *= part_count
+                        num_atoms += part_atoms
+                else:
+                    count = sum(part_count << (num_atoms - 1 - part_atoms) for part_count, part_atoms in parts)
+                cache[node] = (count, num_atoms)
+                results.append((count, num_atoms))
+                continue
+            if isinstance(item, Truth):
+                results.append((1, 0))
+                continue
+            if isinstance(item, Falsity):
+                results.append((0, 0))
+                continue
+            if item in cache:
+                results.append(cache[item])
+                continue
+            self._budget.charge()
+
+            components = _independent_conjuncts(item)
+            if len(components) > 1:
+                stack.append((item, len(components), None))
+                stack.extend(component for component, _ in reversed(components))
+            else:
+                # Branch on the atom shared by the most conjuncts, the usual DPLL choice.
+                _, conjunct_atoms = components[0]
+                occurrences = Counter(atom for atoms in conjunct_atoms for atom in atoms)
+                atom = max(occurrences, key=lambda a: (occurrences[a], a.name))
+                stack.append((item, 2, len(occurrences)))
+                stack.append(cofactor(item, atom, False))
+                stack.append(cofactor(item, atom, True))
+        return results[0]
+
+
+def _independent_conjuncts(formula: Formula) -> list[tuple[Formula, list[Set[Atom]]]]:
+    """
+    Splits a conjunction into parts that share no atoms, since their model counts multiply.
+    Each part comes with the atom sets of its conjuncts.
+    """
+    groups: list[tuple[set, list, list]] = []
+    for conjunct in _flatten(formula, Conjunction):
+        atoms = _extract_atoms(conjunct)
+        merged = (set(atoms), [conjunct], [atoms])
+        remaining = []
+        for group in groups:
+            if group[0] & merged[0]:
+                merged[0].update(group[0])
+                merged[1][:0] = group[1]
+                merged[2][:0] = group[2]
+            else:
+                remaining.append(group)
+        groups = remaining + [merged]
+
+    components = []
+    for _, members, member_atoms in groups:
+        component = members[0]
+        for member in members[1:]:
+            component = Conjunction(component, member)
+        components.append((component, member_atoms))
+    return components
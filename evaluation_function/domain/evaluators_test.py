@@ -0,0 +1,175 @@
+import inspect
+import sys
+import unittest
+
+from functools import reduce
+
+from evaluation_function.domain.budget import Budget
+from evaluation_function.domain.formula import Atom, Conjunction, Disjunction, Negation
+from evaluation_function.domain.evaluators import (
+    Assignment,
+    EquivalenceEvaluator,
+    FormulaEvaluator,
+    ModelCountEvaluator,
+    ModelEnumerator,
+    PackedTruthTable,
+    SimulationSample,
+    TautologyEvaluator,
+)
+from evaluation_function.domain.planner import EnginePlanner, PlannerConfig
+from evaluation_function.parsing.parser import formula_parser
+
+
+class TestModelCountEvaluator(unittest.TestCase):
+
+    def test_small_formulas(self):
+        cases = {
+            "p": 1,
+            "p ∨ ¬p": 2,
+            "p ∧ ¬p": 0,
+            "p ∧ q": 1,
+            "p ∨ q": 3,
+            "p ⊕ q ⊕ r": 4,
+            "(p → q) ∧ ⊤": 3,
+            "⊥": 0,
+        }
+        for text, expected in cases.items():
+            with self.subTest(formula=text):
+                self.assertEqual(ModelCountEvaluator(formula_parser(text)).evaluate(), expected)
+
+    def test_uses_shared_truth_table(self):
+        formula = formula_parser("p ↔ q")
+        table = PackedTruthTable(formula)
+        self.assertEqual(ModelCountEvaluator(formula, table).evaluate(), 2)
+
+    def test_search_matches_table(self):
+        """The search-based counter agrees with popcount on the packed table."""
+        formula = formula_parser("((a → b) ⊕ (c ∧ ¬d)) ∨ ((e ↔ a) ∧ (f ∨ ⊥)) ∨ (g ∧ h ∧ ¬a)")
+        evaluator = ModelCountEvaluator(formula)
+        evaluator.MAX_TABLE_ATOMS = 0
+        self.assertEqual(evaluator.evaluate(), PackedTruthTable(formula).count())
+
+    def test_many_atoms(self):
+        """x0 ∨ x1, x1 ∨ x2, ... over 40 atoms has Fibonacci(42) models."""
+        atoms = [Atom(f"x{i}") for i in range(40)]
+        formula = Disjunction(atoms[0], atoms[1])
+        for i in range(1, 39):
+            formula = Conjunction(formula, Disjunction(atoms[i], atoms[i + 1]))
+        self.assertEqual(ModelCountEvaluator(formula).evaluate(), 267914296)
+
+    def test_independent_components_multiply(self):
+        formula = Atom("x")
+        for i in range(30):
+            formula = Conjunction(formula, Disjunction(Atom(f"a{i}"), Atom(f"b{i}")))
+        self.assertEqual(ModelCountEvaluator(formula).evaluate(), 3 ** 30)
+
+    def test_deep_search_does_not_recurse(self):
+        """Each branch on x0 ∨ ... ∨ x199 leaves one atom fewer, 200 levels deep."""
+        formula = reduce(Disjunction, [Atom(f"x{i}") for i in range(200)])
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack()) + 100)
+        try:
+            count = ModelCountEvaluator(formula).evaluate()
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual(count, 2 ** 200 - 1)
+
+
+class TestModelEnumerator(unittest.TestCase):
+
+    def test_models_in_row_order(self):
+        p, q = Atom("p"), Atom("q")
+        models = [assignment for _, assignment in ModelEnumerator(formula_parser("p ∨ q")).models()]
+        self.assertEqual(models, [
+            {p: True, q: True},
+            {p: True, q: False},
+            {p: False, q: True},
+        ])
+
+    def test_unsatisfiable_has_no_models(self):
+        self.assertEqual(list(ModelEnumerator(formula_parser("p ∧ ¬p")).models()), [])
+
+    def test_matches_truth_table(self):
+        formula = formula_parser("(a → b) ⊕ (c ∧ ¬d) ∨ (e ↔ a)")
+        table = PackedTruthTable(formula)
+        rows = [row for row, _ in ModelEnumerator(formula).models()]
+        self.assertEqual(rows, [row for row in range(table.num_rows) if table.value(row)])
+
+    def test_resume_from_cursor(self):
+        enumerator = ModelEnumerator(formula_parser("a ⊕ b ⊕ c"))
+        self.assertEqual([row for row, _ in enumerator.models(cursor=4)], [5, 6])
+
+    def test_pages_cover_all_models(self):
+        enumerator = ModelEnumerator(formula_parser("(a ∨ b) ∧ (c ∨ d)"))
+        pages = []
+        cursor = 0
+        while cursor is not None:
+            page, cursor = enumerator.page(cursor, limit=4)
+            pages.append(page)
+        self.assertEqual([len(page) for page in pages], [4, 4, 1])
+        self.assertEqual(sum(pages, []), [assignment for _, assignment in enumerator.models()])
+
+    def test_many_atoms_first_page(self):
+        """Only the requested page is produced, even when there are 2^59 models."""
+        formula = Atom("x0")
+        for i in range(1, 60):
+            formula = Disjunction(formula, Atom(f"x{i}"))
+        page, cursor = ModelEnumerator(formula).page(limit=2)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(cursor, 2)
+
+
+class TestSimulation(unittest.TestCase):
+
+    def atoms(self, prefix: str, n: int) -> list[Atom]:
+        return [Atom(f"{prefix}{i:02}") for i in range(n)]
+
+    def test_sample_starts_with_structured_rows(self):
+        sample = SimulationSample(3, 64)
+        rows = [[bool(mask >> row & 1) for mask in sample.masks] for row in range(8)]
+        self.assertEqual(rows[0], [True, True, True])
+        self.assertEqual(rows[1], [False, False, False])
+        self.assertEqual(rows[2:8], [
+            [True, False, False], [False, True, True],
+            [False, True, False], [True, False, True],
+            [False, False, True], [True, True, False],
+        ])
+        self.assertEqual(sample.rows, 64)
+        self.assertTrue(all(mask < 1 << 64 for mask in sample.masks))
+
+    def test_tautology_rejected_by_simulation(self):
+        formula = reduce(Disjunction, self.atoms("p", 30))
+        # The budget covers one simulated pass but no exact engine.
+        ok, counterexample = TautologyEvaluator(formula, budget=Budget(work_limit=100)).evaluate_with_counterexample()
+        self.assertFalse(ok)
+        self.assertFalse(any(counterexample["assignment"].values()))
+
+    def test_equivalence_rejected_by_invariant(self):
+        formula1 = reduce(Conjunction, self.atoms("p", 30))
+        formula2 = Conjunction(reduce(Conjunction, self.atoms("q", 29)), Negation(Atom("q29")))
+        evaluator = EquivalenceEvaluator(formula1, formula2, budget=Budget(work_limit=500))
+        ok, counterexample = evaluator.evaluate_with_counterexample()
+        self.assertFalse(ok)
+        assignment = Assignment({Atom(name): value for name, value in counterexample["assignment"].items()})
+        self.assertEqual(FormulaEvaluator(formula1, assignment).evaluate(), counterexample["response_value"])
+
+    def test_equivalent_formulas_still_accepted(self):
+        formula1 = reduce(Conjunction, self.atoms("p", 24))
+        formula2 = reduce(Conjunction, reversed(self.atoms("q", 24)))
+        self.assertTrue(EquivalenceEvaluator(formula1, formula2).evaluate())
+        self.assertTrue(TautologyEvaluator(Disjunction(formula1, Negation(formula1))).evaluate())
+
+    def test_verdicts_match_without_simulation(self):
+        without = EnginePlanner(PlannerConfig(bit_parallel_max_atoms=0, simulation_rows=0))
+        with_simulation = EnginePlanner(PlannerConfig(bit_parallel_max_atoms=0))
+        for text1, text2 in [("(p ∨ q) ∧ r", "c ∧ (b ∨ a)"), ("p → q", "a ∧ b"), ("p ⊕ q", "(a ∨ b) ∧ ¬(a ∧ b)")]:
+            formula1, formula2 = formula_parser(text1), formula_parser(text2)
+            self.assertEqual(
+                EquivalenceEvaluator(formula1, formula2, planner=without).evaluate(),
+                EquivalenceEvaluator(formula1, formula2, planner=with_simulation).evaluate(),
+                (text1, text2),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
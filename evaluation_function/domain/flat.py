@@ -0,0 +1,151 @@
+from array import array
+from typing import Sequence
+
+from .formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    BinaryOperator,
+)
+from .serialization import (
+    OP_TRUE,
+    OP_FALSE,
+    OP_ATOM,
+    OP_NOT,
+    OP_AND,
+    OP_OR,
+    OP_IMPLIES,
+    OP_IFF,
+    OP_XOR,
+    _BINARY_OPCODES,
+    _BINARY_TYPES,
+)
+from .traversal import atoms_of
+
+
+class FlatFormula:
+    """
+    A formula lowered to parallel arrays, in postfix order
+    ---
+    Node i has opcode `opcodes[i]` (the opcodes of `serialization`), children
+    `left[i]` and `right[i]` (indices of earlier nodes, -1 where absent) and,
+    for an atom, `slots[i]`, its position in `atoms`. The last node is the
+    root. Because children always come before their parent, one forward pass
+    over the arrays evaluates the formula without recursion or type dispatch.
+    `atoms` defaults to the formula's atoms sorted by name; every atom of the
+    formula must be in it.
+    """
+
+    def __init__(self, formula: Formula, atoms: Sequence[Atom] | None = None):
+        if atoms is None:
+            atoms = sorted(atoms_of(formula), key=lambda a: a.name)
+        self._atoms = list(atoms)
+        slot_of = {atom: slot for slot, atom in enumerate(self._atoms)}
+
+        self._opcodes = bytearray()
+        self._left = array("i")
+        self._right = array("i")
+        self._slots = array("i")
+        emitted: list[int] = []
+        stack: list[tuple[Formula, bool]] = [(formula, False)]
+        while stack:
+            node, expanded = stack.pop()
+            left = right = slot = -1
+            if isinstance(node, Atom):
+                if node not in slot_of:
+                    raise ValueError(f"Atom {node.name} not found in assignment")
+                opcode, slot = OP_ATOM, slot_of[node]
+            elif isinstance(node, Truth):
+                opcode = OP_TRUE
+            elif isinstance(node, Falsity):
+                opcode = OP_FALSE
+            elif not expanded:
+                stack.append((node, True))
+                if isinstance(node, Negation):
+                    stack.append((node.operand, False))
+                elif isinstance(node, BinaryOperator):
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+                else:
+                    raise TypeError(f"Unknown formula type: {type(node)}")
+                continue
+            elif isinstance(node, Negation):
+                opcode, left = OP_NOT, emitted.pop()
+            else:
+                right = emitted.pop()
+                opcode, left = _BINARY_OPCODES[type(node)], emitted.pop()
+            emitted.append(len(self._opcodes))
+            self._opcodes.append(opcode)
+            self._left.append(left)
+            self._right.append(right)
+            self._slots.append(slot)
+
+    @property
+    def atoms(self) -> list[Atom]:
+        return self._atoms
+
+    @property
+    def opcodes(self) -> bytearray:
+        return self._opcodes
+
+    @property
+    def left(self) -> array:
+        return self._left
+
+    @property
+    def right(self) -> array:
+        return self._right
+
+    @property
+    def slots(self) -> array:
+        return self._slots
+
+    def __len__(self) -> int:
+        return len(self._opcodes)
+
+    def to_formula(self) -> Formula:
+        nodes: list[Formula] = []
+        for opcode, left, right, slot in zip(self._opcodes, self._left, self._right, self._slots):
+            if opcode == OP_ATOM:
+                nodes.append(self._atoms[slot])
+            elif opcode == OP_TRUE:
+                nodes.append(Truth())
+            elif opcode == OP_FALSE:
+                nodes.append(Falsity())
+            elif opcode == OP_NOT:
+                nodes.append(Negation(nodes[left]))
+            else:
+                nodes.append(_BINARY_TYPES[opcode](nodes[left], nodes[right]))
+        return nodes[-1]
+
+    def evaluate(self, values: Sequence[bool]) -> bool:
+        """The formula's value when the atom in slot i has value `values[i]`."""
+        return bool(self.evaluate_masks([1 if value else 0 for value in values], 1))
+
+    def evaluate_masks(self, masks: Sequence[int], full: int) -> int:
+        """Bit-parallel evaluation: the atom in slot i is bound to `masks[i]`, and `full` has every bit in use set."""
+        left = self._left
+        right = self._right
+        slots = self._slots
+        values = [0] * len(self._opcodes)
+        for i, opcode in enumerate(self._opcodes):
+            if opcode == OP_ATOM:
+                values[i] = masks[slots[i]]
+            elif opcode == OP_AND:
+                values[i] = values[left[i]] & values[right[i]]
+            elif opcode == OP_OR:
+                values[i] = values[left[i]] | values[right[i]]
+            elif opcode == OP_NOT:
+                values[i] = full ^ values[left[i]]
+            elif opcode == OP_IMPLIES:
+                values[i] = (full ^ values[left[i]]) | values[right[i]]
+            elif opcode == OP_IFF:
+                values[i] = full ^ values[left[i]] ^ values[right[i]]
+            elif opcode == OP_XOR:
+                values[i] = values[left[i]] ^ values[right[i]]
+            elif opcode == OP_TRUE:
+                values[i] = full
+            # OP_FALSE leaves 0
+        return values[-1]
@@ -0,0 +1,47 @@
+import unittest
+from itertools import product
+
+from evaluation_function.domain.evaluators import Assignment, FormulaEvaluator, atom_masks
+from evaluation_function.domain.flat import FlatFormula
+from evaluation_function.domain.formula import Atom, Conjunction, Negation
+from evaluation_function.parsing.parser import formula_parser
+
+
+FORMULAS = ["p", "⊤ ∧ ¬⊥", "(p → q) ↔ (¬q → ¬p)", "a ⊕ b ⊕ (c ∨ ¬a)", "¬(p ∧ (q ∨ r)) → p"]
+
+
+class TestFlatFormula(unittest.TestCase):
+
+    def test_round_trip(self):
+        for text in FORMULAS:
+            formula = formula_parser(text)
+            self.assertEqual(FlatFormula(formula).to_formula(), formula)
+
+    def test_evaluate_matches_tree_evaluation(self):
+        for text in FORMULAS:
+            formula = formula_parser(text)
+            flat = FlatFormula(formula)
+            for values in product([False, True], repeat=len(flat.atoms)):
+                expected = FormulaEvaluator(formula, Assignment(dict(zip(flat.atoms, values)))).evaluate()
+                self.assertEqual(flat.evaluate(values), expected, (text, values))
+
+    def test_evaluate_masks(self):
+        flat = FlatFormula(formula_parser("p → q"))
+        # rows: p q = TT, TF, FT, FF
+        self.assertEqual(flat.evaluate_masks(atom_masks(2, 0, 4), 0b1111), 0b1101)
+
+    def test_deep_formula(self):
+        formula = Atom("p")
+        for i in range(50_000):
+            formula = Negation(formula) if i % 2 else Conjunction(Atom("q"), formula)
+        flat = FlatFormula(formula)
+        self.assertEqual(len(flat), 75_001)
+        self.assertTrue(flat.evaluate([True, True]))
+
+    def test_missing_atom(self):
+        with self.assertRaises(ValueError):
+            FlatFormula(formula_parser("p ∧ q"), [Atom("p")])
+
+
+if __name__ == "__main__":
+    unittest.main()
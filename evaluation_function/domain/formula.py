@@ -15,12 +15,18 @@ class Formula(ABC):
     def __repr__(self) -> str:
         pass
 
+    def __reduce__(self):
+        # Pickle as the compact encoding, which also avoids recursing through deep trees.
+        from .serialization import from_bytes, to_bytes
+        return from_bytes, (to_bytes(self),)
+
 
 class Atom(Formula):
     def __init__(self, name: str):
         if not name:
             raise ValueError("Atom name cannot be empty")
         self._name = name
+        self._hash = hash(("Atom", name))
 
     @property
     def name(self) -> str:
@@ -32,7 +38,7 @@ class Atom(Formula):
         return self._name == other._name
 
     def __hash__(self) -> int:
-        return hash(("Atom", self._name))
+        return self._hash
 
     def __repr__(self) -> str:
         return f"Atom('{self._name}')"
@@ -40,6 +46,7 @@ class Atom(Formula):
 
 class Truth(Formula):
     _instance = None
+    _hash = hash("Truth")
 
     def __new__(cls):
         if cls._instance is None:
@@ -50,7 +57,7 @@ class Truth(Formula):
         return isinstance(other, Truth)
 
     def __hash__(self) -> int:
-        return hash("Truth")
+        return self._hash
 
     def __repr__(self) -> str:
         return "⊤"
@@ -58,6 +65,7 @@ class Truth(Formula):
 
 class Falsity(Formula):
     _instance = None
+    _hash = hash("Falsity")
 
     def __new__(cls):
         if cls._instance is None:
@@ -68,7 +76,7 @@ class Falsity(Formula):
         return isinstance(other, Falsity)
 
     def __hash__(self) -> int:
-        return hash("Falsity")
+        return self._hash
 
     def __repr__(self) -> str:
         return "⊥"
@@ -79,23 +87,25 @@ class UnaryOperator(Formula):
         if not isinstance(operand, Formula):
             raise TypeError("Operand must be a Formula")
         self._operand = operand
+        # The operand's hash is already cached, so hashing never walks the tree.
+        self._hash = hash((type(self).__name__, operand))
 
     @property
     def operand(self) -> Formula:
         return self._operand
 
     def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, type(self)):
-            return False
-        return self._operand == other._operand
+        return _structurally_equal(self, other)
 
     def __hash__(self) -> int:
-        return hash((type(self).__name__, self._operand))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return _repr(self)
 
 
 class Negation(UnaryOperator):
-    def __repr__(self) -> str:
-        return f"¬{self._operand}"
+    pass
 
 
 class BinaryOperator(Formula):
@@ -106,6 +116,7 @@ class BinaryOperator(Formula):
             raise TypeError("Right operand must be a Formula")
         self._left = left
         self._right = right
+        self._hash = hash((type(self).__name__, left, right))
 
     @property
     def left(self) -> Formula:
@@ -116,19 +127,17 @@ class BinaryOperator(Formula):
         return self._right
 
     def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, type(self)):
-            return False
-        return self._left == other._left and self._right == other._right
+        return _structurally_equal(self, other)
 
     def __hash__(self) -> int:
-        return hash((type(self).__name__, self._left, self._right))
+        return self._hash
 
     @abstractmethod
     def _operator_symbol(self) -> str:
         pass
 
     def __repr__(self) -> str:
-        return f"({self._left} {self._operator_symbol()} {self._right})"
+        return _repr(self)
 
 
 class Conjunction(BinaryOperator):
@@ -154,3 +163,21 @@ class Biconditional(BinaryOperator):
 class Xor(BinaryOperator):
     def _operator_symbol(self) -> str:
         return "⊕"
+
+
+def _structurally_equal(formula: Formula, other: Any) -> bool:
+    from .traversal import structurally_equal
+    return isinstance(other, Formula) and structurally_equal(formula, other)
+
+
+def _repr(formula: Formula) -> str:
+    # Built with a fold rather than by recursing through __repr__, so deep formulas can be shown.
+    from .traversal import fold
+    return fold(formula, _REPR_HANDLERS)
+
+
+_REPR_HANDLERS = {
+    Formula: repr,
+    Negation: lambda node, operand: f"¬{operand}",
+    BinaryOperator: lambda node, left, right: f"({left} {node._operator_symbol()} {right})",
+}
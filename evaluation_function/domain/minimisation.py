@@ -0,0 +1,205 @@
+from functools import reduce
+
+from .budget import Budget, UNLIMITED
+from .evaluators import PackedTruthTable, atom_masks
+from .formula import Formula, Truth, Falsity, Negation, Conjunction, Disjunction
+from .normal_forms import is_dnf
+from .tractable import Clause, _flatten
+
+
+# Largest atom count minimised: the prime implicant pass looks at every subset of the atoms.
+MAX_MINIMISE_ATOMS = 16
+
+# Branch-and-bound steps spent looking for a smaller cover than the greedy one.
+MAX_SEARCH_STEPS = 20_000
+
+
+class MinimalDnf:
+    """
+    A smallest DNF found for a function: fewest terms, then fewest literals
+    ---
+    `exact` is False when the cover search ran out of steps, in which case
+    the DNF is the best found rather than proved smallest. Each term is a set
+    of (atom, value) literals, as in `normal_forms.dnf_terms`.
+    """
+
+    def __init__(self, terms: list[Clause], exact: bool):
+        self._terms = terms
+        self._exact = exact
+
+    @property
+    def terms(self) -> list[Clause]:
+        return self._terms
+
+    @property
+    def num_terms(self) -> int:
+        return len(self._terms)
+
+    @property
+    def num_literals(self) -> int:
+        return sum(len(term) for term in self._terms)
+
+    @property
+    def exact(self) -> bool:
+        return self._exact
+
+    def to_formula(self) -> Formula:
+        if not self._terms:
+            return Falsity()
+        formulas = []
+        for term in self._terms:
+            literals = [
+                atom if value else Negation(atom)
+                for atom, value in sorted(term, key=lambda literal: literal[0].name)
+            ]
+            formulas.append(reduce(Conjunction, literals) if literals else Truth())
+        return reduce(Disjunction, formulas)
+
+
+def minimal_dnf(formula: Formula, budget: Budget | None = None) -> MinimalDnf:
+    """The smallest DNF of the formula's function over its atoms, as found by `minimise`."""
+    return minimise(PackedTruthTable(formula, budget=budget), budget)
+
+
+def dnf_cost(formula: Formula) -> tuple[int, int] | None:
+    """
+    The (terms, literals) of a formula written in DNF, or None if it is not in DNF
+    ---
+    ⊤ counts as one empty term and ⊥ as none, as `MinimalDnf` writes them.
+    """
+    if isinstance(formula, Truth):
+        return 1, 0
+    if isinstance(formula, Falsity):
+        return 0, 0
+    if not is_dnf(formula):
+        return None
+    terms = _flatten(formula, Disjunction)
+    return len(terms), sum(len(_flatten(term, Conjunction)) for term in terms)
+
+
+def minimise(table: PackedTruthTable, budget: Budget | None = None, max_search_steps: int = MAX_SEARCH_STEPS) -> MinimalDnf:
+    """
+    Two-level minimisation of a packed truth table (Quine–McCluskey on bitsets)
+    ---
+    A cube is a row `v` of the table and a set `d` of row bits left free.
+    For every `d`, one bitset over the rows marks the `v` whose cube lies
+    inside the function, built from the bitset of `d` minus its lowest bit with
+    a shift and an AND; so all implicants are found with one big-int
+    operation per subset of atoms, and the primes are those not inside a cube
+    with one more free bit. The cover takes the essential primes, then a
+    greedy choice, which a bounded branch-and-bound search tries to improve.
+    """
+    n = table.num_atoms
+    if n > MAX_MINIMISE_ATOMS:
+        raise ValueError(f"cannot minimise a function of {n} atoms (limit {MAX_MINIMISE_ATOMS})")
+    budget = budget if budget is not None else UNLIMITED
+    # Bit k of a row is 0 exactly when atom n-1-k is true, so zeros[k] marks the rows with bit k clear.
+    zeros = atom_masks(n, 0, table.num_rows)[::-1]
+
+    implicants = {0: table.bits} if table.bits else {}
+    for free in range(1, 1 << n):
+        low = free & -free
+        parent = implicants.get(free ^ low)
+        if not parent:
+            continue
+        budget.charge()
+        k = low.bit_length() - 1
+        bases = parent & (parent >> low) & zeros[k]
+        if bases:
+            implicants[free] = bases
+
+    primes: list[tuple[int, int]] = []
+    for free, bases in implicants.items():
+        covered = 0
+        for k in range(n):
+            larger = implicants.get(free | 1 << k) if not free >> k & 1 else None
+            if larger:
+                covered |= larger | larger << (1 << k)
+        prime_bases = bases & ~covered
+        while prime_bases:
+            low = prime_bases & -prime_bases
+            primes.append((low.bit_length() - 1, free))
+            prime_bases ^= low
+
+    cubes, exact = _cover(table.bits, primes, n, budget, max_search_steps)
+    terms = []
+    for base, free in cubes:
+        terms.append(frozenset(
+            (table.atoms[n - 1 - k], not base >> k & 1) for k in range(n) if not free >> k & 1
+        ))
+    return MinimalDnf(terms, exact)
+
+
+def _rows(base: int, free: int) -> int:
+    """The rows of a cube, as a bitset."""
+    rows = 1 << base
+    while free:
+        low = free & -free
+        rows |= rows << (1 << (low.bit_length() - 1))
+        free ^= low
+    return rows
+
+
+def _cover(
+    minterms: int, primes: list[tuple[int, int]], n: int, budget: Budget, max_steps: int
+) -> tuple[list[tuple[int, int]], bool]:
+    covers = [_rows(base, free) for base, free in primes]
+    literals = [n - free.bit_count() for _, free in primes]
+
+    # Essential primes: the only ones covering some minterm.
+    once = twice = 0
+    for rows in covers:
+        twice |= once & rows
+        once |= rows
+    unique = once & ~twice
+    chosen = [i for i, rows in enumerate(covers) if rows & unique]
+    remaining = minterms
+    for i in chosen:
+        remaining &= ~covers[i]
+    candidates = [i for i, rows in enumerate(covers) if rows & remaining]
+
+    # Greedy: the prime covering most of what is left, then the one with fewest literals.
+    greedy = []
+    left = remaining
+    useful = candidates
+    while left:
+        budget.charge()
+        best = max(useful, key=lambda i: ((covers[i] & left).bit_count(), -literals[i]))
+        greedy.append(best)
+        left &= ~covers[best]
+        useful = [i for i in useful if covers[i] & left]
+    best_cover = greedy
+    best_cost = (len(greedy), sum(literals[i] for i in greedy))
+
+    # Branch and bound on the lowest uncovered minterm, trying the primes that cover it.
+    largest = max((covers[i].bit_count() for i in candidates), default=1)
+    covering: dict[int, list[int]] = {}
+    for i in candidates:
+        rows = covers[i] & remaining
+        while rows:
+            row = rows & -rows
+            covering.setdefault(row, []).append(i)
+            rows ^= row
+    steps = 0
+    exact = True
+    stack: list[tuple[int, list[int]]] = [(remaining, [])] if remaining else []
+    while stack:
+        if steps == max_steps:
+            exact = False
+            break
+        steps += 1
+        budget.charge()
+        left, picked = stack.pop()
+        if not left:
+            cost = (len(picked), sum(literals[i] for i in picked))
+            if cost < best_cost:
+                best_cover, best_cost = picked, cost
+            continue
+        bound = len(picked) + -(-left.bit_count() // largest)
+        if (bound, 0) >= best_cost:
+            continue
+        options = sorted(covering[left & -left], key=lambda i: ((covers[i] & left).bit_count(), -literals[i]))
+        for i in options:
+            stack.append((left & ~covers[i], picked + [i]))
+
+    return [primes[i] for i in chosen + best_cover], exact
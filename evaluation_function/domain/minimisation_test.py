@@ -0,0 +1,77 @@
+import random
+import unittest
+from itertools import combinations
+
+from evaluation_function.domain.budget import Budget, BudgetExceeded
+from evaluation_function.domain.evaluators import PackedTruthTable
+from evaluation_function.domain.formula import Atom
+from evaluation_function.domain.minimisation import minimal_dnf, minimise
+from evaluation_function.domain.normal_forms import is_dnf
+from evaluation_function.parsing.parser import formula_parser
+
+
+ATOMS = [Atom(name) for name in "pqrs"]
+
+
+def smallest_cover_size(bits: int) -> int:
+    """The fewest cubes covering exactly the rows in `bits`, by trying every set of cubes of four atoms."""
+    cubes = []
+    for fixed in range(1 << 4):
+        for values in range(1 << 4):
+            if values & ~fixed:
+                continue
+            rows = sum(1 << row for row in range(16) if row & fixed == values)
+            if rows & ~bits == 0:
+                cubes.append(rows)
+    for size in range(0, 9):
+        for chosen in combinations(cubes, size):
+            if _union(chosen) == bits:
+                return size
+    raise AssertionError("no cover of 8 cubes")
+
+
+def _union(rows: tuple[int, ...]) -> int:
+    union = 0
+    for r in rows:
+        union |= r
+    return union
+
+
+class TestMinimisation(unittest.TestCase):
+
+    def test_examples(self):
+        self.assertEqual(minimal_dnf(formula_parser("(p ∧ q) ∨ (p ∧ ¬q)")).to_formula(), formula_parser("p"))
+        self.assertEqual(minimal_dnf(formula_parser("p ∨ ¬p")).to_formula(), formula_parser("⊤"))
+        self.assertEqual(minimal_dnf(formula_parser("p ∧ ¬p")).num_terms, 0)
+        majority = minimal_dnf(formula_parser("(p ∧ q) ∨ (p ∧ r) ∨ (q ∧ r) ∨ (p ∧ q ∧ r)"))
+        self.assertEqual((majority.num_terms, majority.num_literals), (3, 6))
+        self.assertEqual(minimal_dnf(formula_parser("p ⊕ q ⊕ r")).num_terms, 4)
+
+    def test_random_functions_are_minimised_exactly(self):
+        rng = random.Random(4)
+        for _ in range(60):
+            bits = rng.getrandbits(16)
+            table = PackedTruthTable.from_bits(ATOMS, bits)
+            result = minimise(table)
+            formula = result.to_formula()
+            self.assertEqual(PackedTruthTable(formula, ATOMS).bits, bits)
+            self.assertTrue(result.exact)
+            self.assertEqual(result.num_terms, smallest_cover_size(bits), bin(bits))
+            if result.num_terms > 1:
+                self.assertTrue(is_dnf(formula))
+
+    def test_twelve_atoms(self):
+        atoms = [Atom(f"x{i:02}") for i in range(12)]
+        bits = random.Random(1).getrandbits(1 << 12)
+        result = minimise(PackedTruthTable.from_bits(atoms, bits), max_search_steps=100)
+        self.assertEqual(PackedTruthTable(result.to_formula(), atoms).bits, bits)
+
+    def test_budget(self):
+        atoms = [Atom(f"x{i:02}") for i in range(10)]
+        table = PackedTruthTable.from_bits(atoms, random.Random(2).getrandbits(1 << 10))
+        with self.assertRaises(BudgetExceeded):
+            minimise(table, Budget(work_limit=50))
+
+
+if __name__ == "__main__":
+    unittest.main()
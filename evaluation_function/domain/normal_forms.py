@@ -0,0 +1,326 @@
+from functools import reduce
+
+from .aig import AIG
+from .flat import FlatFormula
+from .formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    Conjunction,
+    Disjunction,
+)
+from .serialization import OP_TRUE, OP_FALSE, OP_ATOM, OP_NOT, OP_AND, OP_OR, OP_IMPLIES, OP_IFF
+from .tractable import Clause, _flatten
+
+
+# Default limits on the size of a converted formula, checked against the prediction before any conversion.
+MAX_NNF_NODES = 100_000
+MAX_CLAUSES = 4096
+
+
+class NormalFormTooLarge(Exception):
+    """Raised when a normal form would be larger than its limit, before it is built."""
+
+
+# Each size is (clauses, literals); a term of a DNF counts as a clause.
+Size = tuple[int, int]
+
+
+def nnf_size(formula: Formula) -> int:
+    """The number of nodes of `to_nnf(formula)`, computed without building it."""
+    return _nnf_sizes(FlatFormula(formula))[-1][0]
+
+
+def cnf_size(formula: Formula) -> Size:
+    """The clauses and literals of the CNF that distribution would build, before duplicates and tautologies are dropped."""
+    return _cnf_sizes(FlatFormula(formula))[-1][0]
+
+
+def dnf_size(formula: Formula) -> Size:
+    """The terms and literals of the DNF that distribution would build, before duplicates and contradictions are dropped."""
+    # The DNF of a formula is the CNF of its negation with every literal flipped.
+    return _cnf_sizes(FlatFormula(formula))[-1][1]
+
+
+def to_nnf(formula: Formula, max_nodes: int = MAX_NNF_NODES) -> Formula:
+    """
+    An equivalent formula in negation normal form: only ∧, ∨ and negated atoms
+    ---
+    →, ↔ and ⊕ are expanded, and ↔ and ⊕ need both polarities of their
+    operands, so nested biconditionals double in size at every level. Raises
+    `NormalFormTooLarge` if the result would have more than `max_nodes` nodes.
+    Subformulas are shared between the two polarities, so memory stays
+    linear in the input however large the printed result.
+    """
+    flat = FlatFormula(formula)
+    size = _nnf_sizes(flat)[-1][0]
+    if size > max_nodes:
+        raise NormalFormTooLarge(f"negation normal form would have {size} nodes (limit {max_nodes})")
+    left, right, slots, atoms = flat.left, flat.right, flat.slots, flat.atoms
+    # (positive, negative) form of every node
+    forms: list[tuple[Formula, Formula]] = []
+    for i, opcode in enumerate(flat.opcodes):
+        if opcode == OP_ATOM:
+            atom = atoms[slots[i]]
+            forms.append((atom, Negation(atom)))
+        elif opcode == OP_TRUE:
+            forms.append((Truth(), Falsity()))
+        elif opcode == OP_FALSE:
+            forms.append((Falsity(), Truth()))
+        elif opcode == OP_NOT:
+            positive, negative = forms[left[i]]
+            forms.append((negative, positive))
+        else:
+            (a, not_a), (b, not_b) = forms[left[i]], forms[right[i]]
+            if opcode == OP_AND:
+                forms.append((Conjunction(a, b), Disjunction(not_a, not_b)))
+            elif opcode == OP_OR:
+                forms.append((Disjunction(a, b), Conjunction(not_a, not_b)))
+            elif opcode == OP_IMPLIES:
+                forms.append((Disjunction(not_a, b), Conjunction(a, not_b)))
+            else:
+                same = Disjunction(Conjunction(a, b), Conjunction(not_a, not_b))
+                different = Disjunction(Conjunction(a, not_b), Conjunction(not_a, b))
+                forms.append((same, different) if opcode == OP_IFF else (different, same))
+    return forms[-1][0]
+
+
+def cnf_clauses(formula: Formula, max_clauses: int = MAX_CLAUSES) -> list[Clause]:
+    """
+    The clauses of an equivalent CNF, by distributing ∨ over ∧
+    ---
+    Clauses that contain a literal and its negation are dropped, as are
+    repeated clauses. The size of every intermediate result is predicted
+    first, and `NormalFormTooLarge` is raised before any step would produce
+    more than `max_clauses` clauses.
+    """
+    return _clauses(FlatFormula(formula), True, max_clauses)
+
+
+def dnf_terms(formula: Formula, max_terms: int = MAX_CLAUSES) -> list[Clause]:
+    """The terms of an equivalent DNF, each a set of literals that are all true; limited like `cnf_clauses`."""
+    terms = _clauses(FlatFormula(formula), False, max_terms)
+    return [frozenset((atom, not positive) for atom, positive in term) for term in terms]
+
+
+def to_cnf(formula: Formula, max_clauses: int = MAX_CLAUSES) -> Formula:
+    return _join(cnf_clauses(formula, max_clauses), Conjunction, Disjunction, Truth(), Falsity())
+
+
+def to_dnf(formula: Formula, max_terms: int = MAX_CLAUSES) -> Formula:
+    return _join(dnf_terms(formula, max_terms), Disjunction, Conjunction, Falsity(), Truth())
+
+
+def tseitin_cnf(formula: Formula) -> tuple[list[Atom], list[list[int]]]:
+    """
+    An equisatisfiable CNF of size linear in the formula, in DIMACS numbering
+    ---
+    The formula's atoms, sorted by name, are variables 1..n; the variables
+    above n name subformulas. The clauses come from the formula's
+    and-inverter graph, so shared subformulas get one variable.
+    """
+    atoms = sorted(FlatFormula(formula).atoms, key=lambda a: a.name)
+    aig = AIG(len(atoms))
+    return atoms, aig.to_cnf(aig.from_formula(formula, {atom: i for i, atom in enumerate(atoms)}))
+
+
+def clausal_form(formula: Formula, max_clauses: int = MAX_CLAUSES) -> tuple[list[Atom], list[list[int]], bool]:
+    """
+    Clauses for the formula in DIMACS numbering, as for `tseitin_cnf`, and whether they are equivalent to it
+    ---
+    Distribution is used when its predicted size is within `max_clauses`,
+    giving an equivalent CNF over the atoms alone; otherwise the Tseitin CNF,
+    which is only equisatisfiable.
+    """
+    if cnf_size(formula)[0] > max_clauses:
+        atoms, clauses = tseitin_cnf(formula)
+        return atoms, clauses, False
+    atoms = sorted(FlatFormula(formula).atoms, key=lambda a: a.name)
+    variable = {atom: i + 1 for i, atom in enumerate(atoms)}
+    clauses = [
+        [variable[atom] if positive else -variable[atom] for atom, positive in _sorted(clause)]
+        for clause in cnf_clauses(formula, max_clauses)
+    ]
+    return atoms, clauses, True
+
+
+def is_nnf(formula: Formula) -> bool:
+    """Whether the formula uses only ∧, ∨, constants and negation of atoms."""
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (Conjunction, Disjunction)):
+            stack.append(node.left)
+            stack.append(node.right)
+        elif not _is_literal(node) and not isinstance(node, (Truth, Falsity)):
+            return False
+    return True
+
+
+def is_cnf(formula: Formula) -> bool:
+    """Whether the formula is a conjunction of disjunctions of atoms and negated atoms."""
+    return all(
+        all(_is_literal(literal) for literal in _flatten(clause, Disjunction))
+        for clause in _flatten(formula, Conjunction)
+    )
+
+
+def is_dnf(formula: Formula) -> bool:
+    """Whether the formula is a disjunction of conjunctions of atoms and negated atoms."""
+    return all(
+        all(_is_literal(literal) for literal in _flatten(term, Conjunction))
+        for term in _flatten(formula, Disjunction)
+    )
+
+
+def _is_literal(formula: Formula) -> bool:
+    return isinstance(formula, Atom) or isinstance(formula, Negation) and isinstance(formula.operand, Atom)
+
+
+def _nnf_sizes(flat: FlatFormula) -> list[tuple[int, int]]:
+    left, right = flat.left, flat.right
+    sizes: list[tuple[int, int]] = []
+    for i, opcode in enumerate(flat.opcodes):
+        if opcode == OP_ATOM:
+            sizes.append((1, 2))
+        elif opcode in (OP_TRUE, OP_FALSE):
+            sizes.append((1, 1))
+        elif opcode == OP_NOT:
+            positive, negative = sizes[left[i]]
+            sizes.append((negative, positive))
+        else:
+            (a, not_a), (b, not_b) = sizes[left[i]], sizes[right[i]]
+            if opcode in (OP_AND, OP_OR):
+                sizes.append((1 + a + b, 1 + not_a + not_b))
+            elif opcode == OP_IMPLIES:
+                sizes.append((1 + not_a + b, 1 + a + not_b))
+            else:
+                both = 3 + a + not_a + b + not_b
+                sizes.append((both, both))
+    return sizes
+
+
+def _sum(x: Size, y: Size) -> Size:
+    return x[0] + y[0], x[1] + y[1]
+
+
+def _product(x: Size, y: Size) -> Size:
+    return x[0] * y[0], x[1] * y[0] + y[1] * x[0]
+
+
+def _cnf_sizes(flat: FlatFormula) -> list[tuple[Size, Size]]:
+    """For every node, the size of the CNF of the node and of its negation, following the rules of `_clauses`."""
+    left, right = flat.left, flat.right
+    sizes: list[tuple[Size, Size]] = []
+    for i, opcode in enumerate(flat.opcodes):
+        if opcode == OP_ATOM:
+            sizes.append(((1, 1), (1, 1)))
+        elif opcode == OP_TRUE:
+            sizes.append(((0, 0), (1, 0)))
+        elif opcode == OP_FALSE:
+            sizes.append(((1, 0), (0, 0)))
+        elif opcode == OP_NOT:
+            positive, negative = sizes[left[i]]
+            sizes.append((negative, positive))
+        else:
+            (a, not_a), (b, not_b) = sizes[left[i]], sizes[right[i]]
+            if opcode == OP_AND:
+                sizes.append((_sum(a, b), _product(not_a, not_b)))
+            elif opcode == OP_OR:
+                sizes.append((_product(a, b), _sum(not_a, not_b)))
+            elif opcode == OP_IMPLIES:
+                sizes.append((_product(not_a, b), _sum(a, not_b)))
+            else:
+                same = _sum(_product(not_a, b), _product(a, not_b))
+                different = _sum(_product(a, b), _product(not_a, not_b))
+                sizes.append((same, different) if opcode == OP_IFF else (different, same))
+    return sizes
+
+
+def _clauses(flat: FlatFormula, positive: bool, max_clauses: int) -> list[Clause]:
+    """The CNF clauses of the root (or of its negation), computing only the polarities that are needed."""
+    opcodes, left, right, slots, atoms = flat.opcodes, flat.left, flat.right, flat.slots, flat.atoms
+    sizes = _cnf_sizes(flat)
+
+    # Top-down: which polarities (bit 1 positive, bit 2 negative) of each node are needed.
+    needed = [0] * len(flat)
+    needed[-1] = 1 if positive else 2
+    for i in range(len(flat) - 1, -1, -1):
+        opcode, need = opcodes[i], needed[i]
+        if need == 0 or opcode in (OP_ATOM, OP_TRUE, OP_FALSE):
+            continue
+        if opcode == OP_NOT:
+            needed[left[i]] |= (need & 1) << 1 | (need & 2) >> 1
+        elif opcode in (OP_AND, OP_OR):
+            needed[left[i]] |= need
+            needed[right[i]] |= need
+        elif opcode == OP_IMPLIES:
+            needed[left[i]] |= (need & 1) << 1 | (need & 2) >> 1
+            needed[right[i]] |= need
+        else:
+            needed[left[i]] |= 3
+            needed[right[i]] |= 3
+
+    clauses: list[list[list[Clause] | None]] = [[None, None] for _ in range(len(flat))]
+    for i, opcode in enumerate(opcodes):
+        for polarity in (0, 1):
+            if not needed[i] >> polarity & 1:
+                continue
+            predicted = sizes[i][polarity][0]
+            if predicted > max_clauses:
+                raise NormalFormTooLarge(f"normal form would have up to {predicted} clauses (limit {max_clauses})")
+            clauses[i][polarity] = _node_clauses(opcode, polarity, i, clauses, left, right, atoms, slots)
+    return clauses[-1][0 if positive else 1]
+
+
+def _node_clauses(opcode, polarity, i, clauses, left, right, atoms, slots) -> list[Clause]:
+    if opcode == OP_ATOM:
+        return [frozenset([(atoms[slots[i]], polarity == 0)])]
+    if opcode in (OP_TRUE, OP_FALSE):
+        # ⊤ has no clauses and ⊥ one empty clause; negation swaps them.
+        return [] if (opcode == OP_TRUE) == (polarity == 0) else [frozenset()]
+    if opcode == OP_NOT:
+        return clauses[left[i]][1 - polarity]
+    a, not_a = clauses[left[i]]
+    b, not_b = clauses[right[i]]
+    if opcode == OP_AND:
+        return _conjoin(a, b) if polarity == 0 else _distribute(not_a, not_b)
+    if opcode == OP_OR:
+        return _distribute(a, b) if polarity == 0 else _conjoin(not_a, not_b)
+    if opcode == OP_IMPLIES:
+        return _distribute(not_a, b) if polarity == 0 else _conjoin(a, not_b)
+    same = _conjoin(_distribute(not_a, b), _distribute(a, not_b))
+    different = _conjoin(_distribute(a, b), _distribute(not_a, not_b))
+    return same if (opcode == OP_IFF) == (polarity == 0) else different
+
+
+def _conjoin(x: list[Clause], y: list[Clause]) -> list[Clause]:
+    clauses = list(dict.fromkeys(x + y))
+    # An empty clause is ⊥, which absorbs the rest.
+    return [frozenset()] if frozenset() in clauses else clauses
+
+
+def _distribute(x: list[Clause], y: list[Clause]) -> list[Clause]:
+    result = {}
+    for c in x:
+        for d in y:
+            clause = c | d
+            if not any((atom, not value) in clause for atom, value in clause):
+                result[clause] = None
+    return list(result)
+
+
+def _sorted(clause: Clause) -> list[tuple[Atom, bool]]:
+    return sorted(clause, key=lambda literal: (literal[0].name, not literal[1]))
+
+
+def _join(parts: list[Clause], outer: type, inner: type, empty_outer: Formula, empty_inner: Formula) -> Formula:
+    if not parts:
+        return empty_outer
+    formulas = []
+    for part in parts:
+        literals = [atom if positive else Negation(atom) for atom, positive in _sorted(part)]
+        formulas.append(reduce(inner, literals) if literals else empty_inner)
+    return reduce(outer, formulas)
@@ -0,0 +1,137 @@
+import random
+import unittest
+from functools import reduce
+from itertools import product
+
+from evaluation_function.domain.evaluators import atom_masks
+from evaluation_function.domain.flat import FlatFormula
+from evaluation_function.domain.formula import (
+    Atom,
+    Biconditional,
+    Conjunction,
+    Disjunction,
+    Falsity,
+    Implication,
+    Negation,
+    Truth,
+    Xor,
+)
+from evaluation_function.domain.normal_forms import (
+    NormalFormTooLarge,
+    clausal_form,
+    cnf_clauses,
+    cnf_size,
+    dnf_size,
+    dnf_terms,
+    is_cnf,
+    is_dnf,
+    is_nnf,
+    nnf_size,
+    tseitin_cnf,
+    to_cnf,
+    to_dnf,
+    to_nnf,
+)
+from evaluation_function.domain.planner import _node_count
+from evaluation_function.parsing.parser import formula_parser
+
+
+ATOMS = [Atom(name) for name in "pqrs"]
+
+
+def random_formula(rng: random.Random, depth: int):
+    if depth == 0 or rng.random() < 0.25:
+        roll = rng.random()
+        return Truth() if roll < 0.03 else Falsity() if roll < 0.06 else rng.choice(ATOMS)
+    operator = rng.choice([Negation, Conjunction, Disjunction, Implication, Biconditional, Xor])
+    if operator is Negation:
+        return Negation(random_formula(rng, depth - 1))
+    return operator(random_formula(rng, depth - 1), random_formula(rng, depth - 1))
+
+
+def table(formula) -> int:
+    return FlatFormula(formula, ATOMS).evaluate_masks(atom_masks(4, 0, 16), 0xFFFF)
+
+
+def satisfiable(clauses: list[list[int]]) -> bool:
+    num_vars = max([abs(literal) for clause in clauses for literal in clause], default=0)
+    return any(
+        all(any(values[abs(literal) - 1] == (literal > 0) for literal in clause) for clause in clauses)
+        for values in product([False, True], repeat=num_vars)
+    )
+
+
+class TestNormalForms(unittest.TestCase):
+
+    def test_conversions_are_equivalent(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            formula = random_formula(rng, 4)
+            nnf, cnf, dnf = to_nnf(formula), to_cnf(formula), to_dnf(formula)
+            self.assertEqual(table(nnf), table(formula), formula)
+            self.assertEqual(table(cnf), table(formula), formula)
+            self.assertEqual(table(dnf), table(formula), formula)
+            self.assertTrue(is_nnf(nnf))
+            self.assertEqual(nnf_size(formula), _node_count(nnf))
+            self.assertTrue(is_cnf(cnf) or isinstance(cnf, (Truth, Falsity)))
+            self.assertTrue(is_dnf(dnf) or isinstance(dnf, (Truth, Falsity)))
+            self.assertLessEqual(len(cnf_clauses(formula)), cnf_size(formula)[0])
+            self.assertLessEqual(len(dnf_terms(formula)), dnf_size(formula)[0])
+
+    def test_examples(self):
+        self.assertEqual(to_cnf(formula_parser("p → (q ∧ r)")), formula_parser("(¬p ∨ q) ∧ (¬p ∨ r)"))
+        self.assertEqual(to_dnf(formula_parser("(p ∨ q) ∧ r")), formula_parser("(p ∧ r) ∨ (q ∧ r)"))
+        self.assertEqual(to_nnf(formula_parser("¬(p → ¬q)")), formula_parser("p ∧ q"))
+        self.assertEqual(to_cnf(formula_parser("p ∨ ¬p")), Truth())
+        self.assertEqual(to_dnf(formula_parser("p ∧ ¬p")), Falsity())
+
+    def test_size_prediction(self):
+        self.assertEqual(cnf_size(formula_parser("(p ∧ q) ∨ (r ∧ s)")), (4, 8))
+        self.assertEqual(dnf_size(formula_parser("(p ∨ q) ∧ (r ∨ s)")), (4, 8))
+        self.assertEqual(nnf_size(formula_parser("p ↔ q")), 9)  # (p ∧ q) ∨ (¬p ∧ ¬q)
+
+    def test_refuses_blowup(self):
+        atoms = [Atom(f"x{i}") for i in range(40)]
+        parity = reduce(Xor, atoms)
+        self.assertGreater(cnf_size(parity)[0], 2 ** 30)
+        with self.assertRaises(NormalFormTooLarge):
+            cnf_clauses(parity)
+        with self.assertRaises(NormalFormTooLarge):
+            to_dnf(parity)
+        with self.assertRaises(NormalFormTooLarge):
+            to_nnf(parity)
+        disjunction_of_pairs = reduce(Disjunction, [Conjunction(atoms[i], atoms[i + 1]) for i in range(0, 40, 2)])
+        with self.assertRaises(NormalFormTooLarge):
+            to_cnf(disjunction_of_pairs)
+        self.assertEqual(len(dnf_terms(disjunction_of_pairs)), 20)
+
+    def test_tseitin_is_equisatisfiable(self):
+        rng = random.Random(8)
+        for _ in range(100):
+            formula = random_formula(rng, 3)
+            atoms, clauses = tseitin_cnf(formula)
+            self.assertEqual(satisfiable(clauses), table(formula) != 0, formula)
+
+    def test_clausal_form_switches_strategy(self):
+        atoms, clauses, equivalent = clausal_form(formula_parser("p → q"))
+        self.assertEqual((atoms, clauses, equivalent), ([Atom("p"), Atom("q")], [[-1, 2]], True))
+        parity = reduce(Xor, [Atom(f"x{i:02}") for i in range(40)])
+        atoms, clauses, equivalent = clausal_form(parity)
+        self.assertFalse(equivalent)
+        self.assertEqual(len(atoms), 40)
+        self.assertLess(len(clauses), 1000)
+
+    def test_syntactic_checks(self):
+        self.assertTrue(is_cnf(formula_parser("(p ∨ ¬q) ∧ r ∧ (¬r ∨ s ∨ p)")))
+        self.assertTrue(is_cnf(formula_parser("p ∨ q")))
+        self.assertFalse(is_cnf(formula_parser("p ∨ (q ∧ r)")))
+        self.assertFalse(is_cnf(formula_parser("¬¬p")))
+        self.assertFalse(is_cnf(formula_parser("p → q")))
+        self.assertTrue(is_dnf(formula_parser("(p ∧ ¬q) ∨ r")))
+        self.assertFalse(is_dnf(formula_parser("(p ∨ q) ∧ r")))
+        self.assertTrue(is_nnf(formula_parser("(p ∨ ¬q) ∧ (r ∨ (s ∧ ¬p))")))
+        self.assertFalse(is_nnf(formula_parser("¬(p ∧ q)")))
+
+
+if __name__ == "__main__":
+    unittest.main()
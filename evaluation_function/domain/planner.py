@@ -0,0 +1,157 @@
+import logging
+import math
+from enum import Enum
+from typing import Sequence
+
+from evaluation_function.env import env_number
+
+from .formula import Formula, UnaryOperator, BinaryOperator
+from .tractable import FormulaClass, TractableForm
+from .traversal import atoms_of
+
+
+logger = logging.getLogger(__name__)
+
+
+class Engine(Enum):
+    POLYNOMIAL = "polynomial"
+    BRUTE_FORCE = "brute-force"
+    BIT_PARALLEL = "bit-parallel"
+    BDD = "bdd"
+    SAT = "sat"
+
+
+class Check(Enum):
+    SATISFIABILITY = "satisfiability"
+    TAUTOLOGY = "tautology"
+    EQUIVALENCE = "equivalence"
+
+
+class PlannerConfig:
+    """
+    Thresholds for the engine planner
+    ---
+    Each can be set with an environment variable:
+
+    - `EVAL_PLANNER_BRUTE_FORCE_MAX_WORK` rows × nodes up to which plain enumeration is used
+    - `EVAL_PLANNER_BIT_PARALLEL_MAX_ATOMS` largest atom count whose packed table (2^n bits) is built
+    - `EVAL_PLANNER_BDD_MAX_ATOMS` largest atom count handed to the BDD engine
+    - `EVAL_PLANNER_BDD_MAX_NODES` node limit after which a BDD build is abandoned for the SAT engine
+    - `EVAL_PLANNER_SIMULATION_ROWS` assignments simulated before the BDD or SAT engine runs; 0 to skip simulation
+    """
+
+    def __init__(
+        self,
+        brute_force_max_work: int = 256,
+        bit_parallel_max_atoms: int = 20,
+        bdd_max_atoms: int = 64,
+        bdd_max_nodes: int = 200_000,
+        simulation_rows: int = 256,
+    ):
+        self.brute_force_max_work = brute_force_max_work
+        self.bit_parallel_max_atoms = bit_parallel_max_atoms
+        self.bdd_max_atoms = bdd_max_atoms
+        self.bdd_max_nodes = bdd_max_nodes
+        self.simulation_rows = simulation_rows
+
+    @staticmethod
+    def from_env() -> "PlannerConfig":
+        defaults = PlannerConfig()
+        return PlannerConfig(
+            brute_force_max_work=env_number("EVAL_PLANNER_BRUTE_FORCE_MAX_WORK", defaults.brute_force_max_work),
+            bit_parallel_max_atoms=env_number("EVAL_PLANNER_BIT_PARALLEL_MAX_ATOMS", defaults.bit_parallel_max_atoms),
+            bdd_max_atoms=env_number("EVAL_PLANNER_BDD_MAX_ATOMS", defaults.bdd_max_atoms),
+            bdd_max_nodes=env_number("EVAL_PLANNER_BDD_MAX_NODES", defaults.bdd_max_nodes),
+            simulation_rows=env_number("EVAL_PLANNER_SIMULATION_ROWS", defaults.simulation_rows),
+        )
+
+
+class Plan:
+    def __init__(self, engine: Engine, reason: str, tractable_form: TractableForm | None = None):
+        self.engine = engine
+        self.reason = reason
+        self.tractable_form = tractable_form
+
+    def __repr__(self) -> str:
+        return f"Plan({self.engine.value}, '{self.reason}')"
+
+
+class EnginePlanner:
+    """
+    Picks an engine for a check by fixed thresholds on the atom count, node count and class of its formulas
+    ---
+    The engines are tried in a fixed order and the first whose threshold the
+    check is within is used; no two engines' costs are compared. Polynomial
+    solvers come first whenever the formula class allows them. Plain enumeration
+    is used while its estimated work, rows × nodes (times the n! renamings for
+    equivalence), is within `brute_force_max_work`; then the packed table up to
+    `bit_parallel_max_atoms` atoms, the BDD engine up to `bdd_max_atoms`, and
+    the SAT search beyond that.
+    """
+
+    def __init__(self, config: PlannerConfig | None = None):
+        self._config = config if config is not None else PlannerConfig.from_env()
+
+    @property
+    def config(self) -> PlannerConfig:
+        return self._config
+
+    def plan(self, check: Check, formulas: Sequence[Formula]) -> Plan:
+        num_atoms = max(len(atoms_of(formula)) for formula in formulas)
+        num_nodes = sum(_node_count(formula) for formula in formulas)
+
+        tractable_form = None
+        formula_class = FormulaClass.GENERAL
+        if check is not Check.EQUIVALENCE:
+            tractable_form = TractableForm.classify(formulas[0])
+            if tractable_form is not None:
+                formula_class = tractable_form.formula_class
+
+        plan = self._choose(check, num_atoms, num_nodes, formula_class, tractable_form)
+        logger.debug(
+            "planner: %s on %d atoms, %d nodes, class %s -> %s (%s)",
+            check.value, num_atoms, num_nodes, formula_class.value, plan.engine.value, plan.reason,
+        )
+        return plan
+
+    def _choose(self, check: Check, num_atoms: int, num_nodes: int, formula_class: FormulaClass,
+                tractable_form: TractableForm | None) -> Plan:
+        config = self._config
+        if tractable_form is not None and (check is Check.TAUTOLOGY or tractable_form.decides_satisfiability):
+            return Plan(Engine.POLYNOMIAL, f"{formula_class.value} formula", tractable_form)
+
+        renamings = math.factorial(num_atoms) if check is Check.EQUIVALENCE else 1
+        rows = 1 << num_atoms if num_atoms < 64 else math.inf
+        brute_force_cost = renamings * rows * num_nodes
+        if brute_force_cost <= config.brute_force_max_work:
+            return Plan(Engine.BRUTE_FORCE, f"enumeration work {brute_force_cost} <= {config.brute_force_max_work}")
+        if num_atoms <= config.bit_parallel_max_atoms:
+            return Plan(Engine.BIT_PARALLEL, f"{num_atoms} atoms <= {config.bit_parallel_max_atoms}")
+        if num_atoms <= config.bdd_max_atoms:
+            return Plan(Engine.BDD, f"{num_atoms} atoms <= {config.bdd_max_atoms}")
+        return Plan(Engine.SAT, f"{num_atoms} atoms > {config.bdd_max_atoms}")
+
+
+_default_planner: EnginePlanner | None = None
+
+
+def default_planner() -> EnginePlanner:
+    """The planner configured from the environment, created on first use."""
+    global _default_planner
+    if _default_planner is None:
+        _default_planner = EnginePlanner()
+    return _default_planner
+
+
+def _node_count(formula: Formula) -> int:
+    count = 0
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, UnaryOperator):
+            stack.append(node.operand)
+        elif isinstance(node, BinaryOperator):
+            stack.append(node.left)
+            stack.append(node.right)
+    return count
@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest import mock
+
+from evaluation_function.domain.formula import Atom, Conjunction, Disjunction, Negation
+from evaluation_function.domain.planner import Check, Engine, EnginePlanner, PlannerConfig
+from evaluation_function.parsing.parser import formula_parser
+
+
+def chain(num_atoms):
+    """(x0 ∨ ¬x1) ∧ (x1 ∨ x0 ∨ x2) ∧ ...: neither Horn nor 2-CNF."""
+    atoms = [Atom(f"x{i}") for i in range(num_atoms)]
+    formula = Disjunction(atoms[0], Negation(atoms[1]))
+    for i in range(2, num_atoms):
+        formula = Conjunction(formula, Disjunction(Disjunction(atoms[i - 1], atoms[i - 2]), atoms[i]))
+    return Negation(formula)
+
+
+class TestEnginePlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = EnginePlanner(PlannerConfig())
+
+    def test_tractable_formula_is_polynomial(self):
+        plan = self.planner.plan(Check.SATISFIABILITY, [formula_parser("(p ∨ q) ∧ (¬p ∨ r)")])
+        self.assertEqual(plan.engine, Engine.POLYNOMIAL)
+        self.assertIn("2-cnf", plan.reason)
+
+    def test_general_cnf_is_polynomial_only_for_tautology(self):
+        formula = formula_parser("(p ∨ q ∨ r) ∧ (¬p ∨ q ∨ s) ∧ (p ∨ ¬s ∨ t)")
+        self.assertEqual(self.planner.plan(Check.TAUTOLOGY, [formula]).engine, Engine.POLYNOMIAL)
+        self.assertNotEqual(self.planner.plan(Check.SATISFIABILITY, [formula]).engine, Engine.POLYNOMIAL)
+
+    def test_engine_by_size(self):
+        self.assertEqual(self.planner.plan(Check.SATISFIABILITY, [formula_parser("(p ∧ q) ∨ (¬p ∧ r)")]).engine,
+                         Engine.BRUTE_FORCE)
+        self.assertEqual(self.planner.plan(Check.SATISFIABILITY, [chain(12)]).engine, Engine.BIT_PARALLEL)
+        self.assertEqual(self.planner.plan(Check.SATISFIABILITY, [chain(40)]).engine, Engine.BDD)
+        self.assertEqual(self.planner.plan(Check.SATISFIABILITY, [chain(80)]).engine, Engine.SAT)
+
+    def test_equivalence_accounts_for_renamings(self):
+        formulas = [formula_parser("¬(a ∧ b ∧ c)"), formula_parser("¬(p ∧ q ∧ r)")]
+        self.assertEqual(self.planner.plan(Check.EQUIVALENCE, formulas).engine, Engine.BIT_PARALLEL)
+
+    def test_thresholds_from_environment(self):
+        with mock.patch.dict(os.environ, {"EVAL_PLANNER_BIT_PARALLEL_MAX_ATOMS": "8", "EVAL_PLANNER_BDD_MAX_NODES": "x"}):
+            config = PlannerConfig.from_env()
+        self.assertEqual(config.bit_parallel_max_atoms, 8)
+        self.assertEqual(config.bdd_max_nodes, PlannerConfig().bdd_max_nodes)
+        self.assertEqual(EnginePlanner(config).plan(Check.SATISFIABILITY, [chain(12)]).engine, Engine.BDD)
+
+    def test_reports_choice_in_debug_log(self):
+        with self.assertLogs("evaluation_function.domain.planner", level="DEBUG") as logs:
+            self.planner.plan(Check.TAUTOLOGY, [chain(12)])
+        self.assertIn("-> bit-parallel", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
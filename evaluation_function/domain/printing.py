@@ -0,0 +1,63 @@
+from .formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    BinaryOperator,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Biconditional,
+    Xor,
+)
+from .traversal import fold
+
+
+# Mirrors the precedence and associativity used by the parser, so printed formulas parse back to the same tree.
+_PRECEDENCE = {
+    Biconditional: 1,
+    Implication: 2,
+    Xor: 3,
+    Disjunction: 4,
+    Conjunction: 5,
+}
+
+_RIGHT_ASSOCIATIVE = {Implication}
+
+
+def format_formula(formula: Formula) -> str:
+    """Renders a formula in the input syntax, using only the parentheses the parser needs."""
+    return fold(formula, _FORMAT_HANDLERS)
+
+
+def _format_negation(node: Negation, operand: str) -> str:
+    if isinstance(node.operand, BinaryOperator):
+        return f"¬({operand})"
+    return f"¬{operand}"
+
+
+def _format_binary(node: BinaryOperator, left: str, right: str) -> str:
+    precedence = _PRECEDENCE[type(node)]
+    right_associative = type(node) in _RIGHT_ASSOCIATIVE
+    left = _format_operand(node.left, left, precedence, parenthesise_equal=right_associative)
+    right = _format_operand(node.right, right, precedence, parenthesise_equal=not right_associative)
+    return f"{left} {node._operator_symbol()} {right}"
+
+
+def _format_operand(operand: Formula, text: str, parent_precedence: int, parenthesise_equal: bool) -> str:
+    if not isinstance(operand, BinaryOperator):
+        return text
+    precedence = _PRECEDENCE[type(operand)]
+    if precedence < parent_precedence or (precedence == parent_precedence and parenthesise_equal):
+        return f"({text})"
+    return text
+
+
+_FORMAT_HANDLERS = {
+    Atom: lambda node: node.name,
+    Truth: lambda node: "⊤",
+    Falsity: lambda node: "⊥",
+    Negation: _format_negation,
+    BinaryOperator: _format_binary,
+}
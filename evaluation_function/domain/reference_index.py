@@ -0,0 +1,112 @@
+from itertools import permutations, product
+from math import factorial, prod
+from typing import Any, Sequence
+
+from .analysis import FormulaAnalysis
+from .evaluators import EquivalenceEvaluator, atom_masks
+
+
+# Most atom orders tried when canonicalising one table. Only atoms that the
+# per-atom model counts cannot tell apart are permuted, so this is rarely reached.
+MAX_KEY_PERMUTATIONS = 40320
+
+
+def canonical_table_key(analysis: FormulaAnalysis, max_permutations: int = MAX_KEY_PERMUTATIONS) -> tuple[int, int] | None:
+    """
+    A key for the formula's truth table that is the same for every renaming of its atoms
+    ---
+    The atoms are put in order of how many models make them true, then every
+    order of the atoms with equal counts is tried, and the key is the atom
+    count with the smallest packed table found. Two formulas have the same key
+    exactly when they are equivalent up to renaming. None when the formula has
+    no packed table or would need more than `max_permutations` orders.
+    """
+    table = analysis.truth_table
+    if table is None:
+        return None
+    n = table.num_atoms
+    columns = atom_masks(n, 0, table.num_rows)
+    counts = [(table.bits & column).bit_count() for column in columns]
+    order = sorted(range(n), key=lambda i: counts[i])
+    groups: list[list[int]] = []
+    for i in order:
+        if groups and counts[groups[-1][0]] == counts[i]:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    if prod(factorial(len(group)) for group in groups) > max_permutations:
+        return None
+
+    best = None
+    for choice in product(*(permutations(group) for group in groups)):
+        analysis.budget.charge()
+        bits = _permute(table.bits, columns, [atom for group in choice for atom in group])
+        if best is None or bits < best:
+            best = bits
+    return n, best
+
+
+def _permute(bits: int, columns: list[int], order: Sequence[int]) -> int:
+    """The table `bits` with atom `order[j]` moved to position j, by swapping two atoms at a time."""
+    n = len(columns)
+    full = (1 << (1 << n)) - 1
+    current = list(range(n))
+    for j in range(n):
+        if current[j] == order[j]:
+            continue
+        k = current.index(order[j], j + 1)
+        # Atom positions j < k are row bits b = n-1-j > a = n-1-k. Rows with bit a set and bit b
+        # clear trade places with the rows `shift` above them, which have bit b set and bit a clear.
+        shift = (1 << (n - 1 - j)) - (1 << (n - 1 - k))
+        swap = (full ^ columns[k]) & columns[j]
+        t = (bits ^ (bits >> shift)) & swap
+        bits ^= t ^ (t << shift)
+        current[j], current[k] = current[k], current[j]
+    return bits
+
+
+class ReferenceIndex:
+    """
+    Formulas indexed by their behaviour up to renaming of atoms, each with a label
+    ---
+    A formula is classified with one canonicalisation and one dictionary
+    lookup, instead of one equivalence check per indexed formula: first by its
+    `canonical_form`, then by its `canonical_table_key`. Formulas that have no
+    table key (too many atoms, or too many atoms that look alike) are kept
+    aside and compared one by one with `EquivalenceEvaluator`. When several
+    indexed formulas are equivalent, the first one added wins.
+    """
+
+    def __init__(self, max_permutations: int = MAX_KEY_PERMUTATIONS):
+        self._max_permutations = max_permutations
+        self._by_form: dict[str, Any] = {}
+        self._by_key: dict[tuple[int, int], Any] = {}
+        self._unkeyed: list[tuple[FormulaAnalysis, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._by_key) + len(self._unkeyed)
+
+    def add(self, analysis: FormulaAnalysis, label: Any):
+        """Indexes the analysed formula under `label`, which must not be None."""
+        key = canonical_table_key(analysis, self._max_permutations)
+        if key is None:
+            self._unkeyed.append((analysis, label))
+        else:
+            label = self._by_key.setdefault(key, label)
+        self._by_form.setdefault(analysis.canonical_form, label)
+
+    def lookup(self, analysis: FormulaAnalysis) -> Any | None:
+        """The label of the first indexed formula equivalent to the analysed one up to renaming, or None."""
+        label = self._by_form.get(analysis.canonical_form)
+        if label is not None:
+            return label
+        key = canonical_table_key(analysis, self._max_permutations)
+        if key is not None:
+            # Equivalent formulas share their table shape, so a formula with a key can only match a keyed one.
+            return self._by_key.get(key)
+        for indexed, label in self._unkeyed:
+            if indexed.num_atoms == analysis.num_atoms and EquivalenceEvaluator(
+                analysis.formula, indexed.formula, budget=analysis.budget
+            ).evaluate():
+                return label
+        return None
@@ -0,0 +1,82 @@
+import random
+import unittest
+from itertools import permutations
+
+from evaluation_function.domain.analysis import FormulaAnalysis
+from evaluation_function.domain.evaluators import EquivalenceEvaluator
+from evaluation_function.domain.formula import Atom, Conjunction, Disjunction, Implication, Negation, Xor
+from evaluation_function.domain.reference_index import ReferenceIndex, canonical_table_key
+from evaluation_function.parsing.parser import formula_parser
+
+
+def key(text: str, **options):
+    return canonical_table_key(FormulaAnalysis(formula_parser(text)), **options)
+
+
+def random_formula(rng: random.Random, atoms: list[Atom], depth: int):
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(atoms)
+    operator = rng.choice([Negation, Conjunction, Disjunction, Implication, Xor])
+    if operator is Negation:
+        return Negation(random_formula(rng, atoms, depth - 1))
+    return operator(random_formula(rng, atoms, depth - 1), random_formula(rng, atoms, depth - 1))
+
+
+class TestCanonicalTableKey(unittest.TestCase):
+
+    def test_invariant_under_renaming(self):
+        self.assertEqual(key("p → q"), key("b → a"))
+        self.assertEqual(key("(p ∧ q) ∨ ¬r"), key("¬a ∨ (c ∧ b)"))
+        texts = [f"({x} ∧ {y}) → ({z} ⊕ {x})" for x, y, z in permutations("pqr")]
+        self.assertEqual(len({key(text) for text in texts}), 1)
+
+    def test_distinguishes_inequivalent_formulas(self):
+        self.assertNotEqual(key("p → q"), key("p ∧ q"))
+        self.assertNotEqual(key("p"), key("p ∧ (q ∨ ¬q)"))
+
+    def test_agrees_with_equivalence_evaluator(self):
+        rng = random.Random(7)
+        atoms1 = [Atom(name) for name in "pqrs"]
+        atoms2 = [Atom(name) for name in "abcd"]
+        for _ in range(300):
+            formula1 = random_formula(rng, atoms1, 4)
+            formula2 = random_formula(rng, atoms2, 4)
+            same_key = canonical_table_key(FormulaAnalysis(formula1)) == canonical_table_key(FormulaAnalysis(formula2))
+            self.assertEqual(same_key, EquivalenceEvaluator(formula1, formula2).evaluate(), (formula1, formula2))
+
+    def test_too_many_look_alike_atoms(self):
+        self.assertIsNone(key("p ⊕ q ⊕ r ⊕ s", max_permutations=6))
+        self.assertIsNotNone(key("p ⊕ q ⊕ r ⊕ s", max_permutations=24))
+
+
+class TestReferenceIndex(unittest.TestCase):
+
+    def index(self, entries, **options) -> ReferenceIndex:
+        index = ReferenceIndex(**options)
+        for text, label in entries:
+            index.add(FormulaAnalysis(formula_parser(text)), label)
+        return index
+
+    def lookup(self, index: ReferenceIndex, text: str):
+        return index.lookup(FormulaAnalysis(formula_parser(text)))
+
+    def test_lookup(self):
+        index = self.index([("p → q", "implication"), ("p ∧ (q ∨ q)", "conjunction"), ("p ∨ q", "disjunction")])
+        self.assertEqual(self.lookup(index, "¬a ∨ b"), "implication")
+        self.assertEqual(self.lookup(index, "y ∧ x"), "conjunction")
+        self.assertEqual(self.lookup(index, "¬(¬s ∧ ¬t)"), "disjunction")
+        self.assertIsNone(self.lookup(index, "p ↔ q"))
+
+    def test_first_added_wins(self):
+        index = self.index([("p ∧ (q ∨ q)", "first"), ("p ∧ q", "second")])
+        self.assertEqual(self.lookup(index, "q ∧ p"), "first")
+
+    def test_unkeyed_formulas_are_compared_one_by_one(self):
+        index = self.index([("p ⊕ q ⊕ r", "parity"), ("p ∧ q ∧ r", "all")], max_permutations=1)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(self.lookup(index, "¬(a ⊕ b) ⊕ ¬c"), "parity")
+        self.assertIsNone(self.lookup(index, "a ∨ b ∨ c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+from .formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    BinaryOperator,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Biconditional,
+    Xor,
+)
+
+
+FORMAT_VERSION = 1
+
+# Opcodes of the postfix program. OP_ATOM is followed by the atom's index in the atom table.
+OP_TRUE = 0
+OP_FALSE = 1
+OP_ATOM = 2
+OP_NOT = 3
+OP_AND = 4
+OP_OR = 5
+OP_IMPLIES = 6
+OP_IFF = 7
+OP_XOR = 8
+
+_BINARY_OPCODES = {
+    Conjunction: OP_AND,
+    Disjunction: OP_OR,
+    Implication: OP_IMPLIES,
+    Biconditional: OP_IFF,
+    Xor: OP_XOR,
+}
+_BINARY_TYPES = {opcode: operator for operator, opcode in _BINARY_OPCODES.items()}
+
+
+class SerializationError(ValueError):
+    """Raised by `from_bytes` for data that is not a formula in a supported format."""
+
+
+def to_bytes(formula: Formula) -> bytes:
+    """
+    Encodes a formula compactly
+    ---
+    The encoding is the format version, the atom names in order of first use,
+    then the formula as a postfix program of one-byte opcodes, atoms referring
+    to the name table by index. Counts, lengths and indices are unsigned
+    LEB128 varints. The encoder walks the tree with an explicit stack, so
+    formulas of any depth are encoded in linear time.
+    """
+    atom_index: dict[str, int] = {}
+    program = bytearray()
+    # Postfix order: a node is emitted when it comes off the stack the second time.
+    stack: list[tuple[Formula, bool]] = [(formula, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, Atom):
+            index = atom_index.setdefault(node.name, len(atom_index))
+            program.append(OP_ATOM)
+            _write_varint(program, index)
+        elif isinstance(node, Truth):
+            program.append(OP_TRUE)
+        elif isinstance(node, Falsity):
+            program.append(OP_FALSE)
+        elif expanded:
+            program.append(OP_NOT if isinstance(node, Negation) else _BINARY_OPCODES[type(node)])
+        elif isinstance(node, Negation):
+            stack.append((node, True))
+            stack.append((node.operand, False))
+        elif isinstance(node, BinaryOperator):
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+        else:
+            raise TypeError(f"Unknown formula type: {type(node)}")
+
+    data = bytearray([FORMAT_VERSION])
+    _write_varint(data, len(atom_index))
+    for name in atom_index:
+        encoded = name.encode("utf-8")
+        _write_varint(data, len(encoded))
+        data += encoded
+    data += program
+    return bytes(data)
+
+
+def from_bytes(data: bytes | bytearray | memoryview) -> Formula:
+    """Decodes a formula encoded by `to_bytes`, in linear time and without recursion."""
+    data = bytes(data)
+    if not data or data[0] != FORMAT_VERSION:
+        raise SerializationError(f"unsupported formula encoding version {data[0] if data else None}")
+    position = 1
+    num_atoms, position = _read_varint(data, position)
+    atoms = []
+    for _ in range(num_atoms):
+        length, position = _read_varint(data, position)
+        if position + length > len(data):
+            raise SerializationError("truncated atom table")
+        atoms.append(Atom(data[position:position + length].decode("utf-8")))
+        position += length
+
+    stack: list[Formula] = []
+    while position < len(data):
+        opcode = data[position]
+        position += 1
+        if opcode == OP_ATOM:
+            index, position = _read_varint(data, position)
+            if index >= len(atoms):
+                raise SerializationError(f"atom index {index} out of range")
+            stack.append(atoms[index])
+        elif opcode == OP_TRUE:
+            stack.append(Truth())
+        elif opcode == OP_FALSE:
+            stack.append(Falsity())
+        elif opcode == OP_NOT:
+            if not stack:
+                raise SerializationError("negation without an operand")
+            stack.append(Negation(stack.pop()))
+        elif opcode in _BINARY_TYPES:
+            if len(stack) < 2:
+                raise SerializationError("binary operator without two operands")
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(_BINARY_TYPES[opcode](left, right))
+        else:
+            raise SerializationError(f"unknown opcode {opcode}")
+    if len(stack) != 1:
+        raise SerializationError("program does not encode exactly one formula")
+    return stack[0]
+
+
+def _write_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise SerializationError("truncated varint")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
@@ -0,0 +1,62 @@
+import pickle
+import random
+import unittest
+
+from evaluation_function.domain.formula import (
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Biconditional,
+    Xor,
+)
+from evaluation_function.domain.serialization import SerializationError, from_bytes, to_bytes
+from evaluation_function.parsing.parser import formula_parser
+
+
+def random_formula(rng, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice([Atom("p"), Atom("q"), Atom("rain"), Atom("ß"), Truth(), Falsity()])
+    operator = rng.choice([Negation, Conjunction, Disjunction, Implication, Biconditional, Xor])
+    if operator is Negation:
+        return Negation(random_formula(rng, depth - 1))
+    return operator(random_formula(rng, depth - 1), random_formula(rng, depth - 1))
+
+
+class TestSerialization(unittest.TestCase):
+
+    def test_round_trip(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            formula = random_formula(rng, 6)
+            self.assertEqual(from_bytes(to_bytes(formula)), formula)
+
+    def test_encoding(self):
+        # version 1, atoms [p, q], then p q ∧ ¬ in postfix
+        self.assertEqual(to_bytes(formula_parser("¬(p ∧ q)")), bytes([1, 2, 1]) + b"p" + bytes([1]) + b"q"
+                         + bytes([2, 0, 2, 1, 4, 3]))
+
+    def test_deep_formula(self):
+        formula = Atom("p")
+        for i in range(100_000):
+            formula = Negation(formula) if i % 2 else Conjunction(Atom(f"x{i % 300}"), formula)
+        data = to_bytes(formula)
+        self.assertEqual(to_bytes(from_bytes(data)), data)
+        self.assertEqual(to_bytes(pickle.loads(pickle.dumps(formula))), data)
+
+    def test_pickle_uses_encoding(self):
+        formula = formula_parser("(p → q) ∧ ¬r")
+        self.assertEqual(pickle.loads(pickle.dumps(formula)), formula)
+        self.assertIs(pickle.loads(pickle.dumps(Truth())), Truth())
+
+    def test_invalid_data(self):
+        for data in [b"", bytes([9]), bytes([1, 0, 4]), bytes([1, 0, 2, 0]), bytes([1, 0, 0, 0]), bytes([1, 0, 42])]:
+            with self.assertRaises(SerializationError):
+                from_bytes(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,332 @@
+from enum import Enum
+
+from .formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Biconditional,
+    Xor,
+)
+from .traversal import atoms_of, fold
+
+
+Literal = tuple[Atom, bool]
+Clause = frozenset[Literal]
+
+
+class FormulaClass(Enum):
+    HORN = "horn"
+    TWO_CNF = "2-cnf"
+    XOR_LINEAR = "xor-linear"
+    CNF = "cnf"
+    GENERAL = "general"
+
+
+class TractableForm:
+    """
+    A formula recognised as a conjunction of clauses or of XOR equations.
+    ---
+    Use `TractableForm.classify(formula)`. Horn, 2-CNF and XOR-linear forms are
+    decided in polynomial time (unit propagation, implication-graph SCCs and
+    Gaussian elimination over GF(2)). Any CNF can be checked for being a
+    tautology in linear time, but general CNF satisfiability is left to the
+    exponential engines.
+    """
+
+    def __init__(self, formula_class: FormulaClass, atoms: list[Atom], clauses: list[Clause] | None = None,
+                 equations: list[tuple[int, int]] | None = None):
+        self._formula_class = formula_class
+        self._atoms = atoms
+        self._clauses = clauses
+        # Each equation is (mask, parity): the xor of the atoms whose bit is set in mask equals parity.
+        self._equations = equations
+
+    @staticmethod
+    def classify(formula: Formula) -> "TractableForm | None":
+        atoms = sorted(atoms_of(formula), key=lambda a: a.name)
+        clauses = _to_clauses(formula)
+        if clauses is not None:
+            if all(len(clause) <= 2 for clause in clauses):
+                return TractableForm(FormulaClass.TWO_CNF, atoms, clauses=clauses)
+            if all(sum(1 for _, positive in clause if positive) <= 1 for clause in clauses):
+                return TractableForm(FormulaClass.HORN, atoms, clauses=clauses)
+            return TractableForm(FormulaClass.CNF, atoms, clauses=clauses)
+        equations = _to_equations(formula, {atom: i for i, atom in enumerate(atoms)})
+        if equations is not None:
+            return TractableForm(FormulaClass.XOR_LINEAR, atoms, equations=equations)
+        return None
+
+    @property
+    def formula_class(self) -> FormulaClass:
+        return self._formula_class
+
+    @property
+    def decides_satisfiability(self) -> bool:
+        return self._formula_class is not FormulaClass.CNF
+
+    def satisfying_assignment(self) -> dict[Atom, bool] | None:
+        """A model of the formula, or None if it is unsatisfiable."""
+        if self._formula_class is FormulaClass.TWO_CNF:
+            model = _two_sat_model(self._clauses)
+        elif self._formula_class is FormulaClass.HORN:
+            model = _horn_model(self._clauses)
+        elif self._formula_class is FormulaClass.XOR_LINEAR:
+            model = _xor_model(self._equations, self._atoms)
+        else:
+            raise ValueError("satisfiability of general CNF is not decided in polynomial time")
+        if model is None:
+            return None
+        return {atom: model.get(atom, False) for atom in self._atoms}
+
+    def falsifying_assignment(self) -> dict[Atom, bool] | None:
+        """An assignment that makes the formula false, or None if it is a tautology."""
+        if self._clauses is not None:
+            for clause in self._clauses:
+                if not any((atom, not positive) in clause for atom, positive in clause):
+                    # Falsify every literal of the first non-trivial clause.
+                    falsified = {atom: not positive for atom, positive in clause}
+                    return {atom: falsified.get(atom, False) for atom in self._atoms}
+            return None
+
+        for mask, parity in self._equations:
+            if mask == 0 and parity == 0:
+                continue
+            model = {atom: False for atom in self._atoms}
+            if parity == 0:
+                # All-false gives xor 0, which satisfies this equation; flipping one of its atoms falsifies it.
+                model[self._atoms[(mask & -mask).bit_length() - 1]] = True
+            return model
+        return None
+
+
+def classify_formula(formula: Formula) -> FormulaClass:
+    form = TractableForm.classify(formula)
+    return FormulaClass.GENERAL if form is None else form.formula_class
+
+
+def _flatten(formula: Formula, operator: type) -> list[Formula]:
+    parts = []
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, operator):
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            parts.append(node)
+    return parts
+
+
+def _literal(formula: Formula) -> Literal | bool | None:
+    """A literal, a constant (as a bool), or None if `formula` is neither."""
+    if isinstance(formula, Atom):
+        return formula, True
+    if isinstance(formula, Truth):
+        return True
+    if isinstance(formula, Falsity):
+        return False
+    if isinstance(formula, Negation):
+        inner = _literal(formula.operand) if isinstance(formula.operand, (Atom, Truth, Falsity)) else None
+        if inner is None:
+            return None
+        if isinstance(inner, bool):
+            return not inner
+        return inner[0], not inner[1]
+    return None
+
+
+def _clause(disjuncts: list[Formula], negated: list[Formula]) -> Clause | bool | None:
+    """The clause ¬negated[0] ∨ ... ∨ disjuncts[0] ∨ ..., True if it is trivially satisfied, None if not a clause."""
+    literals = set()
+    for part, flip in [(part, True) for part in negated] + [(part, False) for part in disjuncts]:
+        literal = _literal(part)
+        if literal is None:
+            return None
+        if isinstance(literal, bool):
+            if literal != flip:
+                return True
+            continue
+        literals.add((literal[0], literal[1] != flip))
+    return frozenset(literals)
+
+
+def _to_clauses(formula: Formula) -> list[Clause] | None:
+    clauses = []
+    for conjunct in _flatten(formula, Conjunction):
+        if isinstance(conjunct, Implication):
+            # a1 ∧ ... ∧ ak → b1 ∨ ... ∨ bm is the clause ¬a1 ∨ ... ∨ ¬ak ∨ b1 ∨ ... ∨ bm
+            clause = _clause(_flatten(conjunct.right, Disjunction), _flatten(conjunct.left, Conjunction))
+        elif isinstance(conjunct, Negation) and isinstance(conjunct.operand, Conjunction):
+            clause = _clause([], _flatten(conjunct.operand, Conjunction))
+        else:
+            clause = _clause(_flatten(conjunct, Disjunction), [])
+        if clause is None:
+            return None
+        if clause is not True:
+            clauses.append(clause)
+    return clauses
+
+
+def _to_equations(formula: Formula, index: dict[Atom, int]) -> list[tuple[int, int]] | None:
+    equations = []
+    for conjunct in _flatten(formula, Conjunction):
+        linear = _linear(conjunct, index)
+        if linear is None:
+            return None
+        mask, constant = linear
+        # The conjunct holds iff xor(mask) ⊕ constant = 1.
+        equations.append((mask, constant ^ 1))
+    return equations
+
+
+def _linear(formula: Formula, index: dict[Atom, int]) -> tuple[int, int] | None:
+    """Writes the formula as xor(mask) ⊕ constant, or returns None if it is not built from ⊕, ↔ and ¬."""
+    return fold(formula, {
+        Formula: lambda node, *operands: None,
+        Atom: lambda node: (1 << index[node], 0),
+        Truth: lambda node: (0, 1),
+        Falsity: lambda node: (0, 0),
+        Negation: lambda node, inner: None if inner is None else (inner[0], inner[1] ^ 1),
+        Xor: _linear_sum,
+        Biconditional: lambda node, left, right: _linear_sum(node, left, right, 1),
+    })
+
+
+def _linear_sum(
+    node: Formula, left: tuple[int, int] | None, right: tuple[int, int] | None, constant: int = 0
+) -> tuple[int, int] | None:
+    if left is None or right is None:
+        return None
+    return left[0] ^ right[0], left[1] ^ right[1] ^ constant
+
+
+def _horn_model(clauses: list[Clause]) -> dict[Atom, bool] | None:
+    """Minimal model by unit propagation: an atom is made true only when some clause forces it."""
+    true_atoms = set()
+    waiting = []  # per clause: number of negative atoms not yet true
+    watchers: dict[Atom, list[int]] = {}
+    queue = []
+    for i, clause in enumerate(clauses):
+        negatives = [atom for atom, positive in clause if not positive]
+        waiting.append(len(negatives))
+        for atom in negatives:
+            watchers.setdefault(atom, []).append(i)
+        if not negatives:
+            queue.append(i)
+
+    while queue:
+        clause = clauses[queue.pop()]
+        heads = [atom for atom, positive in clause if positive]
+        if not heads:
+            return None
+        head = heads[0]
+        if head in true_atoms:
+            continue
+        true_atoms.add(head)
+        for i in watchers.get(head, []):
+            waiting[i] -= 1
+            if waiting[i] == 0:
+                queue.append(i)
+
+    return {atom: True for atom in true_atoms}
+
+
+def _two_sat_model(clauses: list[Clause]) -> dict[Atom, bool] | None:
+    atoms = sorted({atom for clause in clauses for atom, _ in clause}, key=lambda a: a.name)
+    index = {atom: i for i, atom in enumerate(atoms)}
+
+    def node(literal: Literal) -> int:
+        return 2 * index[literal[0]] + (0 if literal[1] else 1)
+
+    edges = [[] for _ in range(2 * len(atoms))]
+    for clause in clauses:
+        literals = list(clause)
+        if not literals:
+            return None
+        first, second = literals[0], literals[-1]
+        # first ∨ second gives ¬first → second and ¬second → first
+        edges[node(first) ^ 1].append(node(second))
+        edges[node(second) ^ 1].append(node(first))
+
+    component = _strongly_connected_components(edges)
+    model = {}
+    for atom, i in index.items():
+        if component[2 * i] == component[2 * i + 1]:
+            return None
+        # Tarjan numbers components in reverse topological order; take the literal that comes later.
+        model[atom] = component[2 * i] < component[2 * i + 1]
+    return model
+
+
+def _strongly_connected_components(edges: list[list[int]]) -> list[int]:
+    """Iterative Tarjan: component ids in the order components are completed."""
+    n = len(edges)
+    order = [-1] * n
+    low = [0] * n
+    component = [-1] * n
+    on_stack = [False] * n
+    stack = []
+    counter = 0
+    components = 0
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                order[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            if i < len(edges[v]):
+                work.append((v, i + 1))
+                w = edges[v][i]
+                if order[w] == -1:
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+            if low[v] == order[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = components
+                    if w == v:
+                        break
+                components += 1
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+    return component
+
+
+def _xor_model(equations: list[tuple[int, int]], atoms: list[Atom]) -> dict[Atom, bool] | None:
+    """Gaussian elimination over GF(2); free atoms are set to false."""
+    pivots: list[tuple[int, int, int]] = []  # (pivot bit, mask, parity), fully reduced against each other
+    for mask, parity in equations:
+        for bit, pivot_mask, pivot_parity in pivots:
+            if mask >> bit & 1:
+                mask ^= pivot_mask
+                parity ^= pivot_parity
+        if mask == 0:
+            if parity:
+                return None
+            continue
+        bit = (mask & -mask).bit_length() - 1
+        pivots = [
+            (b, m ^ mask, p ^ parity) if m >> bit & 1 else (b, m, p)
+            for b, m, p in pivots
+        ]
+        pivots.append((bit, mask, parity))
+
+    model = {atom: False for atom in atoms}
+    for bit, mask, parity in pivots:
+        # Every other atom in a reduced row is free (false), so the pivot takes the parity.
+        model[atoms[bit]] = bool(parity)
+    return model
@@ -0,0 +1,69 @@
+import unittest
+
+from evaluation_function.domain.formula import Atom, Conjunction, Disjunction, Negation, Xor
+from evaluation_function.domain.evaluators import Assignment, FormulaEvaluator, SatisfiabilityEvaluator, TautologyEvaluator
+from evaluation_function.domain.tractable import FormulaClass, TractableForm, classify_formula
+from evaluation_function.parsing.parser import formula_parser
+
+
+class TestClassification(unittest.TestCase):
+
+    def test_classes(self):
+        cases = {
+            "(p ∨ ¬q) ∧ (q ∨ r) ∧ ¬r": FormulaClass.TWO_CNF,
+            "(p ∧ q → r) ∧ (r → s) ∧ p ∧ q": FormulaClass.HORN,
+            "(¬p ∨ ¬q ∨ r) ∧ ¬(r ∧ s ∧ t)": FormulaClass.HORN,
+            "(p ∨ q ∨ r) ∧ (¬p ∨ q ∨ s)": FormulaClass.CNF,
+            "(p ⊕ q) ∧ (q ↔ ¬r) ∧ (p ⊕ r ⊕ ⊤)": FormulaClass.XOR_LINEAR,
+            "(p ∧ q) ∨ r ∧ (p ⊕ q)": FormulaClass.GENERAL,
+        }
+        for text, expected in cases.items():
+            with self.subTest(formula=text):
+                self.assertEqual(classify_formula(formula_parser(text)), expected)
+
+
+class TestSolvers(unittest.TestCase):
+
+    def assertModel(self, text):
+        formula = formula_parser(text)
+        model = TractableForm.classify(formula).satisfying_assignment()
+        self.assertIsNotNone(model)
+        self.assertTrue(FormulaEvaluator(formula, Assignment(model)).evaluate())
+
+    def assertUnsatisfiable(self, text):
+        self.assertIsNone(TractableForm.classify(formula_parser(text)).satisfying_assignment())
+
+    def test_horn(self):
+        self.assertModel("(p ∧ q → r) ∧ (r → s) ∧ p ∧ q ∧ (t ∧ s → u)")
+        self.assertUnsatisfiable("p ∧ (p → q) ∧ (q ∧ p → ⊥)")
+
+    def test_two_sat(self):
+        self.assertModel("(p ∨ q) ∧ (¬p ∨ r) ∧ (¬q ∨ ¬r) ∧ (r ∨ s)")
+        self.assertUnsatisfiable("(p ∨ q) ∧ (p ∨ ¬q) ∧ (¬p ∨ q) ∧ (¬p ∨ ¬q)")
+
+    def test_xor(self):
+        self.assertModel("(a ⊕ b ⊕ c) ∧ (b ↔ c) ∧ ¬(a ⊕ d)")
+        self.assertUnsatisfiable("(a ⊕ b) ∧ (b ⊕ c) ∧ (a ⊕ c)")
+
+    def test_tautology_counterexample(self):
+        formula = formula_parser("(p ∨ ¬p) ∧ (q ∨ r ∨ ¬s)")
+        falsifying = TractableForm.classify(formula).falsifying_assignment()
+        self.assertFalse(FormulaEvaluator(formula, Assignment(falsifying)).evaluate())
+        self.assertIsNone(TractableForm.classify(formula_parser("(p ⊕ q) ↔ (q ⊕ p)")).falsifying_assignment())
+
+    def test_large_instances_are_routed(self):
+        """Far beyond brute force: a 200-atom implication chain and a 200-atom xor chain."""
+        atoms = [Atom(f"x{i}") for i in range(200)]
+        chain = atoms[0]
+        parity = atoms[0]
+        for previous, atom in zip(atoms, atoms[1:]):
+            chain = Conjunction(chain, Disjunction(Negation(previous), atom))
+            parity = Xor(parity, atom)
+        self.assertTrue(SatisfiabilityEvaluator(chain).evaluate())
+        self.assertFalse(SatisfiabilityEvaluator(Conjunction(chain, Negation(atoms[-1]))).evaluate())
+        self.assertFalse(TautologyEvaluator(parity).evaluate())
+        self.assertTrue(SatisfiabilityEvaluator(Conjunction(parity, Negation(atoms[3]))).evaluate())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from typing import Any, Callable, Iterator, Mapping
+
+from .formula import Formula, Atom, UnaryOperator, BinaryOperator
+
+
+# A fold's handlers: for each formula type, a function of the node and the values of its operands.
+Handlers = Mapping[type, Callable[..., Any]]
+
+
+def fold(formula: Formula, handlers: Handlers) -> Any:
+    """
+    Folds a formula bottom-up without recursion
+    ---
+    `handlers` maps formula types to functions of the node followed by the
+    values of its operands: `handler(atom)`, `handler(negation, operand)`,
+    `handler(conjunction, left, right)`. A type without a handler uses the one
+    of its nearest base class, so a `BinaryOperator` handler serves every
+    binary connective. Nodes are visited operands first, left to right, with
+    an explicit stack, so formulas of any depth are folded; a subformula
+    shared by several parents (the same object) is folded once.
+    """
+    dispatch = _Dispatch(handlers)
+    table = dispatch.table
+    memo: dict[int, Any] = {}
+    # Operand values wait on `values`; an entry (handler, node, arity) on `stack` combines them once they are in.
+    values: list[Any] = []
+    stack: list[Any] = [formula]
+    while stack:
+        item = stack.pop()
+        if type(item) is tuple:
+            handler, node, arity = item
+            if arity == 1:
+                value = handler(node, values.pop())
+            else:
+                right = values.pop()
+                value = handler(node, values.pop(), right)
+            memo[id(node)] = value
+            values.append(value)
+            continue
+        key = id(item)
+        value = memo.get(key, _PENDING)
+        if value is not _PENDING:
+            values.append(value)
+            continue
+        handler, arity = table.get(type(item)) or dispatch(type(item))
+        if arity == 0:
+            value = memo[key] = handler(item)
+            values.append(value)
+        elif arity == 1:
+            stack.append((handler, item, 1))
+            stack.append(item._operand)
+        else:
+            stack.append((handler, item, 2))
+            stack.append(item._right)
+            stack.append(item._left)
+    return values[0]
+
+
+def nodes(formula: Formula) -> Iterator[Formula]:
+    """Every subformula object of `formula` once, operands before the formulas that use them, left to right."""
+    seen: set[int] = set()
+    stack: list[tuple[Formula, bool]] = [(formula, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in seen:
+            continue
+        if expanded:
+            seen.add(id(node))
+            yield node
+            continue
+        stack.append((node, True))
+        arity = _arity(type(node))
+        if arity == 1:
+            stack.append((node.operand, False))
+        elif arity == 2:
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+
+
+def atoms_of(formula: Formula) -> set[Atom]:
+    """The atoms occurring in `formula`."""
+    return {node for node in nodes(formula) if isinstance(node, Atom)}
+
+
+def structurally_equal(first: Formula, second: Formula) -> bool:
+    """
+    Whether two formulas are the same tree, compared pairwise with an explicit stack
+    ---
+    Shared subtrees (the same object on both sides) are not walked, and the
+    hashes cached on each node reject most unequal pairs at once.
+    """
+    stack = [(first, second)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        cls = type(a)
+        if type(b) is not cls and not isinstance(b, cls) or a._hash != b._hash:
+            return False
+        arity = _ARITIES.get(cls) or _arity(cls)
+        if arity == 2:
+            stack.append((a._right, b._right))
+            stack.append((a._left, b._left))
+        elif arity == 1:
+            stack.append((a._operand, b._operand))
+        elif a != b:
+            return False
+    return True
+
+
+class _Dispatch:
+    """Resolves a fold's handler and the arity of each node type, once per type."""
+
+    def __init__(self, handlers: Handlers):
+        self._handlers = handlers
+        self.table: dict[type, tuple[Callable[..., Any], int]] = {}
+
+    def __call__(self, cls: type) -> tuple[Callable[..., Any], int]:
+        handler = next((self._handlers[base] for base in cls.__mro__ if base in self._handlers), None)
+        if handler is None:
+            raise TypeError(f"Unknown formula type: {cls}")
+        entry = self.table[cls] = (handler, _arity(cls))
+        return entry
+
+
+# Marks a subformula not folded yet; None is a value some folds produce.
+_PENDING = object()
+
+_ARITIES: dict[type, int] = {}
+
+
+def _arity(cls: type) -> int:
+    arity = _ARITIES.get(cls)
+    if arity is None:
+        if issubclass(cls, BinaryOperator):
+            arity = 2
+        elif issubclass(cls, UnaryOperator):
+            arity = 1
+        elif issubclass(cls, Formula):
+            arity = 0
+        else:
+            raise TypeError(f"Unknown formula type: {cls}")
+        _ARITIES[cls] = arity
+    return arity
@@ -0,0 +1,108 @@
+import pickle
+import unittest
+from functools import reduce
+
+from evaluation_function.domain.cofactor import cofactor, fold_constants, rename_atoms
+from evaluation_function.domain.evaluators import Assignment, FormulaEvaluator, _extract_atoms
+from evaluation_function.domain.formula import (
+    Formula,
+    Atom,
+    Truth,
+    Falsity,
+    Negation,
+    BinaryOperator,
+    Conjunction,
+    Disjunction,
+    Implication,
+)
+from evaluation_function.domain.printing import format_formula
+from evaluation_function.domain.traversal import atoms_of, fold, nodes, structurally_equal
+from evaluation_function.truth_table.generate import subformula_columns
+
+
+# Far deeper than Python's default recursion limit of 1000.
+DEPTH = 5000
+
+
+class TestTraversal(unittest.TestCase):
+
+    def test_fold_dispatches_on_nearest_base_class(self):
+        p, q = Atom("p"), Atom("q")
+        size = fold(Implication(Negation(p), Conjunction(p, q)), {
+            Formula: lambda node: 1,
+            Negation: lambda node, operand: operand + 1,
+            BinaryOperator: lambda node, left, right: left + right + 1,
+        })
+        self.assertEqual(size, 6)
+        with self.assertRaises(TypeError):
+            fold(Negation(p), {Atom: lambda node: 1})
+
+    def test_shared_subformulas_are_folded_once(self):
+        p, q = Atom("p"), Atom("q")
+        shared = Disjunction(p, q)
+        calls = []
+        fold(Conjunction(shared, Negation(shared)), {
+            Formula: lambda node: calls.append(node),
+            Negation: lambda node, operand: calls.append(node),
+            BinaryOperator: lambda node, left, right: calls.append(node),
+        })
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(calls.count(shared), 1)
+
+    def test_nodes_are_in_post_order(self):
+        p, q = Atom("p"), Atom("q")
+        formula = Conjunction(Negation(p), Disjunction(p, q))
+        self.assertEqual(
+            list(nodes(formula)),
+            [p, Negation(p), q, Disjunction(p, q), formula],
+        )
+        self.assertEqual(atoms_of(formula), {p, q})
+
+    def test_structural_equality(self):
+        p, q = Atom("p"), Atom("q")
+        self.assertTrue(structurally_equal(Conjunction(p, Negation(q)), Conjunction(p, Negation(q))))
+        self.assertFalse(structurally_equal(Conjunction(p, q), Conjunction(q, p)))
+        self.assertFalse(structurally_equal(Conjunction(p, q), Disjunction(p, q)))
+        self.assertNotEqual(Conjunction(p, q), "p ∧ q")
+
+
+class TestDeepFormulas(unittest.TestCase):
+
+    def setUp(self):
+        self.atoms = [Atom(f"x{i}") for i in range(DEPTH)]
+        self.conjunction = reduce(Conjunction, self.atoms)
+        self.implications = reduce(lambda right, atom: Implication(atom, right), reversed(self.atoms))
+        self.negations = reduce(lambda operand, _: Negation(operand), range(DEPTH), Atom("p"))
+
+    def test_equality_hash_and_repr(self):
+        copy = reduce(Conjunction, [Atom(atom.name) for atom in self.atoms])
+        self.assertEqual(self.conjunction, copy)
+        self.assertEqual(hash(self.conjunction), hash(copy))
+        self.assertNotEqual(self.conjunction, Conjunction(self.conjunction.left, Atom("y")))
+        self.assertTrue(repr(self.negations).startswith("¬¬¬"))
+        self.assertTrue(repr(self.conjunction).endswith(" ∧ Atom('x4999'))"))
+        self.assertEqual(pickle.loads(pickle.dumps(self.implications)), self.implications)
+
+    def test_printing(self):
+        self.assertEqual(format_formula(self.conjunction), " ∧ ".join(atom.name for atom in self.atoms))
+        self.assertEqual(format_formula(self.implications), " → ".join(atom.name for atom in self.atoms))
+
+    def test_evaluation_and_atoms(self):
+        self.assertEqual(_extract_atoms(self.conjunction), set(self.atoms))
+        everything_true = Assignment({atom: True for atom in self.atoms})
+        self.assertTrue(FormulaEvaluator(self.conjunction, everything_true).evaluate())
+        self.assertTrue(FormulaEvaluator(self.implications, everything_true).evaluate())
+        self.assertFalse(FormulaEvaluator(self.negations, Assignment({Atom("p"): False})).evaluate())
+        self.assertEqual(len(subformula_columns(self.conjunction)), 2 * DEPTH - 1)
+
+    def test_rewriting(self):
+        renamed = rename_atoms(self.conjunction, {self.atoms[0]: Atom("y")})
+        self.assertEqual(_extract_atoms(renamed), set(self.atoms[1:]) | {Atom("y")})
+        self.assertIs(cofactor(self.conjunction, Atom("y"), True), self.conjunction)
+        self.assertEqual(cofactor(self.conjunction, self.atoms[-1], False), Falsity())
+        self.assertIs(cofactor(self.conjunction, self.atoms[-1], True), self.conjunction.left)
+        self.assertEqual(fold_constants(Conjunction(Truth(), self.conjunction)), self.conjunction)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import logging
+import os
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+def env_number(name: str, default: Any, kind: type = int) -> Any:
+    """
+    The number in the environment variable `name`, read as `kind`
+    ---
+    An unset or blank variable gives `default`, and so does a value that is
+    not a number, after logging a warning, so a typo in the configuration
+    does not stop the service from starting.
+    """
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return kind(value)
+    except ValueError:
+        logger.warning("ignoring %s=%r: not a number", name, value)
+        return default
@@ -0,0 +1,24 @@
+import os
+import unittest
+from unittest import mock
+
+from evaluation_function.env import env_number
+
+
+class TestEnvNumber(unittest.TestCase):
+
+    def test_values_and_fallbacks(self):
+        with mock.patch.dict(os.environ, {"EVAL_TEST_INT": "12", "EVAL_TEST_FLOAT": "0.5", "EVAL_TEST_BLANK": " "}):
+            self.assertEqual(env_number("EVAL_TEST_INT", 3), 12)
+            self.assertEqual(env_number("EVAL_TEST_FLOAT", 1.0, float), 0.5)
+            self.assertEqual(env_number("EVAL_TEST_BLANK", 3), 3)
+            self.assertEqual(env_number("EVAL_TEST_UNSET", 3), 3)
+
+    def test_invalid_value_is_ignored_with_a_warning(self):
+        with mock.patch.dict(os.environ, {"EVAL_TEST_INT": "many"}):
+            with self.assertLogs("evaluation_function.env", "WARNING"):
+                self.assertEqual(env_number("EVAL_TEST_INT", 3), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,37 @@ from typing import Any
 import json
 from lf_toolkit.evaluation import Result, Params
 
-from evaluation_function.domain.evaluators import _extract_atoms, EquivalenceEvaluator, SatisfiabilityEvaluator, TautologyEvaluator
+from evaluation_function.answer_cache import answer_analysis, answer_minimal_dnf, reference_index
+from evaluation_function.domain.analysis import FormulaAnalysis
+from evaluation_function.domain.budget import Budget, BudgetExceeded
+from evaluation_function.domain.evaluators import (
+    Assignment,
+    EquivalenceEvaluator,
+    FormulaEvaluator,
+    ModelCountEvaluator,
+    SatisfiabilityEvaluator,
+    TautologyEvaluator,
+)
 from evaluation_function.domain.formula import *
+from evaluation_function.domain.minimisation import MAX_MINIMISE_ATOMS, dnf_cost, minimal_dnf, minimise
+from evaluation_function.domain.normal_forms import is_cnf, is_dnf, is_nnf
+from evaluation_function.metrics import metrics
 
-from evaluation_function.parsing.parser import formula_parser
+from evaluation_function.parsing.limits import InputTooLarge, default_input_limits
+from evaluation_function.parsing.parser import cached_formula_parser
+from evaluation_function.question_bank import equivalence_references
 from evaluation_function.parsing.tree_builder_error import BuildError
 
 from evaluation_function.truth_table.evaluate import evaluate_truth_table
+from evaluation_function.truth_table.generate import TruthTableGenerator
+
+
+# The syntactic forms `answer.normalForm` can ask for: the test and the description used in feedback.
+NORMAL_FORMS = {
+    "cnf": (is_cnf, "conjunctive normal form: a conjunction of clauses, each a disjunction of atoms and negated atoms"),
+    "dnf": (is_dnf, "disjunctive normal form: a disjunction of terms, each a conjunction of atoms and negated atoms"),
+    "nnf": (is_nnf, "negation normal form: only ∧, ∨ and negation applied directly to atoms"),
+}
 
 
 def evaluation_function(
@@ -62,107 +86,334 @@ def evaluation_function(
                 feedback_items=[("incorrect input", "response must be type String")]
             )
 
-        formula = formula_parser(response_formula)
+        formula = cached_formula_parser(response_formula)
 
-        # Answer shape: satisfiability (bool), tautology (bool), equivalent (None|str), validTruthTable (bool)
+        # Answer shape: satisfiability (bool), tautology (bool), equivalent (None|str|[str]), validTruthTable (bool)
         satisfiability = answer.get("satisfiability", False) is True
         tautology = answer.get("tautology", False) is True
-        equivalent = answer.get("equivalent")
-        if equivalent is not None and not isinstance(equivalent, str):
-            equivalent = None
-        elif equivalent is not None and isinstance(equivalent, str) and equivalent.strip() == "":
-            equivalent = None
-            
+        references, mistakes = equivalence_references(answer)
+
         has_truth_table = answer.get("validTruthTable", False) is True
-        has_equivalence = equivalent is not None
+        has_equivalence = len(references) > 0
 
-        num_selected = sum([satisfiability, tautology, has_equivalence, has_truth_table])
+        # referenceTruthTable: true (columns picked automatically) or a list of column formulas
+        reference_columns = answer.get("referenceTruthTable", False)
+        has_reference_table = reference_columns is True or isinstance(reference_columns, list)
 
-        if num_selected == 0:
+        # modelCount: the number of assignments that must satisfy the response formula
+        model_count = answer.get("modelCount")
+        has_model_count = isinstance(model_count, int) and not isinstance(model_count, bool)
+
+        # normalForm: "cnf", "dnf" or "nnf", the syntactic form the response formula must be written in
+        normal_form = answer.get("normalForm")
+        if isinstance(normal_form, str):
+            normal_form = normal_form.strip().lower()
+        has_normal_form = normal_form not in (None, False, "")
+        if has_normal_form and normal_form not in NORMAL_FORMS:
+            # Checking nothing would accept any response, so an unknown form is an error even beside other checks.
             return Result(
                 is_correct=False,
-                feedback_items=[("invalid param", "please select a param")]
+                feedback_items=[("invalid param", f"normalForm must be one of {', '.join(NORMAL_FORMS)}")]
             )
-        if num_selected > 1:
+
+        # minimalDnf: true if the response must be a DNF with as few terms, then literals, as possible
+        minimal_dnf = answer.get("minimalDnf", False) is True
+
+        num_selected = sum([
+            satisfiability,
+            tautology,
+            has_equivalence,
+            has_truth_table,
+            has_reference_table,
+            has_model_count,
+            has_normal_form,
+            minimal_dnf,
+        ])
+
+        if num_selected == 0:
             return Result(
                 is_correct=False,
-                feedback_items=[("invalid param", "please only select 1 param")]
+                feedback_items=[("invalid param", "please select a param")]
             )
 
-        # Truth table mode: validate response truth table if present
-        response_truth_table = response.get("truthTable", None)
-        if has_truth_table:
-            if response_truth_table is None or not isinstance(response_truth_table, dict):
-                return Result(
-                    is_correct=False,
-                    feedback_items=[("incorrect input", "truthTable required when answer expects truth table")]
-                )
-            variables = response_truth_table.get("variables", [])
-            cells = response_truth_table.get("cells", [])
-
-            if not isinstance(variables, list) or not isinstance(cells, list):
-                return Result(
-                    is_correct=False,
-                    feedback_items=[("incorrect input", "truthTable must contain 'variables' and 'cells' arrays")]
-                )
-
-            num_atoms = len(_extract_atoms(formula))
-            truth_table_result = evaluate_truth_table(variables, cells, num_atoms)
-            if not truth_table_result.is_correct:
-                return truth_table_result
-
-        is_correct = False
+        # Several checks may be selected; they share one analysis of the response
+        # formula, so its atoms and truth table are computed at most once. All of
+        # them draw on one budget, so the request as a whole respects its deadline.
+        budget = Budget.from_params(params)
+        analysis = FormulaAnalysis(formula, budget)
         feedback = []
 
-        if has_equivalence:
-            answer_formula = formula_parser(equivalent)
-            ev = EquivalenceEvaluator(formula, answer_formula)
-            is_correct, counterex = ev.evaluate_with_counterexample()
-            if not is_correct:
-                feedback.append((
-                    "equivalence",
-                    "Your formula is not equivalent to the target."
-                ))
-                if counterex:
-                    if counterex.get("reason"):
-                        feedback.append(("counterexample", counterex["reason"]))
-                    elif counterex.get("assignment") is not None:
-                        # Use plain atom names only (assignment is already name -> bool)
-                        asn = ", ".join(f"{k}={counterex['assignment'][k]}" for k in sorted(counterex["assignment"]))
-                        feedback.append((
-                            "counterexample",
-                            f"Under assignment ({asn}) your formula evaluates to {counterex['response_value']}."
-                        ))
-        elif tautology:
-            ev = TautologyEvaluator(formula)
-            is_correct, counterex = ev.evaluate_with_counterexample()
-            if not is_correct:
-                feedback.append((
-                    "tautology",
-                    f"Formula \"{response_formula}\" is not a tautology."
-                ))
-                if counterex:
-                    asn = ", ".join(f"{k}={counterex['assignment'][k]}" for k in sorted(counterex["assignment"]))
-                    feedback.append((
-                        "counterexample",
-                        f"Under assignment ({asn}) the formula evaluates to False."
-                    ))
-        elif satisfiability:
-            is_correct = SatisfiabilityEvaluator(formula).evaluate()
-            if not is_correct:
-                feedback.append((
-                    "satisfiability",
-                    f"Formula \"{response_formula}\" is not satisfiable: no assignment of the atoms makes it true."
-                ))
-        elif has_truth_table:
-            is_correct = True  # already validated above
+        if has_reference_table:
+            columns = reference_columns if isinstance(reference_columns, list) else None
+            generator = TruthTableGenerator(formula, columns, budget=budget)
+            default_input_limits().check("table_rows", generator.num_rows)
+            default_input_limits().check("table_columns", len(generator.columns))
+            feedback.append(("truthTable", _render_reference_table(generator)))
+
+        outcomes = []
+        if has_truth_table:
+            outcomes.append(_check_truth_table(analysis, response.get("truthTable", None)))
+        if has_equivalence and minimal_dnf:
+            # A simplified formula may drop atoms the target does not depend on, which renaming cannot match.
+            outcomes.append(_check_equivalence_by_name(analysis, references, mistakes))
+        elif has_equivalence:
+            outcomes.append(_check_equivalence(analysis, references, mistakes))
+        if tautology:
+            outcomes.append(_check_tautology(analysis, response_formula))
+        if satisfiability:
+            outcomes.append(_check_satisfiability(analysis, response_formula))
+        if has_model_count:
+            outcomes.append(_check_model_count(analysis, model_count))
+        if has_normal_form:
+            outcomes.append(_check_normal_form(analysis, normal_form))
+        if minimal_dnf:
+            outcomes.append(_check_minimal_dnf(analysis, references))
+
+        is_correct = all(check_correct for check_correct, _ in outcomes)
+        for _, check_feedback in outcomes:
+            feedback.extend(check_feedback)
 
         if feedback:
-            return Result(is_correct=False, feedback_items=feedback)
+            return Result(is_correct=is_correct, feedback_items=feedback)
         return Result(is_correct=is_correct)
 
+    except InputTooLarge as e:
+        metrics.increment("inputs_rejected")
+        metrics.increment(f"inputs_rejected_{e.limit}")
+        return Result(
+            is_correct=False,
+            feedback_items=[("input too large", str(e))]
+        )
+    except BudgetExceeded:
+        # Not knowing the answer is different from the answer being wrong, so say so.
+        return Result(
+            is_correct=False,
+            feedback_items=[("undetermined", "The formula could not be checked within the time allowed for evaluation.")]
+        )
     except Exception as e:
         return Result(
             is_correct=False,
             feedback_items=[("Error", str(e))]
-        )
\ No newline at end of file
+        )
+
+
+Feedback = list[tuple]
+
+
+def _check_truth_table(analysis: FormulaAnalysis, response_truth_table: Any) -> tuple[bool, Feedback]:
+    if response_truth_table is None or not isinstance(response_truth_table, dict):
+        return False, [("incorrect input", "truthTable required when answer expects truth table")]
+    variables = response_truth_table.get("variables", [])
+    cells = response_truth_table.get("cells", [])
+
+    if not isinstance(variables, list) or not isinstance(cells, list):
+        return False, [("incorrect input", "truthTable must contain 'variables' and 'cells' arrays")]
+    limits = default_input_limits()
+    limits.check("table_rows", len(cells))
+    limits.check("table_columns", max([len(variables)] + [len(row) for row in cells if isinstance(row, list)]))
+
+    truth_table_result = evaluate_truth_table(variables, cells, analysis.num_atoms)
+    if not truth_table_result.is_correct:
+        return False, list(truth_table_result.feedback_items)
+    return True, []
+
+
+def _check_equivalence(
+    analysis: FormulaAnalysis, references: tuple[str, ...], mistakes: tuple[tuple[str, str], ...]
+) -> tuple[bool, Feedback]:
+    if len(references) == 1 and not mistakes:
+        return _check_equivalence_to(analysis, references[0])
+
+    # Several accepted formulas or known mistakes: one lookup in the answer's index classifies the response.
+    label = reference_index(references, mistakes).lookup(analysis)
+    if label is not None and label[0] == "reference":
+        return True, []
+    if label is not None:
+        return False, [
+            ("equivalence", "Your formula is not equivalent to the target."),
+            ("mistake", label[1]),
+        ]
+    return False, _not_equivalent_feedback(analysis, answer_analysis(references[0]))
+
+
+def _not_equivalent_feedback(analysis: FormulaAnalysis, answer: FormulaAnalysis) -> Feedback:
+    """
+    Feedback for a response the answer's index found equivalent to none of its formulas
+    ---
+    The lookup has already decided, so no renaming is searched again: the
+    counterexample is read off the two truth tables under the identity
+    renaming, as the full check would report it, and is left out for formulas
+    too large to tabulate.
+    """
+    feedback = [("equivalence", "Your formula is not equivalent to the target.")]
+    if analysis.num_atoms != answer.num_atoms:
+        feedback.append(("counterexample", f"different number of atoms: {analysis.num_atoms} vs {answer.num_atoms}"))
+    elif analysis.truth_table is not None and answer.truth_table is not None:
+        diff = analysis.truth_table.bits ^ answer.truth_table.bits
+        if diff:
+            # The last differing row is the first one in False-before-True enumeration order.
+            row = diff.bit_length() - 1
+            assignment = analysis.truth_table.assignment(row)
+            asn = ", ".join(f"{atom.name}={assignment[atom]}" for atom in sorted(assignment, key=lambda a: a.name))
+            feedback.append((
+                "counterexample",
+                f"Under assignment ({asn}) your formula evaluates to {analysis.truth_table.value(row)}."
+            ))
+    return feedback
+
+
+def _check_equivalence_by_name(
+    analysis: FormulaAnalysis, references: tuple[str, ...], mistakes: tuple[tuple[str, str], ...]
+) -> tuple[bool, Feedback]:
+    """
+    Equivalence with atoms matched by name rather than up to renaming
+    ---
+    Each comparison is a tautology check of response ↔ reference over the
+    atoms of both, so an atom missing from one side is one the other must not
+    depend on.
+    """
+    counterexample = None
+    for text in references:
+        is_equivalent, falsifying = _equivalent_by_name(analysis, answer_analysis(text).formula)
+        if is_equivalent:
+            return True, []
+        counterexample = counterexample or falsifying
+
+    feedback = [("equivalence", "Your formula is not equivalent to the target.")]
+    for text, mistake_feedback in mistakes:
+        if _equivalent_by_name(analysis, answer_analysis(text).formula)[0]:
+            feedback.append(("mistake", mistake_feedback))
+            return False, feedback
+    if counterexample is not None:
+        assignment = counterexample["assignment"]
+        asn = ", ".join(f"{k}={assignment[k]}" for k in sorted(assignment))
+        response_value = FormulaEvaluator(
+            analysis.formula, Assignment({Atom(name): value for name, value in assignment.items()})
+        ).evaluate()
+        feedback.append((
+            "counterexample",
+            f"Under assignment ({asn}) your formula evaluates to {response_value}."
+        ))
+    return False, feedback
+
+
+def _equivalent_by_name(analysis: FormulaAnalysis, reference: Formula) -> tuple[bool, dict | None]:
+    tautology = TautologyEvaluator(Biconditional(analysis.formula, reference), budget=analysis.budget)
+    return tautology.evaluate_with_counterexample()
+
+
+def _check_equivalence_to(analysis: FormulaAnalysis, equivalent: str) -> tuple[bool, Feedback]:
+    answer = answer_analysis(equivalent)
+    metrics.increment("equivalence_checks")
+    # Most correct responses are the answer itself, reordered or with other
+    # atom names; those are recognised without evaluating either formula.
+    if analysis.canonical_form == answer.canonical_form:
+        metrics.increment("equivalence_structural_matches")
+        return True, []
+
+    ev = EquivalenceEvaluator(
+        analysis.formula,
+        answer.formula,
+        analysis.truth_table,
+        budget=analysis.budget,
+        truth_table2=answer.truth_table if answer.num_atoms == analysis.num_atoms else None,
+    )
+    is_correct, counterex = ev.evaluate_with_counterexample()
+    if is_correct:
+        return True, []
+
+    feedback = [(
+        "equivalence",
+        "Your formula is not equivalent to the target."
+    )]
+    if counterex:
+        if counterex.get("reason"):
+            feedback.append(("counterexample", counterex["reason"]))
+        elif counterex.get("assignment") is not None:
+            # Use plain atom names only (assignment is already name -> bool)
+            asn = ", ".join(f"{k}={counterex['assignment'][k]}" for k in sorted(counterex["assignment"]))
+            feedback.append((
+                "counterexample",
+                f"Under assignment ({asn}) your formula evaluates to {counterex['response_value']}."
+            ))
+    return False, feedback
+
+
+def _check_tautology(analysis: FormulaAnalysis, response_formula: str) -> tuple[bool, Feedback]:
+    ev = TautologyEvaluator(analysis.formula, analysis.truth_table, budget=analysis.budget)
+    is_correct, counterex = ev.evaluate_with_counterexample()
+    if is_correct:
+        return True, []
+
+    feedback = [(
+        "tautology",
+        f"Formula \"{response_formula}\" is not a tautology."
+    )]
+    if counterex:
+        asn = ", ".join(f"{k}={counterex['assignment'][k]}" for k in sorted(counterex["assignment"]))
+        feedback.append((
+            "counterexample",
+            f"Under assignment ({asn}) the formula evaluates to False."
+        ))
+    return False, feedback
+
+
+def _check_satisfiability(analysis: FormulaAnalysis, response_formula: str) -> tuple[bool, Feedback]:
+    if SatisfiabilityEvaluator(analysis.formula, analysis.truth_table, budget=analysis.budget).evaluate():
+        return True, []
+    return False, [(
+        "satisfiability",
+        f"Formula \"{response_formula}\" is not satisfiable: no assignment of the atoms makes it true."
+    )]
+
+
+def _check_model_count(analysis: FormulaAnalysis, expected: int) -> tuple[bool, Feedback]:
+    count = ModelCountEvaluator(analysis.formula, analysis.truth_table, analysis.budget).evaluate()
+    if count == expected:
+        return True, []
+    return False, [(
+        "modelCount",
+        f"Your formula is satisfied by {count} of the {2 ** analysis.num_atoms} assignments to its atoms, not {expected}."
+    )]
+
+
+def _render_reference_table(generator: TruthTableGenerator) -> str:
+    """Encodes the generated table in the same shape as a response truthTable, one chunk of rows at a time."""
+    rows = []
+    for chunk in generator.chunks():
+        rows.extend(json.dumps(["tt" if value else "ff" for value in row]) for row in chunk)
+    variables = json.dumps(generator.headers, ensure_ascii=False)
+    return f'{{"variables": {variables}, "cells": [{", ".join(rows)}]}}'
+
+
+def _check_normal_form(analysis: FormulaAnalysis, normal_form: str) -> tuple[bool, Feedback]:
+    is_in_form, description = NORMAL_FORMS[normal_form]
+    if is_in_form(analysis.formula):
+        return True, []
+    return False, [("normalForm", f"Your formula is not in {description}.")]
+
+
+def _check_minimal_dnf(analysis: FormulaAnalysis, references: tuple[str, ...]) -> tuple[bool, Feedback]:
+    cost = dnf_cost(analysis.formula)
+    if cost is None:
+        return False, [("minimalDnf", f"Your formula is not in {NORMAL_FORMS['dnf'][1]}.")]
+
+    # The smallest size depends only on the function, so an answer's minimisation is cached and shared;
+    # without one, the response's own function is minimised. Equivalence to the answer is checked separately.
+    reference = answer_analysis(references[0]) if references else analysis
+    if reference.num_atoms > MAX_MINIMISE_ATOMS:
+        return False, [("minimalDnf", f"Formulas of more than {MAX_MINIMISE_ATOMS} atoms cannot be checked for minimality.")]
+    if references:
+        minimal = answer_minimal_dnf(references[0])
+    elif analysis.truth_table is not None:
+        minimal = minimise(analysis.truth_table, analysis.budget)
+    else:
+        minimal = minimal_dnf(analysis.formula, analysis.budget)
+
+    if cost <= (minimal.num_terms, minimal.num_literals):
+        return True, []
+    return False, [(
+        "minimalDnf",
+        f"Your formula has {cost[0]} terms and {cost[1]} literals; "
+        f"a DNF with {minimal.num_terms} terms and {minimal.num_literals} literals exists."
+    )]
@@ -1,6 +1,7 @@
 import unittest
 
 from .evaluation import Params, evaluation_function
+from .metrics import metrics
 
 class TestEvaluationFunction(unittest.TestCase):
     """
@@ -94,6 +95,75 @@ class TestEvaluationFunction(unittest.TestCase):
 
         self.assertTrue(result.get("is_correct"))
 
+    def test_check_equivalence_structural_match(self):
+        """A reordered, renamed copy of the answer is accepted before any semantic check."""
+        response = {"formula": "(b ∨ c) ∧ a"}
+        answer = {"equivalent": "p ∧ (q ∨ r)"}
+        matches = metrics.get("equivalence_structural_matches")
+
+        result = evaluation_function(response, answer, Params()).to_dict()
+
+        self.assertTrue(result.get("is_correct"))
+        self.assertEqual(metrics.get("equivalence_structural_matches"), matches + 1)
+
+    def test_check_equivalence_any_of_several(self):
+        answer = {"equivalent": ["p → q", "¬q → ¬p"], "commonMistakes": [{"formula": "p ∧ q", "feedback": "→ is not ∧."}]}
+
+        accepted = evaluation_function({"formula": "¬a ∨ b"}, answer, Params()).to_dict()
+        mistaken = evaluation_function({"formula": "b ∧ a"}, answer, Params()).to_dict()
+        wrong = evaluation_function({"formula": "a ↔ b"}, answer, Params()).to_dict()
+
+        self.assertTrue(accepted.get("is_correct"))
+        self.assertFalse(mistaken.get("is_correct"))
+        self.assertIn("→ is not ∧.", str(mistaken.get("feedback")))
+        self.assertFalse(wrong.get("is_correct"))
+        self.assertIn("Under assignment (a=False, b=True) your formula evaluates to False.", str(wrong.get("feedback")))
+
+    def test_check_normal_form(self):
+        answer = {"equivalent": "p → (q ∧ r)", "normalForm": "cnf"}
+
+        rewritten = evaluation_function({"formula": "(¬p ∨ q) ∧ (¬p ∨ r)"}, answer, Params()).to_dict()
+        unrewritten = evaluation_function({"formula": "¬p ∨ (q ∧ r)"}, answer, Params()).to_dict()
+
+        self.assertTrue(rewritten.get("is_correct"))
+        self.assertFalse(unrewritten.get("is_correct"))
+        self.assertIn("conjunctive normal form", str(unrewritten.get("feedback")))
+
+    def test_normal_form_name(self):
+        response = {"formula": "¬p ∨ (q ∧ r)"}
+        upper_case = evaluation_function(response, {"equivalent": "p → (q ∧ r)", "normalForm": "CNF"}, Params()).to_dict()
+        unknown = evaluation_function(response, {"equivalent": "p → (q ∧ r)", "normalForm": "xnf"}, Params()).to_dict()
+
+        self.assertFalse(upper_case.get("is_correct"))
+        self.assertIn("conjunctive normal form", str(upper_case.get("feedback")))
+        self.assertFalse(unknown.get("is_correct"))
+        self.assertIn("normalForm must be one of cnf, dnf, nnf", str(unknown.get("feedback")))
+
+    def test_oversized_input_is_rejected(self):
+        rejected = metrics.get("inputs_rejected_atoms")
+        formula = " ∨ ".join(f"x{i}" for i in range(100))
+
+        result = evaluation_function({"formula": formula}, {"satisfiability": True}, Params()).to_dict()
+
+        self.assertFalse(result.get("is_correct"))
+        self.assertIn("more than 64 distinct atoms", str(result.get("feedback")))
+        self.assertEqual(metrics.get("inputs_rejected_atoms"), rejected + 1)
+
+    def test_check_minimal_dnf(self):
+        answer = {"equivalent": "(p ∧ q) ∨ (p ∧ ¬q) ∨ (¬p ∧ r)", "minimalDnf": True}
+
+        minimal = evaluation_function({"formula": "r ∨ p"}, answer, Params()).to_dict()
+        unreduced = evaluation_function({"formula": "(¬p ∧ r) ∨ p"}, answer, Params()).to_dict()
+        renamed = evaluation_function({"formula": "s ∨ p"}, answer, Params()).to_dict()
+        not_dnf = evaluation_function({"formula": "p ∨ ¬(q ∨ r)"}, {"minimalDnf": True}, Params()).to_dict()
+
+        self.assertTrue(minimal.get("is_correct"))
+        self.assertFalse(unreduced.get("is_correct"))
+        self.assertIn("2 terms and 2 literals exists", str(unreduced.get("feedback")))
+        self.assertFalse(renamed.get("is_correct"))
+        self.assertIn("not equivalent", str(renamed.get("feedback")))
+        self.assertFalse(not_dnf.get("is_correct"))
+
     def test_truth_table_valid(self):
         response = {
             "formula": "p ∧ q",
@@ -349,3 +419,82 @@ class TestEvaluationFunction(unittest.TestCase):
         result = evaluation_function(response, answer, params).to_dict()
         self.assertTrue(result.get("is_correct"))
 
+    # --- Multiple checks ---
+
+    def test_multiple_checks_all_pass(self):
+        """Several checks in one request: correct only when every check passes."""
+        response = {
+            "formula": "p ∨ ¬p",
+            "truthTable": {
+                "variables": ["p", "¬p", "p ∨ ¬p"],
+                "cells": [["tt", "ff", "tt"], ["ff", "tt", "tt"]]
+            }
+        }
+        answer = {"satisfiability": True, "tautology": True, "equivalent": "q → q", "validTruthTable": True}
+        params = Params()
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertTrue(result.get("is_correct"))
+
+    def test_multiple_checks_feedback_per_failing_check(self):
+        """p ∧ q is satisfiable but neither a tautology nor equivalent to p ∨ q."""
+        response = {"formula": "p ∧ q"}
+        answer = {"satisfiability": True, "tautology": True, "equivalent": "p ∨ q", "validTruthTable": False}
+        params = Params()
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertFalse(result.get("is_correct"))
+        feedback_str = str(result.get("feedback_items", result.get("feedback", []))).lower()
+        self.assertIn("not equivalent", feedback_str)
+        self.assertIn("not a tautology", feedback_str)
+        self.assertNotIn("not satisfiable", feedback_str)
+
+    # --- Model counting ---
+
+    def test_model_count(self):
+        """p ∨ q is satisfied by 3 of its 4 assignments."""
+        response = {"formula": "p ∨ q"}
+        answer = {"modelCount": 3}
+        params = Params()
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertTrue(result.get("is_correct"))
+
+    def test_model_count_fail(self):
+        response = {"formula": "p ∧ q"}
+        answer = {"modelCount": 3}
+        params = Params()
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertFalse(result.get("is_correct"))
+        self.assertIn("feedback", result)
+
+    # --- Reference truth table ---
+
+    def test_reference_truth_table(self):
+        """referenceTruthTable generates the table in the response truthTable shape."""
+        response = {"formula": "p ∧ q"}
+        answer = {"referenceTruthTable": True}
+        params = Params()
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertTrue(result.get("is_correct"))
+        feedback_str = str(result.get("feedback_items", result.get("feedback", [])))
+        self.assertIn('"variables": ["p", "q", "p ∧ q"]', feedback_str)
+        self.assertIn('["tt", "ff", "ff"]', feedback_str)
+
+    def test_reference_truth_table_chosen_columns(self):
+        response = {"formula": "p → q"}
+        answer = {"referenceTruthTable": ["q", "p → q"]}
+        params = Params()
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertTrue(result.get("is_correct"))
+        feedback_str = str(result.get("feedback_items", result.get("feedback", [])))
+        self.assertIn('"variables": ["q", "p → q"]', feedback_str)
+
+    # --- Evaluation budget ---
+
+    def test_budget_exhausted_is_undetermined(self):
+        """Running out of budget is reported as undetermined rather than as a wrong answer."""
+        response = {"formula": "(a ∧ b) ∨ (c ∧ d) ∨ (e ∧ f) ∨ (g ∧ h) ∨ ¬((a ∧ b) ∨ (c ∧ d) ∨ (e ∧ f) ∨ (g ∧ h))"}
+        answer = {"tautology": True}
+        params = {"workLimit": 5}
+        result = evaluation_function(response, answer, params).to_dict()
+        self.assertFalse(result.get("is_correct"))
+        feedback_str = str(result.get("feedback_items", result.get("feedback", []))).lower()
+        self.assertIn("could not be checked", feedback_str)
@@ -0,0 +1,166 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+from lf_toolkit.evaluation import Result as EvaluationResult
+
+from .batch import evaluate_batch
+from .env import env_number
+from .evaluation import evaluation_function
+from .metrics import metrics
+from .preview import preview_function
+from .result_cache import ResultCache, with_result_cache
+from .worker_pool import PoolConfig, TaskKilled, WorkerPool
+
+
+class EvalRequest(BaseModel):
+    response: Any = None
+    answer: Any = None
+    params: dict[str, Any] = {}
+
+
+class PreviewRequest(BaseModel):
+    response: Any = None
+    params: dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    responses: list[Any]
+    answer: Any = None
+    params: dict[str, Any] = {}
+
+
+class HttpConfig:
+    """
+    Settings for the HTTP server
+    ---
+    Each can be set with an environment variable:
+
+    - `EVAL_HTTP_HOST`, `EVAL_HTTP_PORT` address to listen on
+    - `EVAL_HTTP_MAX_CONCURRENCY` evaluations in flight at once; further requests wait their turn
+    - `EVAL_HTTP_KEEP_ALIVE` seconds an idle keep-alive connection is held open
+
+    The evaluations themselves run in a `WorkerPool`, configured by `PoolConfig`.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080, max_concurrency: int | None = None,
+                 keep_alive: int = 75):
+        self.host = host
+        self.port = port
+        # Enough to keep every worker busy while the next requests are being read.
+        self.max_concurrency = max_concurrency if max_concurrency is not None else 2 * (os.cpu_count() or 1)
+        self.keep_alive = keep_alive
+
+    @staticmethod
+    def from_env() -> "HttpConfig":
+        defaults = HttpConfig()
+        return HttpConfig(
+            host=os.environ.get("EVAL_HTTP_HOST", defaults.host),
+            port=env_number("EVAL_HTTP_PORT", defaults.port, int),
+            max_concurrency=env_number("EVAL_HTTP_MAX_CONCURRENCY", defaults.max_concurrency, int),
+            keep_alive=env_number("EVAL_HTTP_KEEP_ALIVE", defaults.keep_alive, int),
+        )
+
+
+_evaluate = None
+
+
+def evaluate_to_dict(response: Any, answer: Any, params: dict[str, Any]) -> dict:
+    """Runs in a worker: evaluates and returns the JSON form of the result, which is cheaper to send back."""
+    global _evaluate
+    if _evaluate is None:
+        # Each worker opens its own connection to the shared result cache, if one is configured.
+        cache = ResultCache.from_env()
+        _evaluate = evaluation_function if cache is None else with_result_cache(evaluation_function, cache)
+    return _evaluate(response, answer, params).to_dict()
+
+
+def preview_to_dict(response: Any, params: dict[str, Any]) -> dict:
+    # A preview result is already a dict.
+    return dict(preview_function(response, params))
+
+
+def create_app(config: HttpConfig | None = None, pool_config: PoolConfig | None = None) -> FastAPI:
+    config = config if config is not None else HttpConfig.from_env()
+    state = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        state["pool"] = WorkerPool(pool_config)
+        state["limit"] = asyncio.Semaphore(config.max_concurrency)
+        state["admission"] = asyncio.Lock()
+        try:
+            yield
+        finally:
+            state["pool"].close()
+
+    @asynccontextmanager
+    async def slots(count: int):
+        # A batch holds one slot per worker it can use. Batches collect theirs one at a time, so two
+        # cannot each hold part of what they need and wait on each other; single requests need just one.
+        acquired = 0
+        try:
+            async with state["admission"]:
+                while acquired < count:
+                    await state["limit"].acquire()
+                    acquired += 1
+            yield
+        finally:
+            for _ in range(acquired):
+                state["limit"].release()
+
+    async def run(function, *args) -> dict:
+        async with state["limit"]:
+            # WorkerPool.run blocks until a worker answers, so it waits in a thread, not on the event loop.
+            return await asyncio.to_thread(state["pool"].run, function, *args)
+
+    async def evaluate(request: EvalRequest) -> dict:
+        try:
+            return await run(evaluate_to_dict, request.response, request.answer, request.params)
+        except TaskKilled as e:
+            return EvaluationResult(is_correct=False, feedback_items=[("Error", str(e))]).to_dict()
+
+    app = FastAPI(title="Propositional logic evaluation", lifespan=lifespan)
+
+    @app.post("/eval")
+    async def eval_endpoint(request: EvalRequest) -> dict:
+        return await evaluate(request)
+
+    @app.post("/preview")
+    async def preview_endpoint(request: PreviewRequest) -> dict:
+        try:
+            return await run(preview_to_dict, request.response, request.params)
+        except TaskKilled as e:
+            return {"preview": {"feedback": str(e)}}
+
+    @app.get("/metrics")
+    async def metrics_endpoint() -> dict[str, int]:
+        # The pool adds each task's counts from its worker to this process's.
+        return metrics.snapshot()
+
+    @app.post("/eval/batch")
+    async def batch_endpoint(request: BatchRequest) -> list[dict]:
+        def regrade() -> list[dict]:
+            results = evaluate_batch(request.responses, request.answer, request.params, state["pool"])
+            return [result.to_dict() for result in results]
+
+        # evaluate_batch keeps at most one task per worker in flight.
+        workers = min(state["pool"].config.size, len(request.responses), config.max_concurrency)
+        async with slots(max(workers, 1)):
+            return await asyncio.to_thread(regrade)
+
+    return app
+
+
+def serve():
+    """Run the HTTP server (`POST /eval`, `/preview` and `/eval/batch`, `GET /metrics`) with uvicorn."""
+    config = HttpConfig.from_env()
+    uvicorn.run(create_app(config), host=config.host, port=config.port, timeout_keep_alive=config.keep_alive)
+
+
+if __name__ == "__main__":
+    serve()
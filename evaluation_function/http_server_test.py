@@ -0,0 +1,43 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from .http_server import HttpConfig, create_app
+from .worker_pool import PoolConfig
+
+
+class TestHttpServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        app = create_app(HttpConfig(max_concurrency=2), PoolConfig(size=2, task_timeout=10.0))
+        cls.client_context = TestClient(app)
+        cls.client = cls.client_context.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client_context.__exit__(None, None, None)
+
+    def test_eval(self):
+        reply = self.client.post("/eval", json={"response": {"formula": "p ∨ ¬p"}, "answer": {"tautology": True}})
+        self.assertEqual(reply.status_code, 200)
+        self.assertTrue(reply.json()["is_correct"])
+
+    def test_preview(self):
+        reply = self.client.post("/preview", json={"response": "P ∧ Q"})
+        self.assertEqual(reply.status_code, 200)
+        self.assertEqual(reply.json()["preview"]["latex"], "P ∧ Q")
+
+    def test_batch_keeps_request_order(self):
+        responses = [{"formula": formula} for formula in ["p", "p ∧ ¬p", "q ∨ r", "p∧¬p"]]
+        reply = self.client.post("/eval/batch", json={"responses": responses, "answer": {"satisfiability": True}})
+        self.assertEqual([result["is_correct"] for result in reply.json()], [True, False, True, False])
+
+    def test_metrics_include_worker_counts(self):
+        before = self.client.get("/metrics").json().get("equivalence_checks", 0)
+        self.client.post("/eval", json={"response": {"formula": "q → p"}, "answer": {"equivalent": "p ∧ q"}})
+        self.assertEqual(self.client.get("/metrics").json()["equivalence_checks"], before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,90 @@
+import logging
+import os
+import threading
+import time
+from typing import Any
 
 from lf_toolkit import create_server, run
+from lf_toolkit.evaluation import Result as EvaluationResult, Params
+from lf_toolkit.preview import Result as PreviewResult, Preview
 
+from .env import env_number
 from .evaluation import evaluation_function
+from .metrics import metrics
 from .preview import preview_function
+from .result_cache import ResultCache, with_result_cache
+from .worker_pool import PoolConfig, TaskKilled, WorkerPool
+
+logger = logging.getLogger(__name__)
+
+_pool: WorkerPool | None = None
+
+
+def pooled_evaluation_function(response: Any, answer: Any, params: Params) -> EvaluationResult:
+    """Runs `evaluation_function` in the worker pool, turning a killed task into an error result."""
+    try:
+        return _pool.run(evaluation_function, response, answer, params)
+    except TaskKilled as e:
+        return EvaluationResult(is_correct=False, feedback_items=[("Error", str(e))])
+
+
+def pooled_preview_function(response: Any, params: Params) -> PreviewResult:
+    try:
+        return _pool.run(preview_function, response, params)
+    except TaskKilled as e:
+        return PreviewResult(preview=Preview(feedback=str(e)))
+
 
 def main():
     """Run the IPC server with the evaluation and preview functions.
+
+    `EVAL_EXECUTION_MODE` chooses where calls run:
+
+    - `inprocess` (default) in the server process
+    - `pool` in a pool of worker processes (see `PoolConfig` for its settings)
+    - `prefork` like `pool`, but the fork server the workers are forked from
+      first warms the caches from the question bank at `EVAL_QUESTION_BANK` and
+      freezes them, so that every worker starts with them, shared copy-on-write
+
+    Setting `EVAL_RESULT_CACHE` to a file path puts a persistent result cache
+    in front of evaluation in every mode (see `ResultCache`).
+
+    The event counters in `metrics`, with those of the pool's workers added
+    in, are logged every `EVAL_METRICS_LOG_INTERVAL` seconds (default 300; 0
+    for never).
     """
+    global _pool
+    mode = os.environ.get("EVAL_EXECUTION_MODE", "inprocess")
+
+    if mode in ("pool", "prefork"):
+        preload = ["evaluation_function.evaluation", "evaluation_function.preview"]
+        if mode == "prefork":
+            # Warms the fork server itself, so replacement workers start warm too.
+            preload.append("evaluation_function.prefork")
+        _pool = WorkerPool(PoolConfig.from_env(), preload=preload)
+
+    interval = env_number("EVAL_METRICS_LOG_INTERVAL", 300.0, float)
+    if interval > 0:
+        threading.Thread(target=_log_metrics, args=(interval,), name="metrics", daemon=True).start()
+
     server = create_server()
 
-    server.eval(evaluation_function)
-    server.preview(preview_function)
+    evaluate = pooled_evaluation_function if _pool is not None else evaluation_function
+    # Opened in this process only: an SQLite connection must not cross a fork.
+    cache = ResultCache.from_env()
+    if cache is not None:
+        evaluate = with_result_cache(evaluate, cache)
+    server.eval(evaluate)
+    server.preview(pooled_preview_function if _pool is not None else preview_function)
 
     run(server)
 
+
+def _log_metrics(interval: float):
+    while True:
+        time.sleep(interval)
+        logger.info("metrics: %s", metrics.snapshot())
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
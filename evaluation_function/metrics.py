@@ -0,0 +1,49 @@
+import threading
+from collections import Counter
+from typing import Mapping
+
+
+class Metrics:
+    """
+    Named event counters, kept per process
+    ---
+    Each worker process counts its own events and hands them to the pool with
+    every result (`take`), which adds them to the counts of the process that
+    runs the pool (`add`). So `snapshot` in the serving process reports the
+    events of every worker, including ones since recycled, except those of a
+    task whose worker was killed.
+    """
+
+    def __init__(self):
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counts[name]
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def add(self, counts: Mapping[str, int]):
+        with self._lock:
+            self._counts.update(counts)
+
+    def take(self) -> dict[str, int]:
+        """The counts since the last `take`, which are cleared."""
+        with self._lock:
+            counts = dict(self._counts)
+            self._counts.clear()
+            return counts
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,29 @@
+import unittest
+
+from .metrics import Metrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_counters(self):
+        metrics = Metrics()
+        self.assertEqual(metrics.get("a"), 0)
+        metrics.increment("a")
+        metrics.increment("a", 2)
+        metrics.increment("b")
+        self.assertEqual(metrics.snapshot(), {"a": 3, "b": 1})
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_take_and_add(self):
+        worker, parent = Metrics(), Metrics()
+        worker.increment("a", 2)
+        parent.add(worker.take())
+        worker.increment("a")
+        parent.add(worker.take())
+        self.assertEqual(worker.snapshot(), {})
+        self.assertEqual(parent.snapshot(), {"a": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from .token_stream import TokenStream
 from .expression_builder import ExpressionBuilder
 from .primary_builder import PrimaryBuilder
 from .binary_operator_builder import BinaryOperatorBuilder
+from .limits import InputLimits, InputTooLarge, default_input_limits
 
 __all__ = [
     "Tokenizer",
@@ -23,4 +24,7 @@ __all__ = [
     "ExpressionBuilder",
     "PrimaryBuilder",
     "BinaryOperatorBuilder",
+    "InputLimits",
+    "InputTooLarge",
+    "default_input_limits",
 ]
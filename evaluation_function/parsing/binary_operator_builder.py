@@ -50,10 +50,12 @@ class BinaryOperatorBuilder(ExpressionBuilder):
 
             stream.advance()
 
+            stream.descend()
             if token.type in self._RIGHT_ASSOCIATIVE:
                 right = self._build_binary_operator(stream, op_precedence)
             else:
                 right = self._build_binary_operator(stream, op_precedence + 1)
+            stream.ascend()
 
             constructor = self._OPERATOR_CONSTRUCTORS[token.type]
             left = constructor(left, right)
@@ -0,0 +1,88 @@
+from evaluation_function.env import env_number
+
+
+# What each limit counts, for feedback.
+_DESCRIPTIONS = {
+    "length": "characters",
+    "tokens": "symbols",
+    "atoms": "distinct atoms",
+    "depth": "levels of nesting",
+    "table_rows": "truth table rows",
+    "table_columns": "truth table columns",
+}
+
+
+class InputTooLarge(Exception):
+    """An input over one of the admission limits, raised as soon as the limit is passed."""
+
+    def __init__(self, limit: str, maximum: int, position: int | None = None):
+        self.limit = limit
+        self.maximum = maximum
+        self.position = position
+        where = f" (at position {position})" if position is not None else ""
+        super().__init__(f"The input is too large to evaluate: it has more than {maximum} {_DESCRIPTIONS[limit]}{where}.")
+
+
+class InputLimits:
+    """
+    Admission limits on the formulas and truth tables accepted for evaluation
+    ---
+    They are checked while the input is read, so an oversized input is rejected
+    after reading only as far as the first limit it passes. 0 turns a limit off.
+    Each can be set with an environment variable:
+
+    - `EVAL_INPUT_MAX_LENGTH` characters in a formula
+    - `EVAL_INPUT_MAX_TOKENS` symbols (atoms, constants, connectives, parentheses) in a formula
+    - `EVAL_INPUT_MAX_ATOMS` distinct atoms in a formula
+    - `EVAL_INPUT_MAX_DEPTH` nesting of parentheses, negations and right operands in a formula
+    - `EVAL_INPUT_MAX_TABLE_ROWS` rows in a truth table, submitted or generated
+    - `EVAL_INPUT_MAX_TABLE_COLUMNS` columns in a truth table, submitted or generated
+    """
+
+    def __init__(
+        self,
+        max_length: int = 20_000,
+        max_tokens: int = 10_000,
+        max_atoms: int = 64,
+        max_depth: int = 200,
+        max_table_rows: int = 65_536,
+        max_table_columns: int = 64,
+    ):
+        self.max_length = max_length
+        self.max_tokens = max_tokens
+        self.max_atoms = max_atoms
+        self.max_depth = max_depth
+        self.max_table_rows = max_table_rows
+        self.max_table_columns = max_table_columns
+
+    @staticmethod
+    def from_env() -> "InputLimits":
+        defaults = InputLimits()
+        return InputLimits(
+            max_length=env_number("EVAL_INPUT_MAX_LENGTH", defaults.max_length),
+            max_tokens=env_number("EVAL_INPUT_MAX_TOKENS", defaults.max_tokens),
+            max_atoms=env_number("EVAL_INPUT_MAX_ATOMS", defaults.max_atoms),
+            max_depth=env_number("EVAL_INPUT_MAX_DEPTH", defaults.max_depth),
+            max_table_rows=env_number("EVAL_INPUT_MAX_TABLE_ROWS", defaults.max_table_rows),
+            max_table_columns=env_number("EVAL_INPUT_MAX_TABLE_COLUMNS", defaults.max_table_columns),
+        )
+
+    def check(self, limit: str, value: int, position: int | None = None):
+        """Raises `InputTooLarge` if `value` is over the limit named `limit` (e.g. "atoms" for `max_atoms`)."""
+        maximum = getattr(self, f"max_{limit}")
+        if maximum > 0 and value > maximum:
+            raise InputTooLarge(limit, maximum, position)
+
+
+# No limits at all, for callers that have already admitted their input.
+UNLIMITED = InputLimits(0, 0, 0, 0, 0, 0)
+
+_default_input_limits: InputLimits | None = None
+
+
+def default_input_limits() -> InputLimits:
+    """The limits configured from the environment, read on first use."""
+    global _default_input_limits
+    if _default_input_limits is None:
+        _default_input_limits = InputLimits.from_env()
+    return _default_input_limits
@@ -0,0 +1,66 @@
+import os
+import unittest
+from unittest import mock
+
+from evaluation_function.domain.formula import Atom, Negation
+from evaluation_function.parsing.limits import InputLimits, InputTooLarge, UNLIMITED
+from evaluation_function.parsing.parser import formula_parser
+from evaluation_function.parsing.tokenizer import Tokenizer
+
+
+class TestInputLimits(unittest.TestCase):
+
+    def test_length_is_checked_before_reading(self):
+        with self.assertRaises(InputTooLarge) as raised:
+            Tokenizer("p ∧ q", limits=InputLimits(max_length=4))
+        self.assertEqual(raised.exception.limit, "length")
+        self.assertIsNone(raised.exception.position)
+
+    def test_tokens_stop_being_read_at_the_limit(self):
+        # The character after the limit would be a syntax error; it is never reached.
+        with self.assertRaises(InputTooLarge) as raised:
+            formula_parser("p ∧ q ∧ %", InputLimits(max_tokens=3))
+        self.assertEqual((raised.exception.limit, raised.exception.position), ("tokens", 6))
+        self.assertIn("more than 3 symbols", str(raised.exception))
+
+    def test_distinct_atoms(self):
+        limits = InputLimits(max_atoms=2)
+        self.assertEqual(formula_parser("p ∧ q ∧ p", limits).right, Atom("p"))
+        with self.assertRaises(InputTooLarge) as raised:
+            formula_parser("p ∧ q ∧ r", limits)
+        self.assertEqual((raised.exception.limit, raised.exception.position), ("atoms", 8))
+
+        many_atoms = " ∨ ".join(f"x{i}" for i in range(65))
+        with self.assertRaises(InputTooLarge):
+            formula_parser(many_atoms, InputLimits())
+        self.assertIsNotNone(formula_parser(many_atoms, UNLIMITED))
+
+    def test_depth(self):
+        limits = InputLimits(max_depth=3)
+        self.assertEqual(formula_parser("¬¬¬p", limits), Negation(Negation(Negation(Atom("p")))))
+        for text in ("¬¬¬¬p", "((((p))))", "a → b → c → d → e", "a ∧ (b ∨ ¬(c ∧ d))"):
+            with self.subTest(text=text):
+                with self.assertRaises(InputTooLarge) as raised:
+                    formula_parser(text, limits)
+                self.assertEqual(raised.exception.limit, "depth")
+        self.assertIsNotNone(formula_parser(" ∧ ".join(f"x{i % 10}" for i in range(1000)), limits))
+
+    def test_default_depth_stays_within_the_recursion_limit(self):
+        depth = InputLimits().max_depth
+        self.assertIsNotNone(formula_parser("(" * depth + "p" + ")" * depth))
+        self.assertIsNotNone(formula_parser(" → ".join(f"x{i % 10}" for i in range(depth + 1))))
+        with self.assertRaises(InputTooLarge):
+            formula_parser("(" * (depth + 1) + "p" + ")" * (depth + 1))
+
+    def test_from_env(self):
+        with mock.patch.dict(os.environ, {"EVAL_INPUT_MAX_ATOMS": "0", "EVAL_INPUT_MAX_DEPTH": "many"}):
+            limits = InputLimits.from_env()
+        self.assertEqual(limits.max_atoms, 0)
+        self.assertEqual(limits.max_depth, InputLimits().max_depth)
+        limits.check("atoms", 10_000)
+        with self.assertRaises(InputTooLarge):
+            limits.check("table_rows", limits.max_table_rows + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,22 @@
+from functools import lru_cache
 
 from evaluation_function.domain.formula import *
 from evaluation_function.parsing.tokenizer import *
 from evaluation_function.parsing.tree_builder import *
+from evaluation_function.parsing.limits import InputLimits, default_input_limits
 
-def formula_parser(input: str) -> Formula:
+def formula_parser(input: str, limits: InputLimits | None = None) -> Formula:
+    """
+    Parses a formula, rejecting input over the admission limits (`default_input_limits()` if not given)
+    ---
+    Length, token and atom limits are checked as the input is tokenized and the
+    nesting limit as it is parsed, so `InputTooLarge` is raised at the first
+    token over a limit.
+    """
+    limits = limits if limits is not None else default_input_limits()
 
     # tokenize input
-    tokenizer = Tokenizer(input)
+    tokenizer = Tokenizer(input, limits=limits)
     tokens = []
 
     token = Token()
@@ -15,7 +25,15 @@ def formula_parser(input: str) -> Formula:
         tokens.append(token)
     
     # parse tokens into Formula
-    builder = TreeBuilder(tokens)
+    builder = TreeBuilder(tokens, limits=limits)
     formula = builder.build()
 
-    return formula
\ No newline at end of file
+    return formula
+
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def cached_formula_parser(input: str) -> Formula:
+    """`formula_parser` with memoisation. Formulas are never modified, so one parse can be shared by every caller."""
+    return formula_parser(input)
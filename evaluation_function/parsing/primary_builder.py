@@ -23,15 +23,19 @@ class PrimaryBuilder(ExpressionBuilder):
 
         if token.type == TokenType.NEGATION:
             stream.advance()
+            stream.descend()
             operand = self.build(stream)
+            stream.ascend()
             return Negation(operand)
 
         if token.type == TokenType.LEFT_PAREN:
             stream.advance()
+            stream.descend()
             formula = self._expression_builder.build(stream)
             if stream.current_token is None or stream.current_token.type != TokenType.RIGHT_PAREN:
                 raise ValueError(f"Expected ')' at position {stream.position}")
             stream.advance()
+            stream.ascend()
             return formula
 
         if token.type == TokenType.ATOM:
@@ -1,11 +1,14 @@
 from typing import List, Optional
 from .token import Token, TokenType
+from .limits import InputTooLarge
 
 
 class TokenStream:
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: List[Token], max_depth: int = 0):
         self._tokens = tokens
         self._position = 0
+        self._depth = 0
+        self._max_depth = max_depth
 
     @property
     def current_token(self) -> Optional[Token]:
@@ -31,3 +34,13 @@ class TokenStream:
         return self._position >= len(self._tokens) or (
             self.current_token is not None and self.current_token.type == TokenType.EOF
         )
+
+    def descend(self):
+        """Enters a nested expression; raises `InputTooLarge` when nesting passes `max_depth` (0 for no limit)."""
+        self._depth += 1
+        if self._max_depth > 0 and self._depth > self._max_depth:
+            token = self.current_token
+            raise InputTooLarge("depth", self._max_depth, token.position if token is not None else None)
+
+    def ascend(self):
+        self._depth -= 1
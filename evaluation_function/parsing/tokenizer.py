@@ -2,12 +2,17 @@ from typing import List, Optional
 from .character_stream import CharacterStream
 from .token_matcher import TokenMatcher, SingleCharTokenMatcher, AtomTokenMatcher, EOFTokenMatcher
 from .token import Token, TokenType
+from .limits import InputLimits, default_input_limits
 
 
 class Tokenizer:
-    def __init__(self, text: str, matchers: Optional[List[TokenMatcher]] = None):
+    def __init__(self, text: str, matchers: Optional[List[TokenMatcher]] = None, limits: Optional[InputLimits] = None):
+        self._limits = limits if limits is not None else default_input_limits()
+        self._limits.check("length", len(text))
         self._stream = CharacterStream(text)
         self._matchers: List[TokenMatcher] = matchers or self._create_default_matchers()
+        self._num_tokens = 0
+        self._atom_names: set[str] = set()
 
     def _create_default_matchers(self) -> List[TokenMatcher]:
         return [
@@ -34,8 +39,20 @@ class Tokenizer:
 
         for matcher in self._matchers:
             if matcher.matches(self._stream):
-                return matcher.create_token(self._stream)
+                token = matcher.create_token(self._stream)
+                self._admit(token)
+                return token
 
         char = self._stream.current_char
         position = self._stream.position
         raise ValueError(f"Unexpected character '{char}' at position {position}")
+
+    def _admit(self, token: Token):
+        """Counts the token against the limits, so oversized input stops being read at the first token over one."""
+        if token.type == TokenType.EOF:
+            return
+        self._num_tokens += 1
+        self._limits.check("tokens", self._num_tokens, token.position)
+        if token.type == TokenType.ATOM:
+            self._atom_names.add(token.value)
+            self._limits.check("atoms", len(self._atom_names), token.position)
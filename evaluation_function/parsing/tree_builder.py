@@ -6,10 +6,17 @@ from .expression_builder import ExpressionBuilder
 from .primary_builder import PrimaryBuilder
 from .binary_operator_builder import BinaryOperatorBuilder
 from .tree_builder_error import BuildError
+from .limits import InputLimits, default_input_limits
 
 class TreeBuilder:
-    def __init__(self, tokens: List[Token], expression_builder: Optional[ExpressionBuilder] = None):
-        self._stream = TokenStream(tokens)
+    def __init__(
+        self,
+        tokens: List[Token],
+        expression_builder: Optional[ExpressionBuilder] = None,
+        limits: Optional[InputLimits] = None,
+    ):
+        limits = limits if limits is not None else default_input_limits()
+        self._stream = TokenStream(tokens, limits.max_depth)
         if expression_builder is None:
             self._expression_builder = self._create_default_builder()
         else:
@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+
+from evaluation_function.domain.analysis import FormulaAnalysis
+from evaluation_function.domain.bdd import BDD, BDDTooLarge
+from evaluation_function.domain.evaluators import _index_by_name
+from evaluation_function.domain.formula import Formula
+from evaluation_function.domain.planner import default_planner, _node_count
+from evaluation_function.domain.serialization import from_bytes, to_bytes
+from evaluation_function.parsing.parser import formula_parser
+from evaluation_function.question_bank import equivalence_references, read_question_bank
+from evaluation_function.shared_answer_cache import CompiledAnswer
+
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"PLQB"
+_VERSION = 2
+_HEADER = struct.Struct("<4sIIQ")  # magic, version, number of answers, offset of the index
+_ENTRY = struct.Struct("<16sQI")  # digest of the answer text, record offset, record length
+_RECORD = struct.Struct("<IIIII")  # formula length, compiled length, nodes, BDD nodes, CNF clauses
+
+# A size statistic that was not computed, because the formula was too large.
+UNKNOWN = 0xFFFFFFFF
+
+
+class PrecompiledAnswer:
+    """
+    One answer formula as stored by the precompiler
+    ---
+    `stats` holds the formula's node count, the node count of its BDD and the
+    number of clauses of its canonical CNF (one per falsifying row), with
+    `UNKNOWN` for sizes that were too large to compute.
+    """
+
+    def __init__(self, formula: Formula, compiled: CompiledAnswer | None, stats: dict[str, int]):
+        self.formula = formula
+        self.compiled = compiled
+        self.stats = stats
+
+    def analysis(self) -> FormulaAnalysis:
+        truth_table = self.compiled.truth_table() if self.compiled is not None else None
+        return FormulaAnalysis(self.formula, truth_table=truth_table)
+
+
+class PrecompiledAnswers:
+    """
+    Read access to a precompiled question bank, memory-mapped so that every worker shares one copy
+    ---
+    The file is a header, the records one after another, and an index of
+    (digest, offset, length) entries sorted by digest, searched by bisection.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._index = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a precompiled question bank of version {_VERSION}")
+
+    @staticmethod
+    def from_env() -> "PrecompiledAnswers | None":
+        """The precompiled bank at `EVAL_PRECOMPILED_ANSWERS`, or None when that is unset."""
+        path = os.environ.get("EVAL_PRECOMPILED_ANSWERS")
+        return PrecompiledAnswers(path) if path else None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, text: str) -> PrecompiledAnswer | None:
+        digest = _digest(text)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key, offset, length = _ENTRY.unpack_from(self._map, self._index + middle * _ENTRY.size)
+            if key < digest:
+                low = middle + 1
+            elif key > digest:
+                high = middle
+            else:
+                return _decode(memoryview(self._map)[offset:offset + length])
+        return None
+
+    def close(self):
+        self._map.close()
+
+
+def precompile(texts: list[str]) -> bytes:
+    """Compiles each answer formula in `texts` and packs them all into one precompiled bank. Formulas that fail are skipped."""
+    records = {}
+    for text in texts:
+        digest = _digest(text)
+        if digest in records:
+            continue
+        try:
+            records[digest] = _encode(formula_parser(text))
+        except Exception as e:
+            logger.warning("answer formula %r skipped: %s", text, e)
+
+    parts = [_HEADER.pack(_MAGIC, _VERSION, 0, 0)]
+    offset = _HEADER.size
+    index = []
+    for digest, record in records.items():
+        index.append(_ENTRY.pack(digest, offset, len(record)))
+        parts.append(record)
+        offset += len(record)
+    index.sort()
+    parts[0] = _HEADER.pack(_MAGIC, _VERSION, len(index), offset)
+    return b"".join(parts + index)
+
+
+def precompile_question_bank(input_path: str, output_path: str) -> int:
+    """
+    Precompiles the `equivalent` and `commonMistakes` formulas of every answer in a question bank
+    ---
+    Returns the number of formulas compiled; one that does not parse is logged
+    and skipped, and the rest of the bank is still compiled.
+    """
+    texts = []
+    for answer in read_question_bank(input_path):
+        if isinstance(answer, dict):
+            references, mistakes = equivalence_references(answer)
+            texts.extend(references)
+            texts.extend(text for text, _ in mistakes)
+    data = precompile(texts)
+    # Written next to the target and renamed, so running workers never map a half-written file.
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, "wb") as output:
+        output.write(data)
+    os.replace(temporary_path, output_path)
+    return struct.unpack_from("<I", data, 8)[0]
+
+
+def main():
+    """Precompile the answers of a question bank for `EVAL_PRECOMPILED_ANSWERS`.
+
+    Usage: python -m evaluation_function.precompile <question bank .jsonl> <output file>
+    """
+    if len(sys.argv) < 3:
+        print("Usage: python -m evaluation_function.precompile <question bank .jsonl> <output file>")
+        return
+
+    count = precompile_question_bank(sys.argv[1], sys.argv[2])
+    print(f"precompiled {count} answer formulas into {sys.argv[2]}")
+
+
+def _encode(formula: Formula) -> bytes:
+    config = default_planner().config
+    analysis = FormulaAnalysis(formula)
+    table = analysis.truth_table
+    compiled = CompiledAnswer.from_table(table).to_bytes() if table is not None else b""
+
+    bdd_nodes = UNKNOWN
+    if analysis.num_atoms <= config.bdd_max_atoms:
+        bdd = BDD(analysis.num_atoms, config.bdd_max_nodes)
+        try:
+            bdd_nodes = bdd.size(bdd.from_formula(formula, _index_by_name(formula)))
+        except BDDTooLarge:
+            pass
+    cnf_clauses = table.num_rows - table.count() if table is not None else UNKNOWN
+
+    formula_data = to_bytes(formula)
+    header = _RECORD.pack(len(formula_data), len(compiled), _node_count(formula), bdd_nodes, cnf_clauses)
+    return header + formula_data + compiled
+
+
+def _decode(data: memoryview) -> PrecompiledAnswer:
+    formula_length, compiled_length, nodes, bdd_nodes, cnf_clauses = _RECORD.unpack_from(data, 0)
+    start = _RECORD.size
+    formula = from_bytes(data[start:start + formula_length])
+    start += formula_length
+    compiled = CompiledAnswer.from_bytes(data[start:start + compiled_length]) if compiled_length else None
+    return PrecompiledAnswer(formula, compiled, {"nodes": nodes, "bdd_nodes": bdd_nodes, "cnf_clauses": cnf_clauses})
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .domain.evaluators import PackedTruthTable
+from .parsing.parser import formula_parser
+from .precompile import UNKNOWN, PrecompiledAnswers, precompile_question_bank
+
+
+class TestPrecompile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        bank = os.path.join(self.directory.name, "bank.jsonl")
+        with open(bank, "w", encoding="utf-8") as file:
+            for answer in [{"equivalent": "p → q"}, {"answer": {"equivalent": "(a ∧ b) ∨ c"}}, {"tautology": True},
+                           {"equivalent": "p → q"}]:
+                file.write(json.dumps(answer) + "\n")
+        self.path = os.path.join(self.directory.name, "answers.bin")
+        self.count = precompile_question_bank(bank, self.path)
+        self.answers = PrecompiledAnswers(self.path)
+
+    def tearDown(self):
+        self.answers.close()
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        self.assertEqual(self.count, 2)
+        self.assertEqual(len(self.answers), 2)
+        answer = self.answers.get("(a ∧ b) ∨ c")
+        self.assertEqual(answer.formula, formula_parser("(a ∧ b) ∨ c"))
+        analysis = answer.analysis()
+        self.assertEqual([atom.name for atom in analysis.atoms], ["a", "b", "c"])
+        self.assertEqual(analysis.truth_table.bits, PackedTruthTable(answer.formula).bits)
+        self.assertEqual(answer.stats["cnf_clauses"], 3)
+        self.assertNotEqual(answer.stats["bdd_nodes"], UNKNOWN)
+        self.assertIsNone(self.answers.get("p ∧ q"))
+
+    def test_unparsable_answer_is_skipped(self):
+        bank = os.path.join(self.directory.name, "bad_bank.jsonl")
+        with open(bank, "w", encoding="utf-8") as file:
+            for answer in [{"equivalent": "p ∧∧ q"}, {"equivalent": "p ∨ q"}]:
+                file.write(json.dumps(answer) + "\n")
+        path = os.path.join(self.directory.name, "bad_answers.bin")
+        with self.assertLogs("evaluation_function.precompile", "WARNING"):
+            self.assertEqual(precompile_question_bank(bank, path), 1)
+        answers = PrecompiledAnswers(path)
+        try:
+            self.assertIsNotNone(answers.get("p ∨ q"))
+            self.assertIsNone(answers.get("p ∧∧ q"))
+        finally:
+            answers.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,17 @@
+import gc
+import os
+
+from .answer_cache import warm_from_question_bank
+
+
+# Imported once by the fork server of `EVAL_EXECUTION_MODE=prefork` (see `main`),
+# before it forks any worker, so that every worker, including those replacing a
+# killed or recycled one, starts with the caches warmed from the question bank.
+_question_bank = os.environ.get("EVAL_QUESTION_BANK")
+if _question_bank:
+    warm_from_question_bank(_question_bank)
+
+# Move everything allocated so far out of the collector's reach, so that
+# collections in the workers do not touch (and so copy) the shared pages.
+gc.collect()
+gc.freeze()
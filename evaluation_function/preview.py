@@ -2,6 +2,8 @@ from typing import Any
 from lf_toolkit.preview import Result, Params, Preview
 
 from evaluation_function.domain.formula import *
+from evaluation_function.metrics import metrics
+from evaluation_function.parsing.limits import InputTooLarge
 from evaluation_function.parsing.parser import formula_parser
 from evaluation_function.parsing.tree_builder_error import BuildError
 
@@ -33,6 +35,10 @@ def preview_function(response: Any, params: Params) -> Result:
     try:
         formula = formula_parser(response)
     
+    except InputTooLarge as e:
+        metrics.increment("inputs_rejected")
+        metrics.increment(f"inputs_rejected_{e.limit}")
+        return Result(preview=Preview(feedback = str(e)))
     except BuildError as e:
         return Result(preview=Preview(feedback = str(e)))
     except ValueError as e:
@@ -0,0 +1,46 @@
+import json
+import logging
+from typing import Any, Iterator
+
+
+logger = logging.getLogger(__name__)
+
+
+def read_question_bank(path: str) -> Iterator[Any]:
+    """
+    The answer objects of a question bank: a JSON Lines file with one answer object per line
+    (either the object itself or wrapped as `{"answer": {...}}`). Lines that are not JSON are logged and skipped.
+    """
+    with open(path, encoding="utf-8") as bank:
+        for line_number, line in enumerate(bank, start=1):
+            if line.strip() == "":
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                logger.warning("question bank %s line %d skipped: %s", path, line_number, e)
+                continue
+            yield entry.get("answer", entry) if isinstance(entry, dict) else entry
+
+
+def equivalence_references(answer: dict) -> tuple[tuple[str, ...], tuple[tuple[str, str], ...]]:
+    """
+    The accepted formulas and the known mistakes of an answer object
+    ---
+    `equivalent` is one formula or a list of them, any of which is accepted.
+    `commonMistakes` is a list of `{"formula": ..., "feedback": ...}` objects:
+    a response equivalent to one of these formulas gets its feedback.
+    Blank and malformed entries are skipped.
+    """
+    equivalent = answer.get("equivalent")
+    candidates = equivalent if isinstance(equivalent, list) else [equivalent]
+    references = tuple(text for text in candidates if isinstance(text, str) and text.strip() != "")
+    mistakes = []
+    common_mistakes = answer.get("commonMistakes")
+    for mistake in common_mistakes if isinstance(common_mistakes, list) else []:
+        if not isinstance(mistake, dict):
+            continue
+        text, feedback = mistake.get("formula"), mistake.get("feedback")
+        if isinstance(text, str) and text.strip() != "" and isinstance(feedback, str):
+            mistakes.append((text, feedback))
+    return references, tuple(mistakes)
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from evaluation_function.domain.canonical import canonical_form
+from evaluation_function.env import env_number
+from evaluation_function.parsing.parser import cached_formula_parser
+
+
+logger = logging.getLogger(__name__)
+
+# Part of every cache key. Bump it whenever a change could alter the result of
+# any evaluation, so that results computed by older code are never served.
+ENGINE_VERSION = "2"
+
+# Feedback tags of results that say nothing lasting about the response, which are not cached.
+TRANSIENT_TAGS = {"undetermined", "Error"}
+
+# Answer keys whose checks look at the response's own atom names or columns,
+# so that results cannot be shared between canonically equal formulas.
+# `minimalDnf` compares the response with `equivalent` by atom name.
+NAME_SENSITIVE_ANSWER_KEYS = ("validTruthTable", "referenceTruthTable", "minimalDnf")
+
+
+class ResultCache:
+    """
+    Evaluation results stored in a local SQLite file, shared by every process that opens it
+    ---
+    The database runs in WAL mode, so readers in several workers do not block
+    each other or the writer. Entries older than `ttl` seconds are never
+    returned. Every `sweep_interval` writes, expired entries are deleted and, if
+    more than `max_entries` remain, the least recently read ones go too.
+    Results are stored pickled: the file must only be writable by the service.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 100_000,
+        sweep_interval: int = 100,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._sweep_interval = sweep_interval
+        self._clock = clock
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    @staticmethod
+    def from_env() -> "ResultCache | None":
+        """
+        The cache at `EVAL_RESULT_CACHE`, or None when that is unset. `EVAL_RESULT_CACHE_TTL` (seconds)
+        and `EVAL_RESULT_CACHE_MAX_ENTRIES` override the defaults.
+        """
+        path = os.environ.get("EVAL_RESULT_CACHE")
+        if not path:
+            return None
+        options = {
+            "ttl": env_number("EVAL_RESULT_CACHE_TTL", None, float),
+            "max_entries": env_number("EVAL_RESULT_CACHE_MAX_ENTRIES", None, int),
+        }
+        return ResultCache(path, **{name: value for name, value in options.items() if value is not None})
+
+    def get(self, key: str) -> Any | None:
+        now = self._clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM results WHERE key = ? AND created > ?", (key, now - self._ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        now = self._clock()
+        data = pickle.dumps(value)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, now, now),
+            )
+            self._writes += 1
+            if self._writes % self._sweep_interval == 0:
+                self._sweep(now)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _sweep(self, now: float):
+        self._connection.execute("DELETE FROM results WHERE created <= ?", (now - self._ttl,))
+        self._connection.execute(
+            "DELETE FROM results WHERE key IN ("
+            " SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+
+
+def result_key(response: Any, answer: Any, params: Any) -> str:
+    """
+    The cache key of one evaluation
+    ---
+    A hash of the normalised response, the answer (which selects the mode),
+    the params and `ENGINE_VERSION`.
+    """
+    parts = [
+        ENGINE_VERSION,
+        normalise_response(response),
+        json.dumps(answer, sort_keys=True, ensure_ascii=False, default=str),
+        json.dumps(dict(params) if params else {}, sort_keys=True, ensure_ascii=False, default=str),
+    ]
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def canonical_result_key(response: Any, answer: Any, params: Any) -> str | None:
+    """
+    A second cache key, shared by responses whose formulas have the same `canonical_form`
+    ---
+    Every check except the truth-table ones and `minimalDnf` gives the same
+    verdict for formulas that differ only in association, operand order and
+    atom names, so a correct result without feedback holds for all of them.
+    None when the answer selects one of those checks or the response formula
+    does not parse.
+    """
+    if isinstance(response, str):
+        try:
+            response = json.loads(response)
+        except ValueError:
+            return None
+    if not isinstance(response, dict) or not isinstance(response.get("formula"), str):
+        return None
+    if not isinstance(answer, dict) or any(answer.get(key, False) is not False for key in NAME_SENSITIVE_ANSWER_KEYS):
+        return None
+    try:
+        formula = cached_formula_parser(response["formula"])
+    except Exception:
+        return None
+    parts = [
+        ENGINE_VERSION,
+        "canonical",
+        canonical_form(formula),
+        json.dumps(answer, sort_keys=True, ensure_ascii=False, default=str),
+        json.dumps(dict(params) if params else {}, sort_keys=True, ensure_ascii=False, default=str),
+    ]
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def with_result_cache(function: Callable, cache: ResultCache) -> Callable:
+    """
+    Wraps an evaluation function so that repeated evaluations are answered from `cache`
+    ---
+    Results are looked up by `result_key`, then by `canonical_result_key`;
+    only correct results without feedback are stored under the latter.
+    """
+
+    def cached_evaluation_function(response: Any, answer: Any, params: Any):
+        try:
+            key = result_key(response, answer, params)
+        except (TypeError, ValueError):
+            return function(response, answer, params)
+        result = cache.get(key)
+        if result is not None:
+            return result
+        canonical_key = canonical_result_key(response, answer, params)
+        if canonical_key is not None:
+            result = cache.get(canonical_key)
+            if result is not None:
+                return result
+        result = function(response, answer, params)
+        feedback_items = getattr(result, "feedback_items", None) or []
+        if not any(tag in TRANSIENT_TAGS for tag, _ in feedback_items):
+            cache.put(key, result)
+        if canonical_key is not None and getattr(result, "is_correct", False) and not feedback_items:
+            cache.put(canonical_key, result)
+        return result
+
+    return cached_evaluation_function
+
+
+def normalise_response(response: Any) -> str:
+    """A key that is equal for responses that differ only in whitespace in the formula or in key order."""
+    if isinstance(response, str):
+        try:
+            response = json.loads(response)
+        except ValueError:
+            return json.dumps(response)
+    if isinstance(response, dict) and isinstance(response.get("formula"), str):
+        response = dict(response, formula=_normalise_formula(response["formula"]))
+    return json.dumps(response, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _normalise_formula(text: str) -> str:
+    # Whitespace only matters between two word characters, where it separates atom names.
+    text = text.strip()
+    return re.sub(
+        r"\s+",
+        lambda m: " " if text[m.start() - 1].isalnum() and text[m.end()].isalnum() else "",
+        text,
+    )
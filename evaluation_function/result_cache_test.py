@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+
+from .evaluation import evaluation_function
+from .result_cache import (
+    ResultCache,
+    canonical_result_key,
+    normalise_response,
+    result_key,
+    with_result_cache,
+)
+
+
+class FakeResult:
+    def __init__(self, is_correct, feedback_items=()):
+        self.is_correct = is_correct
+        self.feedback_items = list(feedback_items)
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.now = [1000.0]
+        self.cache = ResultCache(
+            os.path.join(self.directory.name, "results.sqlite"),
+            ttl=60, max_entries=3, sweep_interval=1, clock=lambda: self.now[0],
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.put("k", {"is_correct": True})
+        self.assertEqual(self.cache.get("k"), {"is_correct": True})
+
+    def test_ttl(self):
+        self.cache.put("k", 1)
+        self.now[0] += 61
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_size_limit_drops_least_recently_read(self):
+        for i in range(3):
+            self.cache.put(str(i), i)
+            self.now[0] += 1
+        self.cache.get("0")
+        self.now[0] += 1
+        self.cache.put("3", 3)
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get("1"))
+        self.assertEqual(self.cache.get("0"), 0)
+
+    def test_wrapper_skips_repeats_and_transient_results(self):
+        calls = []
+
+        def evaluate(response, answer, params):
+            calls.append(response)
+            if response["formula"] == "slow":
+                return FakeResult(False, [("undetermined", "out of time")])
+            return FakeResult(True)
+
+        cached = with_result_cache(evaluate, self.cache)
+        answer = {"tautology": True}
+        self.assertTrue(cached({"formula": "p ∨ ¬p"}, answer, {}).is_correct)
+        self.assertTrue(cached({"formula": "p∨¬p"}, answer, {}).is_correct)
+        cached({"formula": "slow"}, answer, {})
+        cached({"formula": "slow"}, answer, {})
+        self.assertEqual(len(calls), 3)
+
+    def test_wrapper_shares_correct_results_between_canonical_forms(self):
+        calls = []
+
+        def evaluate(response, answer, params):
+            calls.append(response)
+            if response["formula"].startswith("p ∧"):
+                return FakeResult(True)
+            return FakeResult(False, [("counterexample", "p = F")])
+
+        cached = with_result_cache(evaluate, self.cache)
+        answer = {"satisfiability": True}
+        self.assertTrue(cached({"formula": "p ∧ q"}, answer, {}).is_correct)
+        self.assertTrue(cached({"formula": "b ∧ a"}, answer, {}).is_correct)
+        self.assertEqual(len(calls), 1)
+
+        # Results with feedback, and truth-table checks, are not shared.
+        cached({"formula": "q ∨ p"}, answer, {})
+        cached({"formula": "a ∨ b"}, answer, {})
+        cached({"formula": "p ∧ r"}, {"validTruthTable": True}, {})
+        cached({"formula": "r ∧ s"}, {"validTruthTable": True}, {})
+        self.assertEqual(len(calls), 5)
+
+    def test_minimal_dnf_results_are_not_shared_between_renamings(self):
+        # minimalDnf compares atoms by name, so p ∧ r must not reuse the result of p ∧ q.
+        cached = with_result_cache(evaluation_function, self.cache)
+        answer = {"equivalent": "p ∧ q", "minimalDnf": True}
+        self.assertTrue(cached({"formula": "p ∧ q"}, answer, {}).to_dict().get("is_correct"))
+        self.assertFalse(cached({"formula": "p ∧ r"}, answer, {}).to_dict().get("is_correct"))
+        self.assertIsNone(canonical_result_key({"formula": "p ∧ r"}, answer, {}))
+
+    def test_key(self):
+        self.assertEqual(normalise_response({"formula": " p ∧  q "}), normalise_response('{"formula": "p∧q"}'))
+        self.assertNotEqual(normalise_response({"formula": "ab"}), normalise_response({"formula": "a b"}))
+        self.assertNotEqual(result_key({"formula": "p"}, {"tautology": True}, {}),
+                            result_key({"formula": "p"}, {"satisfiability": True}, {}))
+        self.assertEqual(canonical_result_key({"formula": "p ∨ (q ∨ r)"}, {"tautology": True}, {}),
+                         canonical_result_key('{"formula": "(c ∨ b) ∨ a"}', {"tautology": True}, {}))
+        self.assertIsNone(canonical_result_key({"formula": "p ∧"}, {"tautology": True}, {}))
+        self.assertIsNone(canonical_result_key({"formula": "p"}, {"referenceTruthTable": ["p"]}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
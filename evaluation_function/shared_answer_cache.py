@@ -0,0 +1,179 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from evaluation_function.domain.evaluators import PackedTruthTable
+from evaluation_function.domain.formula import Atom
+
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"PLAC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIQ")  # magic, version, number of slots, end of the data region
+_SLOT = struct.Struct("<16sQI")  # key digest, data offset, data length
+_EMPTY = bytes(16)
+
+
+class CompiledAnswer:
+    """
+    The compact form of an answer formula kept in the shared cache
+    ---
+    `atoms` are the atom names in table order, `bits` the packed truth table
+    over them and `signature` its renaming-invariant signature (see
+    `PackedTruthTable.signature`).
+    """
+
+    def __init__(self, atoms: list[str], bits: int, signature: tuple[int, ...]):
+        self.atoms = atoms
+        self.bits = bits
+        self.signature = signature
+
+    @staticmethod
+    def from_table(table: PackedTruthTable) -> "CompiledAnswer":
+        return CompiledAnswer([atom.name for atom in table.atoms], table.bits, table.signature())
+
+    def truth_table(self) -> PackedTruthTable:
+        table = PackedTruthTable.from_bits([Atom(name) for name in self.atoms], self.bits)
+        table._signature = self.signature
+        return table
+
+    def to_bytes(self) -> bytes:
+        parts = [struct.pack("<H", len(self.atoms))]
+        for name in self.atoms:
+            encoded = name.encode("utf-8")
+            parts.append(struct.pack("<H", len(encoded)))
+            parts.append(encoded)
+        num_bytes = ((1 << len(self.atoms)) + 7) // 8
+        parts.append(self.bits.to_bytes(num_bytes, "little"))
+        parts.append(struct.pack(f"<{len(self.signature)}Q", *self.signature))
+        return b"".join(parts)
+
+    @staticmethod
+    def from_bytes(data: bytes | memoryview) -> "CompiledAnswer":
+        (num_atoms,) = struct.unpack_from("<H", data, 0)
+        offset = 2
+        atoms = []
+        for _ in range(num_atoms):
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            atoms.append(bytes(data[offset:offset + length]).decode("utf-8"))
+            offset += length
+        num_bytes = ((1 << num_atoms) + 7) // 8
+        bits = int.from_bytes(data[offset:offset + num_bytes], "little")
+        offset += num_bytes
+        signature = struct.unpack_from(f"<{num_atoms + 1}Q", data, offset)
+        return CompiledAnswer(atoms, bits, signature)
+
+
+class SharedAnswerCache:
+    """
+    Compiled answers in a memory-mapped file that every worker on the machine maps
+    ---
+    The file holds a header, an open-addressing table of `num_slots` slots
+    keyed by a digest of the answer text, and an append-only data region.
+    Readers take no lock: a writer, holding an exclusive `flock` on the file,
+    appends the data first and fills in the slot's digest last, so a reader
+    that finds the digest also finds the data, which is never changed again.
+    The file is created sparse, so unused space costs no disk or memory. When
+    the data region or the slots run out, new answers are simply not stored.
+    """
+
+    def __init__(self, path: str, size: int = 64 * 1024 * 1024, num_slots: int = 65536):
+        self._path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._lock(fd)
+            try:
+                if os.fstat(fd).st_size == 0:
+                    data_start = _HEADER.size + num_slots * _SLOT.size
+                    if size <= data_start:
+                        raise ValueError("shared answer cache size leaves no room for data")
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, _HEADER.pack(_MAGIC, _VERSION, num_slots, data_start), 0)
+                self._map = mmap.mmap(fd, 0)
+            finally:
+                self._unlock(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        magic, version, self._num_slots, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a shared answer cache of version {_VERSION}")
+
+    @staticmethod
+    def from_env() -> "SharedAnswerCache | None":
+        """The cache at `EVAL_SHARED_ANSWER_CACHE`, or None when that is unset."""
+        path = os.environ.get("EVAL_SHARED_ANSWER_CACHE")
+        return SharedAnswerCache(path) if path else None
+
+    def get(self, text: str) -> CompiledAnswer | None:
+        digest = _digest(text)
+        for slot in self._probe(digest):
+            key, offset, length = _SLOT.unpack_from(self._map, slot)
+            if key == _EMPTY:
+                return None
+            if key == digest:
+                return CompiledAnswer.from_bytes(memoryview(self._map)[offset:offset + length])
+        return None
+
+    def put(self, text: str, answer: CompiledAnswer) -> bool:
+        """Stores `answer` under `text` unless it is already there. Returns False when the cache is full."""
+        digest = _digest(text)
+        data = answer.to_bytes()
+        self._lock(self._fd)
+        try:
+            for slot in self._probe(digest):
+                key, _, _ = _SLOT.unpack_from(self._map, slot)
+                if key == digest:
+                    return True
+                if key == _EMPTY:
+                    break
+            else:
+                logger.warning("shared answer cache %s has no free slots", self._path)
+                return False
+            _, _, _, end = _HEADER.unpack_from(self._map, 0)
+            if end + len(data) > len(self._map):
+                logger.warning("shared answer cache %s is full", self._path)
+                return False
+            self._map[end:end + len(data)] = data
+            # Publish: offset and length first, the digest that makes the slot visible last.
+            self._map[slot + 16:slot + _SLOT.size] = _SLOT.pack(_EMPTY, end, len(data))[16:]
+            self._map[slot:slot + 16] = digest
+            _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, self._num_slots, end + len(data))
+            return True
+        finally:
+            self._unlock(self._fd)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    def _probe(self, digest: bytes):
+        start = int.from_bytes(digest[:8], "little") % self._num_slots
+        for i in range(self._num_slots):
+            yield _HEADER.size + (start + i) % self._num_slots * _SLOT.size
+
+    @staticmethod
+    def _lock(fd: int):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+    @staticmethod
+    def _unlock(fd: int):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _digest(text: str) -> bytes:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    # An all-zero digest marks an empty slot.
+    return digest if digest != _EMPTY else b"\x01" + digest[1:]
@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from .domain.evaluators import PackedTruthTable
+from .parsing.parser import formula_parser
+from .shared_answer_cache import CompiledAnswer, SharedAnswerCache
+
+
+def store(path, text):
+    cache = SharedAnswerCache(path, size=1 << 20, num_slots=64)
+    cache.put(text, CompiledAnswer.from_table(PackedTruthTable(formula_parser(text))))
+    cache.close()
+
+
+class TestSharedAnswerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "answers.cache")
+        self.cache = SharedAnswerCache(self.path, size=1 << 20, num_slots=64)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        table = PackedTruthTable(formula_parser("(p → q) ∧ ¬r"))
+        self.assertIsNone(self.cache.get("(p → q) ∧ ¬r"))
+        self.assertTrue(self.cache.put("(p → q) ∧ ¬r", CompiledAnswer.from_table(table)))
+        compiled = self.cache.get("(p → q) ∧ ¬r").truth_table()
+        self.assertEqual([atom.name for atom in compiled.atoms], ["p", "q", "r"])
+        self.assertEqual(compiled.bits, table.bits)
+        self.assertEqual(compiled.signature(), table.signature())
+
+    def test_visible_to_other_processes(self):
+        process = multiprocessing.get_context("spawn").Process(target=store, args=(self.path, "p ↔ q"))
+        process.start()
+        process.join()
+        self.assertEqual(self.cache.get("p ↔ q").bits, PackedTruthTable(formula_parser("p ↔ q")).bits)
+
+    def test_full(self):
+        cache = SharedAnswerCache(os.path.join(self.directory.name, "small.cache"), size=2048, num_slots=4)
+        table = PackedTruthTable(formula_parser("p ∨ q"))
+        stored = [cache.put(str(i), CompiledAnswer.from_table(table)) for i in range(6)]
+        cache.close()
+        self.assertEqual(stored, [True] * 4 + [False] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
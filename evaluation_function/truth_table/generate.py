@@ -0,0 +1,115 @@
+from typing import Iterator, Sequence
+
+from evaluation_function.domain.budget import Budget
+from evaluation_function.domain.evaluators import _extract_atoms, atom_masks, BitParallelEvaluator
+from evaluation_function.domain.formula import Formula, Atom, UnaryOperator, BinaryOperator
+from evaluation_function.domain.printing import format_formula
+from evaluation_function.domain.traversal import nodes
+from evaluation_function.parsing.parser import formula_parser
+
+
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def subformula_columns(formula: Formula) -> list[Formula]:
+    """
+    The columns an instructor would write for `formula`: its atoms in name order,
+    followed by every compound subformula in evaluation order (operands before the
+    formulas that use them), each listed once, ending with `formula` itself.
+    """
+    atoms = sorted(_extract_atoms(formula), key=lambda a: a.name)
+    compound = []
+    seen = set()
+    for node in nodes(formula):
+        if isinstance(node, (UnaryOperator, BinaryOperator)) and node not in seen:
+            seen.add(node)
+            compound.append(node)
+    return atoms + compound
+
+
+class TruthTableGenerator:
+    """
+    Generates the reference truth table of a formula
+    ---
+
+    - `formula` the formula to tabulate (a `Formula` or an input string)
+    - `columns` the columns to show (formulas or strings); defaults to `subformula_columns(formula)`
+    - `chunk_size` the number of rows produced per chunk
+    - `budget` the time and work allowance drawn on while rows are computed
+
+    Rows follow the usual textbook order (first row all true, last row all false)
+    over the atoms of the formula and its columns, sorted by name. Rows are
+    computed a chunk at a time with the bit-parallel evaluator, so only one
+    chunk is ever held in memory.
+    """
+
+    def __init__(
+        self,
+        formula: Formula | str,
+        columns: Sequence[Formula | str] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        budget: Budget | None = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        if isinstance(formula, str):
+            formula = formula_parser(formula)
+        self._formula = formula
+        self._chunk_size = chunk_size
+
+        if columns is None:
+            self._columns = subformula_columns(formula)
+            self._headers = [format_formula(column) for column in self._columns]
+        else:
+            self._columns = []
+            self._headers = []
+            for column in columns:
+                if isinstance(column, str):
+                    self._headers.append(column)
+                    self._columns.append(formula_parser(column))
+                else:
+                    self._headers.append(format_formula(column))
+                    self._columns.append(column)
+
+        atoms = set(_extract_atoms(formula))
+        for column in self._columns:
+            atoms.update(_extract_atoms(column))
+        self._evaluator = BitParallelEvaluator(formula, sorted(atoms, key=lambda a: a.name), budget)
+
+    @property
+    def atoms(self) -> list[Atom]:
+        return self._evaluator.atoms
+
+    @property
+    def columns(self) -> list[Formula]:
+        return self._columns
+
+    @property
+    def headers(self) -> list[str]:
+        return self._headers
+
+    @property
+    def num_rows(self) -> int:
+        return 1 << len(self.atoms)
+
+    def chunks(self) -> Iterator[list[list[bool]]]:
+        """Yields the rows of the table, at most `chunk_size` rows at a time."""
+        num_atoms = len(self.atoms)
+        for start in range(0, self.num_rows, self._chunk_size):
+            count = min(self._chunk_size, self.num_rows - start)
+            masks = dict(zip(self.atoms, atom_masks(num_atoms, start, count)))
+            column_bits = [self._evaluator.evaluate_masks(masks, count, column) for column in self._columns]
+            yield [[bool(bits >> k & 1) for bits in column_bits] for k in range(count)]
+
+    def rows(self) -> Iterator[list[bool]]:
+        for chunk in self.chunks():
+            yield from chunk
+
+
+def generate_truth_table(
+    formula: Formula | str,
+    columns: Sequence[Formula | str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[list[list[bool]]]:
+    """Yields the rows of the reference truth table of `formula` in chunks of `chunk_size` rows."""
+    return TruthTableGenerator(formula, columns, chunk_size).chunks()
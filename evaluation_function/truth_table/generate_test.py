@@ -0,0 +1,53 @@
+import unittest
+from itertools import product
+
+from evaluation_function.domain.evaluators import Assignment, FormulaEvaluator
+from evaluation_function.parsing.parser import formula_parser
+from evaluation_function.truth_table.generate import TruthTableGenerator, generate_truth_table
+
+
+class TestTruthTableGenerator(unittest.TestCase):
+
+    def test_automatic_columns(self):
+        """Atoms come first, then subformulas in evaluation order"""
+        generator = TruthTableGenerator("(p ∧ q) → ¬r")
+        self.assertEqual(generator.headers, ["p", "q", "r", "p ∧ q", "¬r", "p ∧ q → ¬r"])
+
+    def test_shared_subformula_listed_once(self):
+        generator = TruthTableGenerator("(p ∧ q) ∨ (p ∧ q)")
+        self.assertEqual(generator.headers, ["p", "q", "p ∧ q", "p ∧ q ∨ p ∧ q"])
+
+    def test_rows_in_textbook_order(self):
+        rows = list(TruthTableGenerator("p ∧ q").rows())
+        self.assertEqual(rows, [
+            [True, True, True],
+            [True, False, False],
+            [False, True, False],
+            [False, False, False],
+        ])
+
+    def test_provided_columns(self):
+        generator = TruthTableGenerator("p → q", columns=["q", "p", "p → q"])
+        self.assertEqual(generator.headers, ["q", "p", "p → q"])
+        self.assertEqual(list(generator.rows())[1], [False, True, False])
+
+    def test_chunks_have_fixed_size(self):
+        chunks = list(generate_truth_table("a ∧ b ∧ c ∧ d ∧ e", chunk_size=5))
+        self.assertEqual([len(chunk) for chunk in chunks], [5] * 6 + [2])
+
+    def test_matches_formula_evaluator(self):
+        formula = formula_parser("(a ⊕ b) ↔ (c → ¬(a ∨ d))")
+        generator = TruthTableGenerator(formula, chunk_size=3)
+        expected = []
+        for values in product([True, False], repeat=len(generator.atoms)):
+            assignment = Assignment(dict(zip(generator.atoms, values)))
+            expected.append([FormulaEvaluator(column, assignment).evaluate() for column in generator.columns])
+        self.assertEqual(list(generator.rows()), expected)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            TruthTableGenerator("p", chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
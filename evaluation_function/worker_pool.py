@@ -0,0 +1,192 @@
+import logging
+import multiprocessing
+import os
+import queue
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Sequence
+
+from evaluation_function.env import env_number
+from evaluation_function.metrics import metrics
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskKilled(Exception):
+    """Raised by `WorkerPool.run` when a task's worker had to be killed or died, so no result exists."""
+
+
+class PoolConfig:
+    """
+    Settings for the worker pool
+    ---
+    Each can be set with an environment variable:
+
+    - `EVAL_POOL_SIZE` number of worker processes (default: one per CPU)
+    - `EVAL_TASK_TIMEOUT` wall-clock seconds a task may run before its worker is killed
+    - `EVAL_WORKER_MEMORY_LIMIT` address-space cap per worker in megabytes (`RLIMIT_AS`); 0 for none
+    - `EVAL_WORKER_MAX_TASKS` tasks after which a worker is replaced by a fresh one; 0 for never
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        task_timeout: float = 30.0,
+        memory_limit_mb: int = 1024,
+        max_tasks: int = 500,
+    ):
+        self.size = size if size is not None else os.cpu_count() or 1
+        self.task_timeout = task_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks = max_tasks
+
+    @staticmethod
+    def from_env() -> "PoolConfig":
+        defaults = PoolConfig()
+        return PoolConfig(
+            size=env_number("EVAL_POOL_SIZE", defaults.size, int),
+            task_timeout=env_number("EVAL_TASK_TIMEOUT", defaults.task_timeout, float),
+            memory_limit_mb=env_number("EVAL_WORKER_MEMORY_LIMIT", defaults.memory_limit_mb, int),
+            max_tasks=env_number("EVAL_WORKER_MAX_TASKS", defaults.max_tasks, int),
+        )
+
+
+class _Worker:
+    def __init__(self, context: Any, config: PoolConfig):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_serve,
+            args=(child_connection, config.memory_limit_mb),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.tasks = 0
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """
+    A pre-started pool of worker processes that run one task at a time each
+    ---
+    `run(function, *args)` sends the call to an idle worker and waits for its
+    result. A worker that exceeds the task timeout is killed and replaced, and
+    one that dies (for example when it hits its memory cap) is replaced too; in
+    both cases `run` raises `TaskKilled`. Exceptions raised by the function
+    itself are re-raised in the caller. Workers are recycled after
+    `max_tasks` tasks so that slow leaks cannot accumulate.
+
+    `function` and its arguments are pickled, so the function must be defined
+    at module level. The events a task counts in its worker's `metrics` are
+    sent back with its result and added to this process's `metrics`.
+
+    Workers are forked from a fork server (spawned where there is none), never
+    from the calling process: replacements are started while the caller may be
+    running threads, whose locks a forked child would inherit held. The fork
+    server is shared by every pool in the process; the first pool to start it
+    has it import the modules named in `preload`, so that each worker forked
+    from it starts with them already imported.
+    """
+
+    def __init__(
+        self,
+        config: PoolConfig | None = None,
+        start_method: str | None = None,
+        preload: Sequence[str] = (),
+    ):
+        self._config = config if config is not None else PoolConfig.from_env()
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver" and preload:
+            self._context.set_forkserver_preload(list(preload))
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        for _ in range(self._config.size):
+            self._idle.put(_Worker(self._context, self._config))
+
+    @property
+    def config(self) -> PoolConfig:
+        return self._config
+
+    def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        worker = self._idle.get()
+        try:
+            worker.connection.send((function, args))
+            if not worker.connection.poll(self._config.task_timeout):
+                logger.warning("worker %d timed out after %ss, killing it", worker.process.pid, self._config.task_timeout)
+                worker.kill()
+                worker = None
+                raise TaskKilled(f"evaluation took longer than {self._config.task_timeout:g} seconds and was stopped")
+            status, value, counts = worker.connection.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            worker.kill()
+            exit_code = worker.process.exitcode
+            worker = None
+            logger.warning("worker died with exit code %s", exit_code)
+            raise TaskKilled(f"evaluation worker stopped unexpectedly (exit code {exit_code})")
+        finally:
+            self._idle.put(self._replace(worker))
+
+        metrics.add(counts)
+        if status == "error":
+            raise value
+        return value
+
+    def close(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            worker.stop()
+
+    def _replace(self, worker: _Worker | None) -> _Worker:
+        if worker is not None:
+            worker.tasks += 1
+            if self._config.max_tasks <= 0 or worker.tasks < self._config.max_tasks:
+                return worker
+            worker.stop()
+        return _Worker(self._context, self._config)
+
+
+def _serve(connection: Connection, memory_limit_mb: int):
+    if resource is not None and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        function, args = task
+        try:
+            status, value = "ok", function(*args)
+        except Exception as e:
+            status, value = "error", e
+        counts = metrics.take()
+        try:
+            connection.send((status, value, counts))
+        except Exception as e:
+            # The result or the exception could not be pickled.
+            connection.send(("error", RuntimeError(f"could not return result: {e}"), counts))
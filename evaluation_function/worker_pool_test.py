@@ -0,0 +1,83 @@
+import os
+import time
+import unittest
+
+from .metrics import metrics
+from .worker_pool import PoolConfig, TaskKilled, WorkerPool
+
+
+def square(x):
+    return x * x
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def crash():
+    os._exit(3)
+
+
+def fail():
+    raise ValueError("bad input")
+
+
+def count_event(amount):
+    metrics.increment("test_worker_events", amount)
+
+
+def allocate(megabytes):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = WorkerPool(PoolConfig(size=1, task_timeout=1.0, memory_limit_mb=512, max_tasks=3))
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_runs_tasks(self):
+        self.assertEqual([self.pool.run(square, i) for i in range(5)], [0, 1, 4, 9, 16])
+
+    def test_exception_is_reraised(self):
+        with self.assertRaisesRegex(ValueError, "bad input"):
+            self.pool.run(fail)
+        self.assertEqual(self.pool.run(square, 3), 9)
+
+    def test_timeout_kills_and_replaces_worker(self):
+        with self.assertRaisesRegex(TaskKilled, "longer than 1 seconds"):
+            self.pool.run(sleep, 10)
+        self.assertEqual(self.pool.run(square, 4), 16)
+
+    def test_crash_replaces_worker(self):
+        with self.assertRaisesRegex(TaskKilled, "exit code 3"):
+            self.pool.run(crash)
+        self.assertEqual(self.pool.run(square, 5), 25)
+
+    def test_memory_cap(self):
+        with self.assertRaises(MemoryError):
+            self.pool.run(allocate, 1024)
+
+    def test_worker_recycled_after_max_tasks(self):
+        pids = [self.pool.run(os.getpid) for _ in range(4)]
+        self.assertEqual(len(set(pids[:3])), 1)
+        self.assertNotEqual(pids[2], pids[3])
+
+    def test_worker_metrics_reach_the_caller(self):
+        before = metrics.get("test_worker_events")
+        # Four tasks, so the worker is recycled in between and its counts must not be lost.
+        for amount in (1, 2, 3, 4):
+            self.pool.run(count_event, amount)
+        self.assertEqual(metrics.get("test_worker_events"), before + 10)
+
+    def test_workers_are_not_forked_from_the_caller(self):
+        # A replacement comes from the fork server too, not from this (threaded) process.
+        parents = {self.pool.run(os.getppid) for _ in range(4)}
+        self.assertNotIn(os.getpid(), parents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import time
+from functools import reduce
+
+from evaluation_function.domain import (
+    Atom,
+    Negation,
+    Conjunction,
+    Disjunction,
+    PackedTruthTable,
+)
+from evaluation_function.domain.minimisation import minimise
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def random_table(num_atoms, density, rng):
+    atoms = [Atom(f"x{i}") for i in range(num_atoms)]
+    bits = sum(1 << row for row in range(1 << num_atoms) if rng.random() < density)
+    return PackedTruthTable.from_bits(atoms, bits)
+
+
+def random_dnf_table(num_atoms, num_terms, rng):
+    """The table of a random DNF of `num_terms` terms of 3 to 5 literals: a function with structure to find."""
+    atoms = [Atom(f"x{i}") for i in range(num_atoms)]
+    terms = []
+    for _ in range(num_terms):
+        literals = [a if rng.random() < 0.5 else Negation(a) for a in rng.sample(atoms, rng.randint(3, 5))]
+        terms.append(reduce(Conjunction, literals))
+    return PackedTruthTable(reduce(Disjunction, terms), atoms)
+
+
+def main():
+    rng = random.Random(0)
+    print("=== Two-level minimisation: random DNFs (terms written -> minimal terms) ===")
+    print(f"{'atoms':>5} {'models':>7} {'written':>7} {'minimal':>7} {'literals':>8} {'exact':>5} {'time (s)':>9}")
+    for num_atoms in (8, 10, 12, 13, 14):
+        num_terms = num_atoms
+        table = random_dnf_table(num_atoms, num_terms, rng)
+        result, elapsed = timed(minimise, table)
+        print(
+            f"{num_atoms:>5} {table.count():>7} {num_terms:>7} {result.num_terms:>7} "
+            f"{result.num_literals:>8} {str(result.exact):>5} {elapsed:>9.3f}"
+        )
+
+    print()
+    print("=== Two-level minimisation: random functions (no structure, worst case for the cover) ===")
+    print(f"{'atoms':>5} {'density':>7} {'models':>7} {'minimal':>7} {'exact':>5} {'time (s)':>9}")
+    for num_atoms in (8, 10, 12):
+        for density in (0.1, 0.5):
+            table = random_table(num_atoms, density, rng)
+            result, elapsed = timed(minimise, table)
+            print(f"{num_atoms:>5} {density:>7} {table.count():>7} {result.num_terms:>7} {str(result.exact):>5} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
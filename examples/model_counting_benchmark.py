@@ -0,0 +1,69 @@
+import random
+import time
+from itertools import product
+
+from evaluation_function.domain import (
+    Atom,
+    Negation,
+    Conjunction,
+    Disjunction,
+    Assignment,
+    FormulaEvaluator,
+)
+from evaluation_function.domain.evaluators import _extract_atoms, ModelCountEvaluator
+
+
+def brute_force_count(formula):
+    atoms = list(_extract_atoms(formula))
+    count = 0
+    for values in product([False, True], repeat=len(atoms)):
+        if FormulaEvaluator(formula, Assignment(dict(zip(atoms, values)))).evaluate():
+            count += 1
+    return count
+
+
+def random_3cnf(num_atoms, num_clauses, rng):
+    atoms = [Atom(f"x{i}") for i in range(num_atoms)]
+    formula = None
+    for _ in range(num_clauses):
+        literals = [a if rng.random() < 0.5 else Negation(a) for a in rng.sample(atoms, 3)]
+        clause = Disjunction(Disjunction(literals[0], literals[1]), literals[2])
+        formula = clause if formula is None else Conjunction(formula, clause)
+    return formula
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def search_count(formula):
+    evaluator = ModelCountEvaluator(formula)
+    evaluator.MAX_TABLE_ATOMS = 0
+    return evaluator.evaluate()
+
+
+def main():
+    rng = random.Random(0)
+    print("=== Model counting: brute force vs popcount vs search ===")
+    print(f"{'atoms':>5} {'clauses':>7} {'models':>10} {'brute (s)':>10} {'popcount (s)':>12} {'search (s)':>10}")
+
+    for num_atoms in (8, 10, 12, 14, 16):
+        formula = random_3cnf(num_atoms, 2 * num_atoms, rng)
+        expected, brute_time = timed(brute_force_count, formula)
+        table_count, table_time = timed(lambda f: ModelCountEvaluator(f).evaluate(), formula)
+        dpll_count, dpll_time = timed(search_count, formula)
+        assert expected == table_count == dpll_count
+        print(f"{num_atoms:>5} {2 * num_atoms:>7} {expected:>10} {brute_time:>10.4f} {table_time:>12.4f} {dpll_time:>10.4f}")
+
+    print()
+    print("=== Beyond brute force: search only ===")
+    for num_atoms in (24, 28, 32):
+        formula = random_3cnf(num_atoms, 2 * num_atoms, rng)
+        count, dpll_time = timed(lambda f: ModelCountEvaluator(f).evaluate(), formula)
+        print(f"{num_atoms:>5} atoms: {count} models in {dpll_time:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from itertools import product
 from evaluation_function.domain import (
     Atom,
     Negation,
@@ -6,52 +5,48 @@ from evaluation_function.domain import (
     Disjunction,
     Implication,
     Biconditional,
-    Assignment,
-    FormulaEvaluator,
 )
+from evaluation_function.truth_table.generate import TruthTableGenerator
 
 
-def generate_truth_table(atoms, formula):
-    print(f"=== Truth Table for: {formula} ===")
+def print_truth_table(formula, columns=None):
+    generator = TruthTableGenerator(formula, columns, chunk_size=4)
+    print(f"=== Truth Table for: {generator.headers[-1]} ===")
     print()
-    
-    header = " | ".join([atom.name for atom in atoms] + ["Result"])
+
+    header = " | ".join(generator.headers)
     separator = "-" * len(header)
     print(header)
     print(separator)
-    
-    for assignment_values in product([False, True], repeat=len(atoms)):
-        assignment_dict = {atom: val for atom, val in zip(atoms, assignment_values)}
-        assignment = Assignment(assignment_dict)
-        evaluator = FormulaEvaluator(formula, assignment)
-        result = evaluator.evaluate()
-        
-        row = " | ".join([str(val) for val in assignment_values] + [str(result)])
-        print(row)
-    
+
+    for chunk in generator.chunks():
+        for row in chunk:
+            print(" | ".join(("T" if val else "F").center(len(h)) for h, val in zip(generator.headers, row)))
+
     print()
 
 
 def main():
     p = Atom("p")
     q = Atom("q")
-    
+
     formulas = [
-        ("p ∧ q", Conjunction(p, q)),
-        ("p ∨ q", Disjunction(p, q)),
-        ("p → q", Implication(p, q)),
-        ("p ↔ q", Biconditional(p, q)),
-        ("¬(p ∧ q)", Negation(Conjunction(p, q))),
-        ("(p → q) ∧ (q → p)", Conjunction(Implication(p, q), Implication(q, p))),
+        Conjunction(p, q),
+        Disjunction(p, q),
+        Implication(p, q),
+        Biconditional(p, q),
+        Negation(Conjunction(p, q)),
+        Conjunction(Implication(p, q), Implication(q, p)),
     ]
-    
-    for name, formula in formulas:
-        generate_truth_table([p, q], formula)
-    
+
+    for formula in formulas:
+        print_truth_table(formula)
+
     print("\n=== Three Variable Example ===")
-    r = Atom("r")
-    formula = Implication(Conjunction(p, q), r)
-    generate_truth_table([p, q, r], formula)
+    print_truth_table("(p ∧ q) → r")
+
+    print("\n=== Chosen Columns ===")
+    print_truth_table("(p ∧ q) → r", columns=["p", "q", "r", "(p ∧ q) → r"])
 
 
 if __name__ == "__main__":